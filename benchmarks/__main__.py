@@ -0,0 +1,8 @@
+"""
+Make benchmarks package executable.
+"""
+
+from .run import main
+
+if __name__ == "__main__":
+    main()
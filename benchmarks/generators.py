@@ -0,0 +1,195 @@
+"""
+Synthetic report generators.
+Generate realistic input reports with a given number of issues
+(random but reproducible values).
+"""
+
+import csv
+import json
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from reportmix.exporters.csv import CsvExporter
+from reportmix.models.issue import Issue, FLAT_FIELDS
+from reportmix.models.meta import Meta
+from reportmix.models.project import Project
+from reportmix.models.report import Report
+from reportmix.models.severity import SEVERITIES
+from reportmix.models.subject import Subject
+from reportmix.models.tool import Tool
+
+# Dependency-Check CSV report columns (version 5.x)
+DEPENDENCY_CHECK_FIELDS = [
+    "Project", "ScanDate", "DependencyName", "DependencyPath", "Description", "License",
+    "Md5", "Sha1", "Identifiers", "CPE", "CVE", "CWE", "Vulnerability", "Source",
+    "CVSSv2_Severity", "CVSSv2_Score", "CVSSv2", "CVSSv3_BaseSeverity", "CVSSv3_BaseScore",
+    "CVSSv3", "CPE Confidence", "Evidence Count"
+]
+
+# Some values to pick from
+WORDS = ["remote", "attacker", "buffer", "overflow", "injection", "crafted", "request",
+         "denial", "service", "arbitrary", "code", "execution", "deserialization", "path",
+         "traversal", "cross-site", "scripting", "memory", "leak", "authentication", "bypass"]
+CVSS_SEVERITIES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+NPM_SEVERITIES = ["low", "moderate", "high", "critical"]
+LICENSES = ["Apache-2.0", "MIT", "BSD-3-Clause", "EPL-1.0", "LGPL-2.1", ""]
+CWES = ["CWE-20", "CWE-79", "CWE-89", "CWE-200", "CWE-400", "CWE-502", "CWE-787"]
+BASE_DATE = datetime(2021, 6, 1, 12, 0, 0)
+
+
+def text(rnd: random.Random, words: int) -> str:
+    """
+    Generate a random sentence.
+    :param rnd: Random generator
+    :param words: Number of words
+    :return: Random sentence
+    """
+    return " ".join(rnd.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def cve(index: int) -> str:
+    """
+    Generate a CVE identifier.
+    :param index: Vulnerability index
+    :return: CVE identifier
+    """
+    return "CVE-{}-{:05d}".format(2015 + index % 7, 10000 + index)
+
+
+def dependency_check_csv(file_path: str, count: int, seed: int = 1):
+    """
+    Generate a Dependency-Check CSV report.
+    Vulnerabilities are shared by several dependencies (~4 rows per CVE).
+    :param file_path: Path to the output file
+    :param count: Number of issues (rows)
+    :param seed: Random seed
+    """
+    rnd = random.Random(seed)
+    scan_date = BASE_DATE.strftime("%a, %d %b %Y %H:%M:%S +0200")
+    cve_count = max(count // 4, 1)
+    with open(file_path, "w", newline='', encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(DEPENDENCY_CHECK_FIELDS)
+        for index in range(count):
+            vuln = rnd.randrange(cve_count)
+            dep = "lib-{}-{}.jar".format(WORDS[vuln % len(WORDS)], index % 5000)
+            severity = CVSS_SEVERITIES[vuln % len(CVSS_SEVERITIES)]
+            score = "{:.1f}".format(2 + (vuln % 80) / 10)
+            writer.writerow([
+                "acme-app", scan_date, dep, "/builds/acme-app/lib/" + dep,
+                text(rnd, 8), LICENSES[vuln % len(LICENSES)],
+                "{:032x}".format(rnd.getrandbits(128)), "{:040x}".format(rnd.getrandbits(160)),
+                "pkg:maven/org.acme/{}@1.{}.0".format(dep[:-4], index % 10),
+                "cpe:2.3:a:acme:{}:1.{}.0:*:*:*:*:*:*:*".format(dep[:-4], index % 10),
+                cve(vuln), CWES[vuln % len(CWES)], text(rnd, 30), "NVD",
+                severity, score, "/AV:N/AC:L/Au:N/C:P/I:P/A:P", severity, score,
+                "/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H", rnd.choice(["HIGH", "MEDIUM", "LOW"]),
+                rnd.randint(1, 20)
+            ])
+
+
+def dependency_check_json(file_path: str, seed: int = 1):
+    """
+    Generate the Dependency-Check JSON report (scan and project info only).
+    :param file_path: Path to the output file
+    :param seed: Random seed
+    """
+    rnd = random.Random(seed)
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump({
+            "reportSchema": "1.1",
+            "scanInfo": {"engineVersion": "5.3.2", "dataSource": []},
+            "projectInfo": {
+                "name": "acme-app", "groupID": "org.acme", "artifactID": "acme-app",
+                "version": "1.{}.0".format(rnd.randint(0, 9)), "reportDate": BASE_DATE.isoformat()
+            },
+            "dependencies": []
+        }, file)
+
+
+def npm_audit_json(file_path: str, count: int, seed: int = 1):
+    """
+    Generate a npm audit report (npm@6 JSON format).
+    Each advisory has ~8 findings (one issue per finding).
+    :param file_path: Path to the output file
+    :param count: Number of issues (findings)
+    :param seed: Random seed
+    """
+    rnd = random.Random(seed)
+    advisories = {}
+    index = 0
+    while index < count:
+        findings = min(rnd.randint(1, 15), count - index)
+        number = 1000 + len(advisories)
+        module = "{}-{}".format(WORDS[number % len(WORDS)], number)
+        advisories[str(number)] = {
+            "findings": [{"version": "1.{}.0".format(f), "paths": [
+                "app>{}>{}".format(WORDS[(number + f) % len(WORDS)], module)
+            ]} for f in range(findings)],
+            "id": number,
+            "created": (BASE_DATE - timedelta(days=number % 900)).strftime(
+                "%Y-%m-%dT%H:%M:%S.000Z"),
+            "updated": BASE_DATE.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "deleted": None,
+            "title": text(rnd, 4),
+            "found_by": {"name": "Someone"},
+            "reported_by": {"name": "Someone"},
+            "module_name": module,
+            "cves": [cve(number)] if number % 3 else [],
+            "vulnerable_versions": "<1.{}.0".format(findings),
+            "patched_versions": ">=1.{}.0".format(findings),
+            "overview": text(rnd, 60),
+            "recommendation": "Upgrade to version 1.{}.0 or later.".format(findings),
+            "references": "- https://github.com/advisories/" + str(number),
+            "access": "public",
+            "severity": NPM_SEVERITIES[number % len(NPM_SEVERITIES)],
+            "cwe": CWES[number % len(CWES)],
+            "metadata": {"module_type": "", "exploitability": 5, "affected_components": ""},
+            "url": "https://npmjs.com/advisories/" + str(number)
+        }
+        index += findings
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump({"actions": [], "advisories": advisories, "muted": [],
+                   "metadata": {"vulnerabilities": {}, "dependencies": count}}, file)
+
+
+def issues(count: int, seed: int = 1) -> List[Issue]:
+    """
+    Generate a list of issues, as loaded and merged by ReportMix.
+    :param count: Number of issues
+    :param seed: Random seed
+    :return: Generated issues
+    """
+    rnd = random.Random(seed)
+    tools = [Tool("dependency_check", "Dependency-Check", "5.3.2"),
+             Tool("npm_audit", "npm audit", ""), Tool("sonarqube", "SonarQube", "8.9.0")]
+    meta = Meta("Acme App", "1.0.0", "Acme Corporation", "", str(BASE_DATE))
+    result = []
+    for index in range(count):
+        vuln = rnd.randrange(max(count // 4, 1))
+        tool = tools[index % len(tools)]
+        module = "{}-{}".format(WORDS[vuln % len(WORDS)], index % 5000)
+        result.append(Issue(
+            str(index), cve(vuln), cve(vuln), "VULNERABILITY", CWES[vuln % len(CWES)],
+            text(rnd, 30), "", text(rnd, 6), "", BASE_DATE, SEVERITIES[2 + vuln % 4],
+            "{:.1f}".format(2 + (vuln % 80) / 10), "HIGH", rnd.randint(1, 20), "NVD",
+            BASE_DATE - timedelta(days=vuln % 900), "https://nvd.nist.gov/vuln/detail/" + cve(vuln),
+            tool, Subject(module, module, text(rnd, 3), "1.0.0", "/app/" + module, "MIT"),
+            Project("org.acme:acme-app", "acme-app", "1.0.0"), meta, None
+        ))
+    for issue in result:
+        issue.hash = issue.compute_hash(["tool_identifier", "subject_identifier", "identifier"])
+    return result
+
+
+def reportmix_csv(file_path: str, count: int, seed: int = 1):
+    """
+    Generate a ReportMix CSV report (all fields).
+    :param file_path: Path to the output file
+    :param count: Number of issues
+    :param seed: Random seed
+    """
+    items = issues(count, seed)
+    tools = list({i.tool.identifier: i.tool for i in items}.values())
+    CsvExporter({}).export(Report(items, tools), file_path, FLAT_FIELDS)
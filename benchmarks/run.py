@@ -0,0 +1,210 @@
+"""
+Benchmark runner.
+Benchmark each loader, the hash step and each exporter on synthetic reports
+(duration and peak memory), JSON backends against each other,
+and compare results with stored baselines.
+"""
+
+import argparse
+import gc
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from os import path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks import generators
+from reportmix import json_backend
+from reportmix.exporters.csv import CsvExporter
+from reportmix.exporters.html import HtmlExporter
+from reportmix.exporters.json import JsonExporter
+from reportmix.exporters.ndjson import NdjsonExporter
+from reportmix.loaders.dependency_check import DependencyCheckLoader
+from reportmix.loaders.npm_audit import NpmAuditLoader
+from reportmix.loaders.reportmix import ReportMixLoader
+from reportmix.models.issue import FLAT_FIELDS, HASH_FIELDS
+from reportmix.models.report import Report
+
+# Stored baselines
+BASELINES_FILE = path.join(path.dirname(__file__), "baselines.json")
+
+# Durations below this value (in seconds) are too noisy to detect regressions
+MIN_WALL = 0.01
+
+# Benchmark result (wall: best duration in seconds, peak_memory: in bytes)
+Result = Dict[str, float]
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a number of issues.
+    :param size: Number of issues (e.g. "1000", "1k", "1m")
+    :return: Number of issues
+    """
+    match = re.match(r"^(\d+)([km]?)$", size.strip().lower())
+    if not match:
+        raise ValueError("Invalid size {}".format(size))
+    return int(match.group(1)) * {"": 1, "k": 1000, "m": 1000000}[match.group(2)]
+
+
+def measure(func: Callable, repeat: int) -> Result:
+    """
+    Measure the best duration and the peak memory of a function.
+    :param func: Function to benchmark
+    :param repeat: Number of timed runs
+    :return: Benchmark result
+    """
+    walls = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        walls.append(time.perf_counter() - start)
+    # Memory is measured in a separate run (tracing slows down the execution)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"wall": round(min(walls), 6), "peak_memory": peak}
+
+
+def benchmarks(count: int, data_dir: str) -> List[Tuple[str, Callable]]:
+    """
+    Generate input reports and build the list of benchmarks.
+    :param count: Number of issues
+    :param data_dir: Directory to write input and output files to
+    :return: Benchmarks (name and function)
+    """
+    dc_file = path.join(data_dir, "dependency-check-report.csv")
+    npm_file = path.join(data_dir, "npm-audit.json")
+    mix_file = path.join(data_dir, "reportmix.csv")
+    generators.dependency_check_csv(dc_file, count)
+    generators.dependency_check_json(dc_file[:-4] + ".json")
+    generators.npm_audit_json(npm_file, count)
+    generators.reportmix_csv(mix_file, count)
+
+    issues = generators.issues(count)
+    report = Report(issues, list({i.tool.identifier: i.tool for i in issues}.values()))
+    config = {"title": "Benchmark", "logo": None}
+
+    def compute_hashes():
+        for issue in report.issues:
+            issue.hash = issue.compute_hash(HASH_FIELDS)
+
+    def export(exporter, output_format):
+        output_file = path.join(data_dir, "output." + output_format)
+        return lambda: exporter(config).export(report, output_file, FLAT_FIELDS)
+
+    def with_backend(backend, func):
+        def run():
+            previous = json_backend.use(backend)
+            try:
+                func()
+            finally:
+                json_backend.use(previous)
+        return run
+
+    # Compare JSON backends on JSON loading and NDJSON export
+    load_npm_audit = NpmAuditLoader({"report_file": npm_file}).load
+    backends = [(name + "_" + backend, with_backend(backend, func))
+                for backend in json_backend.available()
+                for name, func in [("load_npm_audit", load_npm_audit),
+                                   ("export_ndjson", export(NdjsonExporter, "ndjson"))]]
+
+    return [
+        ("load_dependency_check", DependencyCheckLoader({"report_file": dc_file}).load),
+        ("load_npm_audit", NpmAuditLoader({"report_file": npm_file}).load),
+        ("load_reportmix", ReportMixLoader({"report_file": mix_file}).load),
+        ("hash", compute_hashes),
+        ("export_csv", export(CsvExporter, "csv")),
+        ("export_json", export(JsonExporter, "json")),
+        ("export_html", export(HtmlExporter, "html")),
+    ] + backends
+
+
+def compare(results: Dict[str, Dict[str, Result]], baselines: Dict[str, Dict[str, Result]],
+            threshold: float) -> List[str]:
+    """
+    Compare benchmark results with baselines.
+    :param results: Results by size and benchmark
+    :param baselines: Baselines by size and benchmark
+    :param threshold: Maximum allowed ratio between a result and its baseline
+    :return: Detected regressions
+    """
+    regressions = []
+    for size, size_results in results.items():
+        for name, result in size_results.items():
+            baseline = baselines.get(size, {}).get(name)
+            if not baseline:
+                continue
+            if result["wall"] > max(baseline["wall"] * threshold, baseline["wall"] + MIN_WALL):
+                regressions.append("{} ({}): {:.3f}s > {:.3f}s".format(
+                    name, size, result["wall"], baseline["wall"]))
+            if result["peak_memory"] > baseline["peak_memory"] * threshold:
+                regressions.append("{} ({}): {:.2f} MiB > {:.2f} MiB".format(
+                    name, size, result["peak_memory"] / 1024 / 1024,
+                    baseline["peak_memory"] / 1024 / 1024))
+    return regressions
+
+
+def main():
+    """
+    Run benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Run ReportMix benchmarks.")
+    parser.add_argument("--sizes", default="1k",
+                        help="comma-separated numbers of issues (e.g. 1k,100k,1m, default: 1k)")
+    parser.add_argument("--only", default="",
+                        help="comma-separated names of the benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs")
+    parser.add_argument("--save", action="store_true", help="store results as baselines")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if results regressed compared to baselines")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="maximum allowed result / baseline ratio (default: 1.25)")
+    parser.add_argument("--output", help="write results to a JSON file")
+    args = parser.parse_args()
+
+    only = [n.strip() for n in args.only.split(",") if n.strip()]
+    results: Dict[str, Dict[str, Result]] = {}
+    for size in args.sizes.split(","):
+        size = size.strip().lower()
+        count = parse_size(size)
+        with tempfile.TemporaryDirectory(prefix="reportmix-bench-") as data_dir:
+            print("Generating reports with {} issues".format(count))
+            for name, func in benchmarks(count, data_dir):
+                if only and name not in only:
+                    continue
+                result = measure(func, args.repeat)
+                results.setdefault(size, {})[name] = result
+                print("{:<24} {:>6} {:>10.3f}s {:>10.2f} MiB".format(
+                    name, size, result["wall"], result["peak_memory"] / 1024 / 1024))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    baselines = {}
+    if path.exists(BASELINES_FILE):
+        with open(BASELINES_FILE, "r", encoding="utf-8") as file:
+            baselines = json.load(file)
+    if args.check:
+        regressions = compare(results, baselines, args.threshold)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            sys.exit(1)
+        print("No regression")
+    if args.save:
+        for size, size_results in results.items():
+            baselines.setdefault(size, {}).update(size_results)
+        with open(BASELINES_FILE, "w", encoding="utf-8") as file:
+            json.dump(baselines, file, indent=2)
+            file.write("\n")
+        print("Baselines saved: " + BASELINES_FILE)
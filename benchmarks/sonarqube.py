@@ -0,0 +1,417 @@
+"""
+Fake SonarQube server.
+Local stand-in for the SonarQube Web API (projects, branches, issues, security
+hotspots and rules search) with configurable projects, branches and issue counts,
+latency and error injection, to test and benchmark the SonarQube loader offline.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from reportmix.loaders.sonarqube import PROPERTIES, SonarQubeLoader, TYPES
+
+# SonarQube severities (sorted by decreasing severity)
+SEVERITIES = ["BLOCKER", "CRITICAL", "MAJOR", "MINOR", "INFO"]
+
+# Maximum number of issues returned by the issues search (p * ps)
+MAX_RESULTS = 10000
+
+# Some rules to pick from
+RULES = ["java:S2076", "java:S3649", "java:S2755", "java:S1148", "java:S2095",
+         "javascript:S5247", "python:S5659", "java:S4790", "java:S2068", "java:S1192"]
+
+# Some security hotspot rules (and their security category) to pick from
+HOTSPOT_RULES = {"java:S2092": "insecure-conf", "java:S4507": "insecure-conf",
+                 "java:S5332": "encrypt-data", "java:S2245": "weak-cryptography",
+                 "javascript:S1523": "rce"}
+
+# Name of the main branch of projects
+MAIN_BRANCH = "master"
+
+# Vulnerability probabilities of security hotspots (sorted by decreasing probability)
+PROBABILITIES = ["HIGH", "MEDIUM", "LOW"]
+
+
+class FakeSonarQube:
+    """
+    Fake SonarQube server running in a background thread.
+    """
+
+    def __init__(self, issues: int = 1000, hotspots: int = 0, latency: float = 0, jitter: float = 0,
+                 version: str = "8.9.0.43852", project_key: str = "org.acme:acme-app",
+                 error_rate: float = 0, error_status: int = 502,
+                 error_pages: Optional[List[int]] = None, retry_after: Optional[str] = None,
+                 projects: Optional[List[str]] = None, branches: Optional[List[str]] = None,
+                 seed: int = 1):
+        """
+        Initialize the fake server.
+        :param issues: Number of issues in the project
+        :param hotspots: Number of security hotspots in the project
+        :param latency: Delay before each response (in seconds)
+        :param jitter: Maximum random delay added to the latency (in seconds)
+        :param version: Value of the Sonar-Version header
+        :param project_key: Project key
+        :param error_rate: Ratio of requests failing with error_status (0 to 1)
+        :param error_status: Status code of failed requests
+        :param error_pages: Indexes of the issues result pages failing on first request
+        :param retry_after: Value of the Retry-After header of failed requests
+        :param projects: Keys of other projects (with the same number of issues)
+        :param branches: Names of the branches of each project, other than the main branch
+        (with the same number of issues)
+        :param seed: Random seed
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.version = version
+        self.project_key = project_key
+        self.project_keys = [project_key] + (projects or [])
+        self.branches = branches or []
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_pages = set(error_pages or [])
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.issues: List[Dict] = []
+        self.hotspots: List[Dict] = []
+        targets = [(p, b) for p in self.project_keys for b in [""] + self.branches]
+        for index, (key, branch) in enumerate(targets):
+            self.issues += generate_issues(key, issues, seed + index, branch, index * issues)
+            self.hotspots += generate_hotspots(key, hotspots, seed + index, branch,
+                                               index * hotspots)
+        self.requests: List[str] = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        :return: The server URL
+        """
+        return "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def start(self) -> "FakeSonarQube":
+        """
+        Start the server in a background thread.
+        :return: The fake server
+        """
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeSonarQube":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def respond(self, url: str) -> Tuple[int, Dict]:
+        """
+        Compute the response to a request.
+        :param url: Requested URL (path and query string)
+        :return: Response status code and body
+        """
+        with self.lock:
+            self.requests.append(url)
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.error_rate
+        time.sleep(delay)
+        parts = urlsplit(url)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if failed:
+            return self.error_status, {"errors": [{"msg": "Injected error"}]}
+        if parts.path == "/api/projects/search":
+            return 200, self._projects(params)
+        if parts.path == "/api/project_branches/list":
+            return self._branches(params)
+        if parts.path == "/api/issues/search":
+            page = int(params.get("p", "1"))
+            with self.lock:
+                if page in self.error_pages:
+                    self.error_pages.remove(page)
+                    return self.error_status, {"errors": [{"msg": "Injected error"}]}
+            return self._issues(params)
+        if parts.path == "/api/hotspots/search":
+            return self._hotspots(params)
+        if parts.path == "/api/rules/search":
+            return 200, self._rules(params)
+        return 404, {"errors": [{"msg": "Unknown url"}]}
+
+    def _projects(self, params: Dict[str, str]) -> Dict:
+        """
+        Search projects.
+        :param params: Request parameters
+        :return: Response body
+        """
+        page, page_size = int(params.get("p", "1")), int(params.get("ps", "100"))
+        keys = params["projects"].split(",") if "projects" in params else self.project_keys
+        components = [{"organization": "default-organization", "key": key,
+                       "name": key.split(":")[-1], "qualifier": "TRK", "visibility": "public",
+                       "lastAnalysisDate": "2021-06-01T12:00:00+0200"}
+                      for key in self.project_keys
+                      if key in keys and params.get("q", "") in key]
+        start = (page - 1) * page_size
+        return {"paging": {"pageIndex": page, "pageSize": page_size, "total": len(components)},
+                "components": components[start:start + page_size]}
+
+    def _branches(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """
+        List branches of a project.
+        :param params: Request parameters
+        :return: Response status code and body
+        """
+        if params.get("project") not in self.project_keys:
+            return 404, {"errors": [{"msg": "Project not found"}]}
+        branches = [{"name": MAIN_BRANCH, "isMain": True, "type": "BRANCH",
+                     "analysisDate": "2021-06-01T12:00:00+0200"}]
+        branches += [{"name": name, "isMain": False, "type": "BRANCH",
+                      "analysisDate": "2021-05-01T12:00:00+0200"} for name in self.branches]
+        return 200, {"branches": branches}
+
+    def _issues(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """
+        Search issues.
+        :param params: Request parameters
+        :return: Response status code and body
+        """
+        page, page_size = int(params.get("p", "1")), int(params.get("ps", "100"))
+        if page * page_size > MAX_RESULTS:
+            return 400, {"errors": [{"msg": "Can return only the first {} results. {}th result "
+                                            "asked.".format(MAX_RESULTS, page * page_size)}]}
+        types = params.get("types", ",".join(TYPES)).split(",")
+        statuses = params.get("statuses", "OPEN").split(",")
+        issues = [i for i in self.issues if i["type"] in types and i["status"] in statuses
+                  and params.get("componentKeys") == i["project"]
+                  and params.get("branch", "") == i.get("branch", "")]
+        start = (page - 1) * page_size
+        return 200, {
+            "total": len(issues), "p": page, "ps": page_size,
+            "paging": {"pageIndex": page, "pageSize": page_size, "total": len(issues)},
+            "effortTotal": 0, "issues": issues[start:start + page_size], "components": [],
+            "facets": self._facets(params)
+        }
+
+    def _hotspots(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """
+        Search security hotspots.
+        :param params: Request parameters
+        :return: Response status code and body
+        """
+        page, page_size = int(params.get("p", "1")), int(params.get("ps", "100"))
+        if page * page_size > MAX_RESULTS:
+            return 400, {"errors": [{"msg": "Can return only the first {} results. {}th result "
+                                            "asked.".format(MAX_RESULTS, page * page_size)}]}
+        hotspots = [h for h in self.hotspots if params.get("projectKey") == h["project"]
+                    and params.get("branch", "") == h.get("branch", "")
+                    and h["status"] == params.get("status", h["status"])]
+        start = (page - 1) * page_size
+        return 200, {
+            "paging": {"pageIndex": page, "pageSize": page_size, "total": len(hotspots)},
+            "hotspots": hotspots[start:start + page_size], "components": []
+        }
+
+    @staticmethod
+    def _rules(params: Dict[str, str]) -> Dict:
+        """
+        Search rules (by key).
+        :param params: Request parameters
+        :return: Response body
+        """
+        keys = [k for k in params.get("rule_keys", "").split(",")
+                if k in RULES or k in HOTSPOT_RULES]
+        rules = [{"key": k, "repo": k.split(":")[0], "name": "Rule {}".format(k),
+                  "htmlDesc": "<p>Description of rule <code>{}</code> &amp; its "
+                              "fix.</p>".format(k), "severity": "MAJOR", "status": "READY"}
+                 for k in keys[:int(params.get("ps", "100"))]]
+        return {"total": len(rules), "p": 1, "ps": len(rules), "rules": rules}
+
+    def _facets(self, params: Dict[str, str]) -> List[Dict]:
+        """
+        Count issues for the requested facets (a facet is not filtered by its own parameter).
+        :param params: Request parameters
+        :return: Facets
+        """
+        filters = {"types": ("type", params.get("types", ",".join(TYPES)).split(",")),
+                   "statuses": ("status", params.get("statuses", "OPEN").split(","))}
+        facets = []
+        for facet in filter(None, params.get("facets", "").split(",")):
+            field = {"severities": "severity", "types": "type"}[facet]
+            counts = Counter(i[field] for i in self.issues
+                             if params.get("componentKeys") == i["project"]
+                             and params.get("branch", "") == i.get("branch", "")
+                             and all(i[f] in values for name, (f, values) in filters.items()
+                                     if name != facet))
+            facets.append({"property": facet, "values": [{"val": v, "count": n}
+                                                         for v, n in counts.most_common()]})
+        return facets
+
+    def _handler(self):
+        """
+        :return: The request handler class
+        """
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Fake SonarQube request handler.
+            """
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                Handle a GET request.
+                """
+                status, body = fake.respond(self.path)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Sonar-Version", fake.version)
+                if status == fake.error_status and fake.retry_after is not None:
+                    self.send_header("Retry-After", fake.retry_after)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def generate_issues(project_key: str, count: int, seed: int = 1, branch: str = "",
+                      first: int = 0) -> List[Dict]:
+    """
+    Generate SonarQube issues (sorted by decreasing severity, as with s=SEVERITY&asc=false).
+    :param project_key: Project key
+    :param count: Number of issues
+    :param seed: Random seed
+    :param branch: Branch name (empty for the main branch)
+    :param first: Index of the first issue (to generate unique keys)
+    :return: Generated issues
+    """
+    rnd = random.Random(seed)
+    base_date = datetime(2021, 6, 1, 12, 0, 0)
+    issues = []
+    for index in range(count):
+        file = "src/main/java/org/acme/Module{}.java".format(index % 300)
+        creation_date = base_date - timedelta(hours=rnd.randrange(10000))
+        issues.append({
+            "key": "AX{:010d}".format(first + index),
+            "rule": RULES[index % len(RULES)],
+            "severity": rnd.choice(SEVERITIES),
+            "component": project_key + ":" + file,
+            "project": project_key,
+            "line": rnd.randint(1, 800),
+            "hash": "{:032x}".format(rnd.getrandbits(128)),
+            "textRange": {},
+            "flows": [],
+            "status": rnd.choice(["OPEN", "OPEN", "OPEN", "CONFIRMED", "REOPENED"]),
+            "message": "Make sure that this usage is safe here ({}).".format(index),
+            "effort": "{}min".format(rnd.choice([5, 10, 15, 30])),
+            "debt": "10min",
+            "author": "dev@acme.org",
+            "tags": rnd.sample(["cwe", "owasp-a1", "cert", "sans-top25"], 2),
+            "creationDate": creation_date.strftime("%Y-%m-%dT%H:%M:%S+0200"),
+            "updateDate": base_date.strftime("%Y-%m-%dT%H:%M:%S+0200"),
+            "type": rnd.choice(["BUG", "VULNERABILITY", "CODE_SMELL"]),
+            "scope": "MAIN"
+        })
+        if branch:
+            issues[-1]["branch"] = branch
+    issues.sort(key=lambda i: SEVERITIES.index(i["severity"]))
+    return issues
+
+
+def generate_hotspots(project_key: str, count: int, seed: int = 1, branch: str = "",
+                        first: int = 0) -> List[Dict]:
+    """
+    Generate SonarQube security hotspots (unsorted, as returned by the hotspots search).
+    :param project_key: Project key
+    :param count: Number of security hotspots
+    :param seed: Random seed
+    :param branch: Branch name (empty for the main branch)
+    :param first: Index of the first security hotspot (to generate unique keys)
+    :return: Generated security hotspots
+    """
+    rnd = random.Random(seed)
+    base_date = datetime(2021, 6, 1, 12, 0, 0)
+    hotspots = []
+    for index in range(count):
+        rule = rnd.choice(sorted(HOTSPOT_RULES))
+        creation_date = base_date - timedelta(hours=rnd.randrange(10000))
+        hotspots.append({
+            "key": "AY{:010d}".format(first + index),
+            "component": project_key + ":src/main/java/org/acme/Config{}.java".format(index % 50),
+            "project": project_key,
+            "securityCategory": HOTSPOT_RULES[rule],
+            "vulnerabilityProbability": rnd.choice(PROBABILITIES),
+            "status": rnd.choice(["TO_REVIEW", "TO_REVIEW", "REVIEWED"]),
+            "line": rnd.randint(1, 400),
+            "message": "Make sure this configuration is safe here ({}).".format(index),
+            "author": "dev@acme.org",
+            "creationDate": creation_date.strftime("%Y-%m-%dT%H:%M:%S+0200"),
+            "updateDate": base_date.strftime("%Y-%m-%dT%H:%M:%S+0200"),
+            "ruleKey": rule
+        })
+        if branch:
+            hotspots[-1]["branch"] = branch
+    return hotspots
+
+
+def loader_config(server: FakeSonarQube, **overrides: str) -> Dict[str, str]:
+    """
+    Build the SonarQube loader configuration to load issues from the fake server.
+    :param server: Fake server
+    :param overrides: Configuration values to override
+    :return: Loader configuration
+    """
+    config = {p.name: p.default for p in PROPERTIES}
+    config.update(host_url=server.url, project_key=server.project_key,
+                  types="BUG,VULNERABILITY,CODE_SMELL", statuses="OPEN,CONFIRMED,REOPENED")
+    config.update(overrides)
+    return config
+
+
+def main():
+    """
+    Benchmark the SonarQube loader throughput versus simulated latency.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the SonarQube loader.")
+    parser.add_argument("--issues", type=int, default=5000, help="number of issues per project")
+    parser.add_argument("--projects", type=int, default=1, help="number of projects")
+    parser.add_argument("--workers", default="8", help="projects fetched concurrently")
+    parser.add_argument("--latencies", default="0,0.05,0.2",
+                        help="comma-separated page latencies (in seconds)")
+    parser.add_argument("--jitter", type=float, default=0, help="maximum random extra latency")
+    args = parser.parse_args()
+
+    projects = ["org.acme:acme-app-{}".format(i) for i in range(1, args.projects)]
+    print("{:>10} {:>8} {:>10} {:>12}".format("Latency", "Issues", "Duration", "Issues/s"))
+    for latency in args.latencies.split(","):
+        with FakeSonarQube(args.issues, latency=float(latency), jitter=args.jitter,
+                           projects=projects) as server:
+            config = loader_config(server, workers=args.workers)
+            if projects:
+                config["project_key"] = "org.acme:*"
+            start = time.perf_counter()
+            report = SonarQubeLoader(config).load()
+            duration = time.perf_counter() - start
+        print("{:>9}s {:>8} {:>9.3f}s {:>12.0f}".format(
+            latency, len(report.issues), duration, len(report.issues) / duration))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Library API: merge in-memory reports and export the merged report to memory,
+without reading or writing files (to embed ReportMix in another application).
+Logging and the JSON backend are left as configured by the application
+(messages are emitted by "reportmix.*" loggers, see json_backend.use()).
+
+    report = api.merge({"npm_audit": npm_audit_bytes, "reportmix": issues_list},
+                       {"meta.product": "app"})
+    csv_bytes = api.export(report, "csv")
+"""
+
+import io
+from typing import Any, Dict, IO, List, Optional, TextIO, Union
+
+from reportmix.config.builder import ConfigBuilder, GLOBAL_CONFIG
+from reportmix.errors import AppError
+from reportmix.mixer import EXPORTERS, LOADERS, ReportMixer, export_fields
+from reportmix.models.report import Report
+
+# A report to load: content (bytes or str), file object (binary or text mode)
+# or parsed JSON document (dict or list)
+ReportInput = Union[bytes, str, IO, Dict[str, Any], List[Any]]
+
+# Options forced to keep everything in memory
+IN_MEMORY_OPTIONS = {"stream": "false", "memory_limit": "0", "cache_dir": "", "profile": "",
+                     "shard_by": "", "shard_rows": "0", "shard_size": "0"}
+
+
+def configure(options: Dict[str, str] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Build the configuration from default values and given options only
+    (command-line arguments and configuration files are ignored).
+    :param options: Configuration values by property name, as command-line arguments
+    without the leading dashes (e.g. {"fields": "identifier,name", "meta.product": "app"})
+    :return: Configuration
+    """
+    return ConfigBuilder("").from_options(options or {})
+
+
+def load(loader: str, data: ReportInput, options: Dict[str, str] = None) -> Report:
+    """
+    Load a report from memory.
+    :param loader: Loader name (dependency_check, npm_audit or reportmix)
+    :param data: Report content, file object or parsed JSON document (for the
+    reportmix loader: decoded JSON report or issues mapped with Issue.to_dict())
+    :param options: Configuration values (see configure())
+    :return: Loaded report (without metadata fields and hashes)
+    """
+    if loader not in LOADERS:
+        raise AppError("Unknown loader {}".format(loader))
+    instance = LOADERS[loader](configure(options)[loader])
+    if isinstance(data, (dict, list)):
+        return instance.parse_data(data)
+    if isinstance(data, str):
+        return instance.parse(io.StringIO(data, newline=""))
+    if isinstance(data, io.TextIOBase):
+        return instance.parse(data)
+    # Binary content or stream (a given stream is left open)
+    report_file = io.TextIOWrapper(io.BytesIO(data) if isinstance(data, bytes) else data,
+                                   encoding="utf-8", newline="")
+    try:
+        return instance.parse(report_file)
+    finally:
+        report_file.detach()
+
+
+def merge(reports: Dict[str, ReportInput], options: Dict[str, str] = None) -> Report:
+    """
+    Merge reports from memory: set metadata fields and hashes, then group
+    and sort issues as configured (the merged report is not exported).
+    :param reports: Reports to merge by loader name
+    :param options: Configuration values (see configure())
+    :return: Merged report
+    """
+    config = configure(dict(options or {}, **IN_MEMORY_OPTIONS))
+    mixer = ReportMixer(config)
+    # Only given reports are merged (other loaders are not run)
+    mixer.reports = {name: Report([], []) for name in mixer.loaders}
+    for name, data in reports.items():
+        mixer.set_report(name, load(name, data, options))
+    return mixer.merge([], export=False)
+
+
+def export(report: Report, output_format: str, options: Dict[str, str] = None,
+           output: TextIO = None) -> Optional[bytes]:
+    """
+    Export a merged report to memory.
+    :param report: Merged report
+    :param output_format: Report format (csv, json, ndjson or html)
+    :param options: Configuration values (see configure(), e.g. fields or title)
+    :param output: Text stream to write the report to (left open)
+    :return: Exported report (UTF-8 encoded), None if written to the output stream
+    """
+    if output_format not in EXPORTERS:
+        raise AppError("Unknown format {}".format(output_format))
+    config = configure(options)[GLOBAL_CONFIG]
+    exporter = EXPORTERS[output_format](config)
+    fields = export_fields(config["fields"], bool(config["group_by"]))
+    if output is not None:
+        exporter.export(report, output, fields)
+        return None
+    buffer = io.StringIO(newline="")
+    exporter.export(report, buffer, fields)
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,176 @@
+"""
+Report files inside archives and the standard input.
+"""
+
+import fnmatch
+import io
+import sys
+import tarfile
+import zipfile
+from contextlib import contextmanager
+from os import path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+# Path to read a report from the standard input
+STDIN = "-"
+
+# Separator between the path to an archive and the path to a member
+MEMBER_SEPARATOR = "!/"
+
+# Extensions of supported tar archives (possibly compressed)
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def split_member(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a path to a member of an archive (e.g. artifacts.zip!/report.csv).
+    :param file_path: Path to a file or to a member of an archive
+    :return: Path to the archive (or the file) and path to the member (None if not a member)
+    """
+    if MEMBER_SEPARATOR not in file_path:
+        return file_path, None
+    archive_path, member = file_path.split(MEMBER_SEPARATOR, 1)
+    return archive_path, member
+
+
+def container(file_path: str) -> str:
+    """
+    Return the path to the local file containing a report (the archive for a member).
+    :param file_path: Path to a file or to a member of an archive
+    :return: Path to the local file
+    """
+    return split_member(file_path)[0]
+
+
+def members(archive_path: str) -> List[str]:
+    """
+    List regular files in an archive.
+    :param archive_path: Path to the archive (zip or tar)
+    :return: Paths to the members (empty if the archive is not readable)
+    """
+    try:
+        if archive_path.endswith(TAR_EXTENSIONS):
+            with tarfile.open(archive_path, "r:*") as archive:
+                return [m.name for m in archive.getmembers() if m.isfile()]
+        with zipfile.ZipFile(archive_path) as archive:
+            return [m.filename for m in archive.infolist() if not m.is_dir()]
+    except (OSError, tarfile.TarError, zipfile.BadZipFile):
+        return []
+
+
+def listed_members(archive_path: str, listings: Dict[str, Set[str]] = None) -> Set[str]:
+    """
+    List regular files in an archive, reading the archive only once per listings.
+    :param archive_path: Path to the archive (zip or tar)
+    :param listings: Members by archive path, already listed (updated, default: no reuse)
+    :return: Paths to the members (empty if the archive is not readable)
+    """
+    if listings is None:
+        return set(members(archive_path))
+    if archive_path not in listings:
+        listings[archive_path] = set(members(archive_path))
+    return listings[archive_path]
+
+
+def find_members(pattern: str, listings: Dict[str, Set[str]] = None) -> List[str]:
+    """
+    Find members of an archive matching a glob pattern (e.g. artifacts.zip!/*/report.csv).
+    :param pattern: Path to the archive and glob pattern of the members
+    :param listings: Members by archive path, already listed (see listed_members())
+    :return: Paths to the matching members, sorted by path
+    """
+    archive_path, member = split_member(pattern)
+    return sorted(archive_path + MEMBER_SEPARATOR + m
+                  for m in listed_members(archive_path, listings)
+                  if fnmatch.fnmatchcase(m, member))
+
+
+def is_file(file_path: str, listings: Dict[str, Set[str]] = None) -> bool:
+    """
+    Check if a report file exists (a regular file, a member of an archive or the standard input).
+    :param file_path: Path to the file
+    :param listings: Members by archive path, already listed (see listed_members())
+    :return: True if the report file exists
+    """
+    if file_path == STDIN:
+        return True
+    archive_path, member = split_member(file_path)
+    if member is None:
+        return path.isfile(file_path)
+    return member in listed_members(archive_path, listings)
+
+
+@contextmanager
+def open_binary(file_path: str) -> Iterator[BinaryIO]:
+    """
+    Open a report file in binary mode (a regular file, a member of an archive or the
+    standard input). Members are decompressed on the fly, without extracting them to disk.
+    :param file_path: Path to the file
+    :return: A binary stream (not seekable for members and the standard input)
+    """
+    if file_path == STDIN:
+        yield sys.stdin.buffer
+        return
+    archive_path, member = split_member(file_path)
+    if member is None:
+        with open(file_path, "rb") as file:
+            yield file
+    elif archive_path.endswith(TAR_EXTENSIONS):
+        # Only errors raised while opening the member are reported as missing members
+        try:
+            archive = tarfile.open(archive_path, "r:*")
+        except tarfile.TarError as ex:
+            raise member_error(archive_path, member, ex) from ex
+        with archive:
+            try:
+                file = archive.extractfile(member)
+            except (KeyError, tarfile.TarError) as ex:
+                raise member_error(archive_path, member, ex) from ex
+            if file is None:
+                raise member_error(archive_path, member, "not a regular file")
+            with file:
+                yield file
+    else:
+        try:
+            archive = zipfile.ZipFile(archive_path)
+        except zipfile.BadZipFile as ex:
+            raise member_error(archive_path, member, ex) from ex
+        with archive:
+            try:
+                file = archive.open(member)
+            except (KeyError, zipfile.BadZipFile) as ex:
+                raise member_error(archive_path, member, ex) from ex
+            with file:
+                yield file
+
+
+def member_error(archive_path: str, member: str, cause) -> OSError:
+    """
+    Create the error raised when a member of an archive cannot be opened.
+    :param archive_path: Path to the archive
+    :param member: Path to the member
+    :param cause: Cause of the error (exception or message)
+    :return: The error
+    """
+    return OSError("Failed to read {} in archive {}: {}".format(member, archive_path, cause))
+
+
+@contextmanager
+def open_text(file_path: str, encoding: str = None, newline: str = None) -> Iterator[TextIO]:
+    """
+    Open a report file in text mode (see open_binary()).
+    :param file_path: Path to the file
+    :param encoding: Text encoding (default: the preferred encoding, as open())
+    :param newline: Newline mode (as open())
+    :return: A text stream
+    """
+    if file_path != STDIN and MEMBER_SEPARATOR not in file_path:
+        with open(file_path, "r", encoding=encoding, newline=newline) as file:
+            yield file
+        return
+    with open_binary(file_path) as binary:
+        text = io.TextIOWrapper(binary, encoding=encoding, newline=newline)
+        try:
+            yield text
+        finally:
+            text.detach()  # The binary stream is closed by open_binary()
@@ -0,0 +1,193 @@
+"""
+Batch mode.
+"""
+
+import csv
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from os import path
+from typing import Dict, List, Set, Tuple, Union
+
+from reportmix import json_backend
+from reportmix.config.builder import ConfigBuilder, GLOBAL_CONFIG
+from reportmix.errors import AppError
+from reportmix.mixer import ReportMixer
+from reportmix.nvd import index_path, update_index
+
+logger = logging.getLogger(__name__)
+
+# Result of the merge for a project
+ProjectSummary = Dict[str, Union[str, int, float]]
+
+# Fields of the batch summary
+SUMMARY_FIELDS = ["config_file", "status", "issues", "tools", "duration", "error"]
+
+
+class BatchMixer:
+    """
+    Merge reports for multiple projects (one configuration file per project)
+    in a pool of processes.
+    """
+
+    def __init__(self, builder: ConfigBuilder, config: Dict[str, Dict[str, str]]):
+        """
+        Initialize the batch mixer.
+        :param builder: Configuration builder (to build the configuration of each project)
+        :param config: Global configuration
+        """
+        self.builder = builder
+        self.config = config[GLOBAL_CONFIG]
+
+    def merge(self) -> List[ProjectSummary]:
+        """
+        Merge reports for all projects and write the batch summary.
+        :return: Summary for each project
+        """
+        config_files = find_config_files(self.config["batch"])
+        if not config_files:
+            raise AppError("No configuration file found for batch {}".format(self.config["batch"]))
+
+        # Build configuration for each project
+        results: Dict[str, ProjectSummary] = {}
+        configs = {}
+        indexes: Set[Tuple[str, str]] = set()
+        for config_file in config_files:
+            try:
+                if not path.isfile(config_file):
+                    raise AppError("Configuration file not found")
+                config = self.builder.build(config_file)
+                update_nvd_index(config_file, config, indexes)
+                configs[config_file] = config
+            except AppError as err:
+                results[config_file] = summary(config_file, error=str(err))
+
+        # Merge reports for each project
+        jobs = min(int(self.config["jobs"]) or os.cpu_count() or 1, max(len(configs), 1))
+        logger.info("Merge reports for %d project(s) (jobs: %d)", len(configs), jobs)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=jobs, initializer=json_backend.use,
+                                 initargs=(json_backend.backend,)) as executor:
+            for result in executor.map(merge_project, configs.keys(), configs.values()):
+                results[result["config_file"]] = result
+        results_list = [results[f] for f in config_files]
+        logger.info("Merged reports for %d project(s) in %.2fs",
+                    len(results_list), time.perf_counter() - start)
+
+        # Summary
+        self._write_summary(results_list)
+        failures = [r for r in results_list if r["status"] != "OK"]
+        if failures:
+            raise AppError("Failed to merge reports for {} / {} project(s)"
+                           .format(len(failures), len(results_list)))
+        return results_list
+
+    def _write_summary(self, results: List[ProjectSummary]):
+        """
+        Log the batch summary as a table and write it to a CSV file.
+        :param results: Summary for each project
+        """
+        width = max(len(r["config_file"]) for r in results)
+        logger.info("%s | %-6s | %8s | %5s | %9s", "Project".ljust(width),
+                    "Status", "Issues", "Tools", "Duration")
+        for result in results:
+            logger.info("%s | %-6s | %8d | %5d | %8.2fs", result["config_file"].ljust(width),
+                        result["status"], result["issues"], result["tools"], result["duration"])
+            if result["error"]:
+                logger.error("%s: %s", result["config_file"], result["error"])
+        output_dir: str = path.realpath(self.config["output_dir"])
+        if not path.isdir(output_dir):
+            raise AppError("Invalid output directory {}".format(output_dir))
+        summary_file_path = path.join(output_dir, "reportmix-batch.csv")
+        with open(summary_file_path, "w", newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        logger.info("Batch summary exported: %s", summary_file_path)
+
+
+def merge_project(config_file: str, config: Dict[str, Dict[str, str]]) -> ProjectSummary:
+    """
+    Merge reports for a project (run in a worker process).
+    Relative paths are resolved from the directory of the configuration file.
+    :param config_file: Path to the project configuration file
+    :param config: Project configuration
+    :return: Project summary
+    """
+    start = time.perf_counter()
+    working_dir = os.getcwd()
+    try:
+        os.chdir(path.dirname(path.realpath(config_file)))
+        # The NVD index is updated by the parent process (opened in read-only mode)
+        mixer = ReportMixer(config, update_nvd=False)
+        mixer.run()
+        tools = len(mixer.summary.totals) if mixer.report is None else len(mixer.report.tools)
+        return summary(config_file, mixer.count, tools, time.perf_counter() - start)
+    except Exception as ex:
+        return summary(config_file, duration=time.perf_counter() - start, error=str(ex))
+    finally:
+        os.chdir(working_dir)
+
+
+def update_nvd_index(config_file: str, config: Dict[str, Dict[str, str]],
+                     indexes: Set[Tuple[str, str]]):
+    """
+    Update the NVD index of a project (if enabled) before merging reports in worker
+    processes, to update each index once instead of concurrently from each process.
+    Relative paths are resolved from the directory of the configuration file.
+    :param config_file: Path to the project configuration file
+    :param config: Project configuration
+    :param indexes: Feeds directory and database of the indexes already updated (updated)
+    """
+    global_config = config[GLOBAL_CONFIG]
+    if not global_config["nvd_dir"]:
+        return
+    config_dir = path.dirname(path.realpath(config_file))
+    feed_dir = path.realpath(path.join(config_dir, global_config["nvd_dir"]))
+    database = path.realpath(index_path(feed_dir, global_config["nvd_index"]
+                                        and path.join(config_dir, global_config["nvd_index"])))
+    if (feed_dir, database) not in indexes:
+        update_index(feed_dir, database)
+        indexes.add((feed_dir, database))
+
+
+def summary(config_file: str, issues: int = 0, tools: int = 0, duration: float = 0,
+            error: str = "") -> ProjectSummary:
+    """
+    Build the summary of the merge for a project.
+    :param config_file: Path to the project configuration file
+    :param issues: Number of merged issues
+    :param tools: Number of tools
+    :param duration: Merge duration (in seconds)
+    :param error: Error message (if the merge failed)
+    :return: Project summary
+    """
+    return {"config_file": config_file, "status": "FAILED" if error else "OK",
+            "issues": issues, "tools": tools, "duration": round(duration, 3), "error": error}
+
+
+def find_config_files(patterns: str) -> List[str]:
+    """
+    Find configuration files from a list of paths and glob patterns.
+    :param patterns: Comma-separated list of paths and glob patterns,
+    "@file" to read the list from a manifest file (one path or pattern per line,
+    relative to the manifest directory)
+    :return: Paths to the configuration files (without duplicates)
+    """
+    files = []
+    for pattern in patterns.split(","):
+        pattern = pattern.strip()
+        if pattern.startswith("@"):
+            manifest_dir = path.dirname(pattern[1:])
+            with open(pattern[1:], "r", encoding="utf8") as manifest:
+                lines = [line.strip() for line in manifest]
+            files.extend(find_config_files(",".join(
+                path.join(manifest_dir, line) for line in lines
+                if line and not line.startswith("#"))))
+        elif any(c in pattern for c in "*?["):
+            files.extend(sorted(glob.glob(pattern, recursive=True)))
+        elif pattern:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
@@ -0,0 +1,258 @@
+"""
+Persistent caches of parsed report files and of metadata records.
+"""
+
+import gc
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from os import path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from reportmix import archive
+from reportmix.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+# Version of the cache entries format (change it to invalidate all entries)
+FORMAT_VERSION = "1"
+
+# Cache entries file extension
+EXTENSION = ".pickle"
+
+# Size of the blocks read to compute the content hash of a file
+BLOCK_SIZE = 1024 * 1024
+
+
+class ReportCache:
+    """
+    Store reports parsed from files in a directory (pickle format), keyed by the
+    fingerprint (path, size, modification time and content hash) of the file and of
+    the related files read with it, the loader
+    version and its configuration. The least recently used entries are evicted
+    when the total size of the cache exceeds the limit.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        """
+        Initialize the cache.
+        :param directory: Path to the cache directory (created if missing)
+        :param max_size: Maximum total size of cache entries in bytes (0 for no limit)
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, report_file_path: str, loader: str, version: str,
+            config: Dict[str, str], related_files: Iterable[str] = ()) -> str:
+        """
+        Compute the key of a report file.
+        :param report_file_path: Path to the report file (or to a member of an archive)
+        :param loader: Loader identifier (e.g. its class name)
+        :param version: Loader version
+        :param config: Loader configuration
+        :param related_files: Paths to other files read with the report file if they
+        exist (e.g. an optional JSON report next to a CSV one)
+        :return: The cache key
+        """
+        fingerprint = [FORMAT_VERSION, file_fingerprint(report_file_path),
+                       [file_fingerprint(f) for f in related_files
+                        if archive.is_file(f)], loader, version,
+                       sorted((k, str(v)) for k, v in config.items())]
+        return hashlib.sha256(json.dumps(fingerprint).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Report]:
+        """
+        Get a cached report and mark it as recently used.
+        :param key: Cache key
+        :return: The cached report (None if missing or unreadable)
+        """
+        entry_path = self._path(key)
+        try:
+            with open(entry_path, "rb") as entry, gc_paused():
+                report = pickle.load(entry)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as ex:
+            logger.warning("Invalid cache entry %s removed: %s", entry_path, ex)
+            self._remove(entry_path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return report
+
+    def put(self, key: str, report: Report):
+        """
+        Store a report in the cache, then evict least recently used entries
+        if the cache is too large. Errors are logged and ignored.
+        :param key: Cache key
+        :param report: Report to store
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first to never expose partial entries
+            fd, temp_path = tempfile.mkstemp(EXTENSION + ".tmp", dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as entry, gc_paused():
+                    pickle.dump(report, entry, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                self._remove(temp_path)
+                raise
+            self.evict()
+        except Exception as ex:
+            logger.warning("Failed to write the report to the cache: %s", ex)
+
+    def evict(self):
+        """
+        Remove least recently used entries until the total size
+        of the cache is below the limit.
+        """
+        if self.max_size <= 0:
+            return
+        entries = []
+        for entry_path in self.entries():
+            try:
+                stat = os.stat(entry_path)
+                entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+            except OSError:
+                continue  # Removed concurrently
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            logger.debug("Evict cache entry %s", entry_path)
+            self._remove(entry_path)
+            total_size -= size
+
+    def entries(self) -> List[str]:
+        """
+        List cache entries.
+        :return: Paths to cache entries files
+        """
+        if not path.isdir(self.directory):
+            return []
+        return [path.join(self.directory, f) for f in os.listdir(self.directory)
+                if f.endswith(EXTENSION)]
+
+    def _path(self, key: str) -> str:
+        return path.join(self.directory, key + EXTENSION)
+
+    @staticmethod
+    def _remove(entry_path: str):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+
+class MetadataCache:
+    """
+    Store metadata records (e.g. SonarQube rules) by key in memory (thread-safe)
+    and in a JSON file (optional), records expire after a time to live.
+    """
+
+    def __init__(self, file_path: Optional[str], ttl: float):
+        """
+        Initialize the cache.
+        :param file_path: Path to the cache file (None to keep records in memory only)
+        :param ttl: Time to live of records in seconds
+        """
+        self.file_path = file_path
+        self.ttl = ttl
+        # Records by key (with the time they were stored at)
+        self.records: Dict[str, Tuple[float, Any]] = {}
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    def get(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get records that did not expire.
+        :param keys: Keys of the records
+        :return: Cached records by key (missing and expired records are not included)
+        """
+        with self.lock:
+            self._load()
+            now = time.time()
+            return {k: self.records[k][1] for k in keys
+                    if k in self.records and now - self.records[k][0] < self.ttl}
+
+    def put(self, records: Dict[str, Any]):
+        """
+        Store records, then write unexpired records to the cache file.
+        Errors are logged and ignored.
+        :param records: Records by key (JSON serializable)
+        """
+        with self.lock:
+            self._load()
+            now = time.time()
+            self.records.update((k, (now, v)) for k, v in records.items())
+            self.records = {k: r for k, r in self.records.items() if now - r[0] < self.ttl}
+            if self.file_path is None:
+                return
+            try:
+                directory = path.dirname(self.file_path) or "."
+                os.makedirs(directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as file:
+                        json.dump(self.records, file)
+                    os.replace(temp_path, self.file_path)
+                except BaseException:
+                    ReportCache._remove(temp_path)
+                    raise
+            except Exception as ex:
+                logger.warning("Failed to write the cache file %s: %s", self.file_path, ex)
+
+    def _load(self):
+        """
+        Load records from the cache file (once).
+        """
+        if self.loaded or self.file_path is None:
+            return
+        self.loaded = True
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                self.records.update((k, tuple(r)) for k, r in json.load(file).items())
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            logger.warning("Invalid cache file %s ignored: %s", self.file_path, ex)
+
+
+def file_fingerprint(file_path: str) -> List[Any]:
+    """
+    Compute the fingerprint of a file: path, size, modification time and content hash.
+    :param file_path: Path to the file (or to a member of an archive)
+    :return: The file fingerprint
+    """
+    stat = os.stat(archive.container(file_path))
+    content_hash = hashlib.sha256()
+    with archive.open_binary(file_path) as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b""):
+            content_hash.update(block)
+    return [path.realpath(file_path), stat.st_size, stat.st_mtime_ns, content_hash.hexdigest()]
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pause the garbage collector, e.g. while (de)serializing a large number of
+    objects that would trigger useless collections.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
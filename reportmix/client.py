@@ -0,0 +1,130 @@
+"""
+HTTP client with timeouts, retries and rate limiting.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Status codes of the responses to retry
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter (thread-safe), to share a maximum
+    request rate between concurrent requests.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the rate limiter.
+        :param rate: Maximum number of requests per second (0 to disable)
+        :param burst: Maximum number of requests sent at once
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait for a token to be available and take it.
+        """
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """
+    HTTP client retrying failed requests (connection errors, timeouts,
+    throttling and server errors) with exponential backoff and jitter.
+    """
+
+    def __init__(self, session: requests.Session, timeout: float = 30, retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 30,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize the HTTP client.
+        :param session: HTTP session
+        :param timeout: Connect and read timeout (in seconds, 0 to disable)
+        :param retries: Maximum number of retries of a failed request
+        :param backoff: Base delay before retrying (in seconds), doubled on each retry
+        :param max_backoff: Maximum delay before retrying (unless requested by the server)
+        :param rate_limiter: Rate limiter shared with other clients
+        """
+        self.session = session
+        self.timeout = timeout or None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request, retry on failure.
+        :param url: Request URL
+        :param kwargs: Other request arguments
+        :return: The successful response
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                resp = self.session.get(url, timeout=self.timeout, **kwargs)
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    resp.raise_for_status()
+                    return resp
+                delay = retry_after(resp)
+                reason = "HTTP {}".format(resp.status_code)
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                if attempt >= self.retries:
+                    raise
+                delay, reason = None, type(ex).__name__
+            if delay is None:
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            attempt += 1
+            logger.debug("Request failed (%s), retry %d / %d in %.2fs",
+                         reason, attempt, self.retries, delay)
+            time.sleep(delay)
+
+
+def retry_after(resp: requests.Response) -> Optional[float]:
+    """
+    Get the delay requested by the server before retrying.
+    :param resp: HTTP response
+    :return: Delay in seconds (None if not requested)
+    """
+    value = resp.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdecimal():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0)
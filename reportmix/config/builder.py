@@ -6,7 +6,7 @@ import argparse
 import configparser
 import logging
 from os.path import exists, realpath
-from typing import Dict
+from typing import Dict, List, Optional
 
 from reportmix.config.property import ConfigProperty
 from reportmix.errors import AppError
@@ -14,6 +14,8 @@ from reportmix.loaders import dependency_check, sonarqube, npm_audit, reportmix
 from reportmix.models import meta
 from reportmix.models.issue import HASH_FIELDS
 
+logger = logging.getLogger(__name__)
+
 # Configuration global group name (for global configuration properties)
 GLOBAL_CONFIG = "global"
 
@@ -21,14 +23,80 @@ GLOBAL_CONFIG = "global"
 PROPERTIES = [
     ConfigProperty("output_dir", "the location to write the report", True, "./"),
     ConfigProperty("config_file", "the path to the configuration file", True, ".reportmix"),
-    ConfigProperty("formats", "report formats to be generated (csv, html, json)",
-                   True, "html", "^((F),)*(F)$".replace("F", "csv|html|json")),
+    ConfigProperty("formats", "report formats to be generated (csv, html, json, ndjson)",
+                   True, "html", "^((F),)*(F)$".replace("F", "csv|html|json|ndjson")),
     ConfigProperty("fields", "fields to include in the output report (CSV and HTML only)",
                    True, "all", r"^((\w+),)*(\w+)$"),
     ConfigProperty("hash", "fields to use for hash generation",
                    True, ",".join(HASH_FIELDS), r"^((\w+),)*(\w+)$"),
     ConfigProperty("title", "the HTML report title", True, "Issues Report", "^.{1,64}$"),
-    ConfigProperty("logo", "the URL to the organization logo to display on the HTML report", False)
+    ConfigProperty("logo", "the URL to the organization logo to display on the HTML report", False),
+    ConfigProperty("watch", "watch input reports and merge them again on changes "
+                            "(polling interval in seconds, 0 to disable)",
+                   True, "0", r"^\d+(\.\d+)?$"),
+    ConfigProperty("watch_debounce", "time to wait for input reports to be stable "
+                                     "before merging them again (in seconds)",
+                   True, "1", r"^\d+(\.\d+)?$"),
+    ConfigProperty("batch", "merge reports for multiple projects: comma-separated list of "
+                            "configuration files or glob patterns (@file to read the list from "
+                            "a manifest file)", False),
+    ConfigProperty("jobs", "maximum number of parallel jobs (projects merged in batch mode, "
+                           "reports parsed in server mode, shards exported, 0 to use all CPUs)",
+                   True, "0", r"^\d+$"),
+    ConfigProperty("serve", "run a local HTTP service to upload and merge reports, "
+                            "listening on the given address (host:port)",
+                   False, "", r"^([\w.\-]+:\d+)?$"),
+    ConfigProperty("serve_max_size", "maximum size of an uploaded report in MiB in server mode "
+                                     "(larger ones are rejected)", True, "256", r"^\d+$"),
+    ConfigProperty("profile", "measure duration and peak memory of each stage "
+                              "(table: log a table, json: also write reportmix-profile.json)",
+                   False, "", "^(table|json)?$"),
+    ConfigProperty("memory_limit", "memory budget for loaded issues in MiB, issues beyond "
+                                   "are spilled to temporary files (0 to disable)",
+                   True, "0", r"^\d+$"),
+    ConfigProperty("stream", "load, merge and export issues one at a time "
+                             "instead of building the merged report (true or false)",
+                   True, "false", "^(true|false)$"),
+    ConfigProperty("sort", "fields to sort issues by, with an optional order "
+                           "(e.g. severity:desc,tool_name, default: loading order)",
+                   False, "", "^(S(,S)*)?$".replace("S", r"\w+(:(asc|desc))?")),
+    ConfigProperty("cache_dir", "the location to cache parsed report files in "
+                                "(empty to disable the cache)", False, ""),
+    ConfigProperty("cache_size", "maximum size of the cache in MiB, least recently "
+                                 "used reports are evicted beyond (0 for no limit)",
+                   True, "256", r"^\d+$"),
+    ConfigProperty("group_by", "fields to group issues by, each group is exported as one "
+                               "issue with the highest severity, the number of evidences and "
+                               "the affected subjects (e.g. identifier)",
+                   False, "", r"^(\w+(,\w+)*)?$"),
+    ConfigProperty("shard_by", "split the merged report into one set of output files per "
+                               "value of a field (e.g. project_identifier)",
+                   False, "", r"^\w*$"),
+    ConfigProperty("shard_rows", "split the merged report into output files with at most "
+                                 "the given number of issues (0 to disable)",
+                   True, "0", r"^\d+$"),
+    ConfigProperty("shard_size", "split the merged report into output files of about the "
+                                 "given size in MiB (estimated from issues fields, 0 to disable)",
+                   True, "0", r"^\d+$"),
+    ConfigProperty("summary", "only count issues by tool, severity and type "
+                              "instead of merging and exporting them (true or false)",
+                   True, "false", "^(true|false)$"),
+    ConfigProperty("fail_on", "quality gate: fail if there are issues with one of the given "
+                              "severities or a higher one, with an optional maximum number "
+                              "of issues (e.g. HIGH or CRITICAL:0,MEDIUM:10)",
+                   False, "", r"^(S(,S)*)?$".replace("S", r"\w+(:\d+)?")),
+    ConfigProperty("suppression_file", "the location of the CSV file listing issues to "
+                                       "suppress (accepted risks) by hash or field patterns",
+                   False, ""),
+    ConfigProperty("nvd_dir", "the location of a local mirror of the NVD JSON feeds, to fill "
+                              "missing scores, severities, categories and source dates of "
+                              "issues by CVE (empty to disable)", False, ""),
+    ConfigProperty("nvd_index", "the location of the NVD feeds index "
+                                "(default: reportmix-nvd.db in the NVD feeds directory)",
+                   False, ""),
+    ConfigProperty("json_backend", "library to parse and write JSON reports with "
+                                   "(auto: the fastest installed one, orjson, ujson or json)",
+                   True, "auto", "^(auto|orjson|ujson|json)$")
 ]
 
 
@@ -76,34 +144,86 @@ class ConfigBuilder:
                 self.parser.add_argument(name, type=str, metavar=prop.name.upper(),
                                          default=argparse.SUPPRESS, help=description)
 
-    def build(self) -> Dict[str, Dict[str, str]]:
+        # Configuration from command-line (parsed on first build)
+        self.console_config: Optional[Dict[str, str]] = None
+
+    def defaults(self) -> Dict[str, Dict[str, str]]:
         """
-        Build configuration from CLI, file and default values.
-        :return: Loaded configuration
+        Build configuration from default values only.
+        :return: Default configuration
         """
-
-        # Build default configuration
         config = {}
         for group, props in self.properties.items():
             for prop in props:
                 config.setdefault(group, {})[prop.name] = prop.default
+        return config
 
-        # Load configuration from command-line
-        console_config = vars(self.parser.parse_args())
+    def from_options(self, options: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+        """
+        Build configuration from given values and default values only
+        (without reading command-line arguments and files, nor configuring logging).
+        :param options: Configuration values by property name (as command-line arguments
+        without the leading dashes, e.g. formats or npm_audit.report_file)
+        :return: Configuration
+        """
+        config = self.defaults()
+        for name, value in options.items():
+            group, _, prop = name.rpartition(".")
+            group = group or GLOBAL_CONFIG
+            if prop not in config.get(group, {}):
+                raise AppError("Unknown property '{}'".format(name))
+            config[group][prop] = value
+        errors = self.check(config)
+        if errors:
+            raise AppError("Configuration is incorrect: {}".format(", ".join(errors)))
+        return config
+
+    def check(self, config: Dict[str, Dict[str, str]]) -> List[str]:
+        """
+        Check configuration properties.
+        :param config: Configuration
+        :return: Errors (empty if the configuration is correct)
+        """
+        errors = []
+        for group, props in self.properties.items():
+            for prop in props:
+                name = prop.name if group == GLOBAL_CONFIG else group + "." + prop.name
+                if prop.mandatory and not config[group][prop.name]:
+                    errors.append("Property '{}' is required".format(name))
+                elif not prop.is_valid(config[group][prop.name]):
+                    errors.append("Value of property '{}' is invalid".format(name))
+        return errors
+
+    def build(self, config_file: str = None) -> Dict[str, Dict[str, str]]:
+        """
+        Build configuration from CLI, file and default values.
+        :param config_file: Path to the configuration file
+        (default: from command-line arguments)
+        :return: Loaded configuration
+        """
 
-        # Configure logging
-        logging_level = logging.DEBUG if console_config["verbose"] else logging.INFO
-        logging.basicConfig(format='%(levelname)s\t| %(message)s', level=logging_level)
+        # Build default configuration
+        config = self.defaults()
+
+        # Load configuration from command-line
+        if self.console_config is None:
+            self.console_config = vars(self.parser.parse_args())
+            # Configure logging
+            logging_level = logging.DEBUG if self.console_config["verbose"] else logging.INFO
+            logging.basicConfig(format='%(levelname)s\t| %(message)s', level=logging_level)
+        console_config = self.console_config
 
         # Load configuration from file
-        logging.debug("Load configuration from file")
-        if "config_file" in console_config:
+        logger.debug("Load configuration from file")
+        if config_file:
+            config_file_name = config_file
+        elif "config_file" in console_config:
             config_file_name = console_config["config_file"]
         else:
             config_file_name = config[GLOBAL_CONFIG]["config_file"]
         config_path = realpath(config_file_name)
         if exists(config_path):
-            logging.debug("Load configuration from %s", config_path)
+            logger.debug("Load configuration from %s", config_path)
             parser = configparser.ConfigParser()
             parser.read(config_path)
             # Update configuration with file configuration values
@@ -113,7 +233,7 @@ class ConfigBuilder:
                         config.setdefault(group, {})[prop.name] = parser[group][prop.name]
 
         # Append/override values from command-line
-        logging.debug("Update configuration with command-line arguments")
+        logger.debug("Update configuration with command-line arguments")
         for group, props in self.properties.items():
             for prop in props:
                 name = prop.name if group == GLOBAL_CONFIG else group + "." + prop.name
@@ -121,18 +241,11 @@ class ConfigBuilder:
                     config.setdefault(group, {})[prop.name] = console_config[name]
 
         # Check configuration properties
-        err_count = 0
-        for group, props in self.properties.items():
-            for prop in props:
-                name = prop.name if group == GLOBAL_CONFIG else group + "." + prop.name
-                if prop.mandatory and not config[group][prop.name]:
-                    logging.error("Property '%s' is required", name)
-                    err_count += 1
-                elif not prop.is_valid(config[group][prop.name]):
-                    logging.error("Value of property '%s' is invalid", name)
-                    err_count += 1
-        if err_count > 0:
+        errors = self.check(config)
+        for error in errors:
+            logger.error(error)
+        if errors:
             raise AppError("Configuration is incorrect, fix previous issues and run again")
 
-        logging.debug("Configuration: %s", str(config))
+        logger.debug("Configuration: %s", str(config))
         return config
@@ -0,0 +1,278 @@
+"""
+CSV reports reader.
+"""
+
+import csv
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice, repeat
+from operator import itemgetter
+from os import path
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from reportmix.errors import LoadingError
+from reportmix.models import severity
+from reportmix.models.severity import Severity
+
+logger = logging.getLogger(__name__)
+
+# Number of rows read at once
+CHUNK_SIZE = 10000
+
+# Maximum number of memoized values per conversion
+CACHE_SIZE = 4096
+
+# Size of the byte ranges of a report file parsed in parallel (smaller files
+# are parsed in the current process)
+RANGE_SIZE = 32 * 1024 * 1024
+
+# Number of worker processes parsing a report file in parallel (1 to disable)
+WORKERS = os.cpu_count() or 1
+
+# A row: values of selected columns
+Row = Tuple[Optional[str], ...]
+
+
+class CsvReader:
+    """
+    Read rows of a CSV report with a header as tuples of values of selected columns.
+    The header is validated once and columns are mapped to positions,
+    instead of building a dictionary for each row.
+    Large report files are split into byte ranges parsed in parallel
+    by worker processes (rows are yielded in the original order).
+    """
+
+    def __init__(self, report_file: TextIO, columns: List[str], required: Iterable[str] = ()):
+        """
+        Initialize the reader and validate the header.
+        :param report_file: CSV report stream
+        :param columns: Names of the columns to read (in the order of the returned values)
+        :param required: Names of the columns that must be in the header
+        (other missing columns are read as None)
+        """
+        self.reader = csv.reader(report_file, delimiter=',', quotechar='"')
+        header = next(self.reader, [])
+        missing = [c for c in required if c not in header]
+        if missing:
+            raise LoadingError("Missing column(s) in the report: {}".format(", ".join(missing)))
+        # Position of each column (the last one if duplicated, missing ones after the last one)
+        positions = {name: index for index, name in enumerate(header)}
+        self.indexes = [positions.get(c, len(header)) for c in columns]
+        self.width = len(header) + (1 if any(c not in positions for c in columns) else 0)
+        self.getter = make_getter(self.indexes)
+        # Path to the report file if it is parsed in parallel (None otherwise)
+        self.file_path = parallel_file(report_file)
+        self.encoding = report_file.encoding if self.file_path is not None else None
+
+    def __iter__(self) -> Iterator[Row]:
+        if self.file_path is not None:
+            yield from self._iter_parallel()
+            return
+        width, getter = self.width, self.getter
+        while True:
+            chunk = list(islice(self.reader, CHUNK_SIZE))
+            if not chunk:
+                return
+            yield from select(chunk, width, getter)
+
+    def _iter_parallel(self) -> Iterator[Row]:
+        """
+        Split the report file into byte ranges aligned on record boundaries,
+        parse them in worker processes and yield rows in the original order.
+        :return: An iterator over rows
+        """
+        size = path.getsize(self.file_path)
+        offsets = list(range(0, size, RANGE_SIZE))
+        workers = min(WORKERS, len(offsets))
+        logger.debug("Parsing report %s in %d ranges with %d workers",
+                     self.file_path, len(offsets), workers)
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # Find the first record boundary of each range (a newline after
+            # an even number of quotes since the beginning of the file)
+            starts, quotes = [0], 0
+            scans = executor.map(scan_range, repeat(self.file_path), offsets,
+                                 offsets[1:] + [size])
+            for index, (count, boundaries) in enumerate(scans):
+                boundary = boundaries[quotes % 2]
+                # A range without boundary is parsed with the previous one
+                if index > 0 and boundary is not None and boundary < size:
+                    starts.append(boundary)
+                quotes += count
+            # Parse ranges (a bounded number at a time to bound memory usage)
+            pending = deque()
+            ranges = iter(zip(starts, starts[1:] + [size]))
+            for start, end in islice(ranges, 2 * workers):
+                pending.append(self._submit(executor, start, end))
+            while pending:
+                rows = pending.popleft().result()
+                for start, end in islice(ranges, 1):
+                    pending.append(self._submit(executor, start, end))
+                yield from rows
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _submit(self, executor: ProcessPoolExecutor, start: int, end: int):
+        """
+        Submit the parsing of a byte range of the report file.
+        :param executor: Executor
+        :param start: Offset of the first byte of the range (at a record boundary)
+        :param end: Offset after the last byte of the range (at a record boundary)
+        :return: Future rows
+        """
+        return executor.submit(parse_range, self.file_path, self.encoding, start, end,
+                               start == 0, self.indexes, self.width)
+
+
+def select(rows: Iterable[List[str]], width: int, getter: Callable) -> Iterator[Row]:
+    """
+    Select columns of rows (empty rows are skipped, short rows are padded with None).
+    :param rows: Rows (as returned by a CSV reader)
+    :param width: Minimum length of a row
+    :param getter: Function selecting columns of a row
+    :return: An iterator over rows
+    """
+    for row in rows:
+        if len(row) < width:
+            if not row:
+                continue  # Skip empty lines
+            row.extend([None] * (width - len(row)))
+        yield getter(row)
+
+
+def make_getter(indexes: List[int]) -> Callable:
+    """
+    Build a function selecting columns of a row.
+    :param indexes: Positions of the columns
+    :return: A function returning a tuple of values
+    """
+    return itemgetter(*indexes) if len(indexes) != 1 else lambda row: (row[indexes[0]],)
+
+
+def parallel_file(report_file: TextIO) -> Optional[str]:
+    """
+    Check if a report can be parsed in parallel: a regular file larger than a range, with
+    an ASCII-compatible encoding (bytes of newlines and quotes are searched for), read in
+    the main process (worker processes do not start other ones).
+    :param report_file: CSV report stream
+    :return: Path to the report file (None if it must be read from the stream)
+    """
+    if WORKERS < 2 or multiprocessing.parent_process() is not None \
+            or not isinstance(report_file, io.TextIOWrapper) \
+            or not isinstance(getattr(report_file.buffer, "raw", None), io.FileIO):
+        return None
+    file_path = report_file.name
+    try:
+        if not isinstance(file_path, str) or not path.isfile(file_path) \
+                or path.getsize(file_path) <= RANGE_SIZE \
+                or '\n"'.encode(report_file.encoding) != b'\n"':
+            return None
+    except (OSError, LookupError):
+        return None
+    return file_path
+
+
+def scan_range(file_path: str, start: int, end: int) -> Tuple[int, List[Optional[int]]]:
+    """
+    Scan a byte range of a file for record boundaries (run in a worker process).
+    :param file_path: Path to the file
+    :param start: Offset of the first byte of the range
+    :param end: Offset after the last byte of the range
+    :return: The number of quotes in the range, and the offsets after the first newline
+    preceded by an even and by an odd number of quotes in the range (None if not found)
+    """
+    with open(file_path, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        boundaries: List[Optional[int]] = [None, None]
+        position, quotes = start, 0
+        next_quote = data.find(b'"', start, end)
+        while None in boundaries:
+            newline = data.find(b"\n", position, end)
+            if newline < 0:
+                break
+            quotes += data[position:newline].count(b'"')
+            if boundaries[quotes % 2] is None:
+                boundaries[quotes % 2] = newline + 1
+            if next_quote < newline:
+                next_quote = data.find(b'"', newline + 1, end)
+            if next_quote < 0:
+                break  # No more quotes: no other boundary to find
+            # Newlines before the next quote are preceded by the same number of quotes
+            position = max(newline + 1, next_quote)
+        return data[start:end].count(b'"'), boundaries
+
+
+def parse_range(file_path: str, encoding: str, start: int, end: int, header: bool,
+                indexes: List[int], width: int) -> List[Row]:
+    """
+    Parse a byte range of a CSV file (run in a worker process).
+    :param file_path: Path to the file
+    :param encoding: Text encoding
+    :param start: Offset of the first byte of the range (at a record boundary)
+    :param end: Offset after the last byte of the range (at a record boundary)
+    :param header: true if the range starts with the header (skipped)
+    :param indexes: Positions of the columns to read
+    :param width: Minimum length of a row
+    :return: Rows, repeated values are shared to make the batch compact
+    """
+    with open(file_path, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode(encoding)
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=',', quotechar='"')
+    if header:
+        next(reader, None)
+    values = {}
+    return [tuple(values.setdefault(v, v) for v in row)
+            for row in select(reader, width, make_getter(indexes))]
+
+
+#
+# Memoized conversions
+#
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date(value: str, date_format: str) -> datetime:
+    """
+    Parse a date (memoized).
+    :param value: Date string
+    :param date_format: Date format (as expected by datetime.strptime())
+    :return: The parsed date
+    """
+    return datetime.strptime(value, date_format)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_iso_date(value: str) -> datetime:
+    """
+    Parse a date in ISO format (memoized).
+    :param value: Date string
+    :return: The parsed date
+    """
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def guess_severity(value: str) -> Optional[Severity]:
+    """
+    Guess a severity from a given input value (memoized).
+    :param value: Input value
+    :return: Guessed severity (None if guess failed)
+    """
+    return severity.guess(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def severity_from_identifier(identifier: str) -> Optional[Severity]:
+    """
+    Return the severity associated with the given identifier (memoized).
+    :param identifier: Severity identifier
+    :return: Severity (None if unknown identifier)
+    """
+    return severity.from_identifier(identifier)
@@ -13,3 +13,31 @@ class LoadingError(AppError):
     """
     Exception for report loaders errors.
     """
+
+
+class SkippedError(LoadingError):
+    """
+    Exception for report loaders with no report to load
+    (not configured or report file not found).
+    """
+
+
+class GateError(AppError):
+    """
+    Exception for a failed quality gate.
+    """
+
+
+class RequestError(AppError):
+    """
+    Exception for invalid requests in server mode.
+    """
+
+    def __init__(self, status: int, message: str):
+        """
+        Initialize the exception.
+        :param status: HTTP response status code
+        :param message: Error message
+        """
+        super().__init__(message)
+        self.status = status
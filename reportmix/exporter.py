@@ -2,15 +2,19 @@
 Report exporter parent class.
 """
 
-from typing import List, Dict
+from typing import Dict, List, TextIO, Union
 
+from reportmix.models.issue import Issue
 from reportmix.models.report import Report
+from reportmix.models.tool import Tool
 
 
 class Exporter:
     """
     A merged report exporter.
-    Export a list of issues to a file.
+    Export a list of issues to a file (or a text stream).
+    Exporters implement either export() or the streaming hooks (open(), write()
+    and close()), each one has a default implementation based on the other.
     """
 
     def __init__(self, config: Dict[str, str]):
@@ -19,11 +23,66 @@ class Exporter:
         :param config: Report exporter configuration.
         """
         self.config = config
+        self.output_file: Union[str, TextIO] = ""
+        self.fields: List[str] = []
+        self.buffer: List[Issue] = []
 
-    def export(self, report: Report, output_file: str, fields: List[str]):
+    def export(self, report: Report, output_file: Union[str, TextIO], fields: List[str]):
         """
         Export a list of issues to a file.
         :param report: Report with the list of issues to export.
-        :param output_file: Path to the output file.
+        :param output_file: Path to the output file (or a text stream, left open).
         :param fields: List of fields to include in the output report.
         """
+        self.open(output_file, fields)
+        for issue in report.issues:
+            self.write(issue)
+        self.close(report.tools)
+
+    def open(self, output_file: Union[str, TextIO], fields: List[str],
+             buffer: List[Issue] = None):
+        """
+        Start exporting issues one at a time to a file.
+        :param output_file: Path to the output file (or a text stream, left open).
+        :param fields: List of fields to include in the output report.
+        :param buffer: List to keep issues in until the end of the export,
+        if the exporter needs all of them (default: a new list).
+        """
+        self.output_file = output_file
+        self.fields = fields
+        self.buffer = [] if buffer is None else buffer
+
+    def write(self, issue: Issue):
+        """
+        Export an issue.
+        :param issue: Issue to export.
+        """
+        self.buffer.append(issue)
+
+    def close(self, tools: List[Tool]):
+        """
+        Finish the export.
+        :param tools: Tools involved in identifying exported issues.
+        """
+        self.export(Report(self.buffer, tools), self.output_file, self.fields)
+        self.buffer = []
+
+    def open_output(self, newline: str = None) -> TextIO:
+        """
+        Open the output file for writing (UTF-8).
+        :param newline: Newline translation mode (as expected by open())
+        :return: The output file (or the output stream)
+        """
+        if isinstance(self.output_file, str):
+            return open(self.output_file, "w", newline=newline, encoding="utf-8")
+        return self.output_file
+
+    def close_output(self, file: TextIO):
+        """
+        Close the output file (an output stream is only flushed).
+        :param file: File returned by open_output()
+        """
+        if file is self.output_file:
+            file.flush()
+        else:
+            file.close()
@@ -3,10 +3,11 @@ CSV report exporter.
 """
 
 import csv
-from typing import List
+from typing import Dict, List, Optional, TextIO, Union
 
 from reportmix.exporter import Exporter
-from reportmix.models.report import Report
+from reportmix.models.issue import Issue
+from reportmix.models.tool import Tool
 
 
 class CsvExporter(Exporter):
@@ -14,10 +15,21 @@ class CsvExporter(Exporter):
     Export a merged report to a CSV file.
     """
 
-    def export(self, report: Report, output_file: str, fields: List[str]):
-        with open(output_file, "w", newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fields, extrasaction='ignore',
-                                    delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writeheader()
-            for issue in report.issues:
-                writer.writerow(issue.flatten())
+    def __init__(self, config: Dict[str, str]):
+        super().__init__(config)
+        self.file: Optional[TextIO] = None
+        self.writer: Optional[csv.DictWriter] = None
+
+    def open(self, output_file: Union[str, TextIO], fields: List[str],
+             buffer: List[Issue] = None):
+        super().open(output_file, fields, buffer)
+        self.file = self.open_output(newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=fields, extrasaction='ignore',
+                                     delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        self.writer.writeheader()
+
+    def write(self, issue: Issue):
+        self.writer.writerow(issue.flatten())
+
+    def close(self, tools: List[Tool]):
+        self.close_output(self.file)
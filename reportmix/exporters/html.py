@@ -2,15 +2,18 @@
 HTML report exporter.
 """
 
-from collections import OrderedDict
-from typing import List
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Union
 
 import jinja2
 import markupsafe
 
 from reportmix.exporter import Exporter
+from reportmix.models.issue import Issue
 from reportmix.models.report import Report
 from reportmix.models.severity import SEVERITIES
+from reportmix.models.tool import Tool
 
 
 class HtmlExporter(Exporter):
@@ -18,39 +21,100 @@ class HtmlExporter(Exporter):
     Export a merged report to a HTML file.
     """
 
-    def export(self, report: Report, output_file: str, fields: List[str]):
+    def __init__(self, config: Dict[str, str]):
+        super().__init__(config)
+        # Statistics (maintained while issues are written)
+        self.by_tool: Counter = Counter()
+        self.by_severity: Counter = Counter()
+        self.by_type: Counter = Counter()
+
+    def export(self, report: Report, output_file: Union[str, TextIO], fields: List[str]):
+        # Issues are already kept in the report, only count them
+        self.open(output_file, fields, report.issues)
+        for issue in report.issues:
+            self.count(issue)
+        self.close(report.tools)
+
+    def open(self, output_file: Union[str, TextIO], fields: List[str],
+             buffer: List[Issue] = None):
+        super().open(output_file, fields, buffer)
+        self.by_tool, self.by_severity, self.by_type = Counter(), Counter(), Counter()
+
+    def write(self, issue: Issue):
+        self.count(issue)
+        self.buffer.append(issue)
+
+    def count(self, issue: Issue):
+        """
+        Update statistics with an issue.
+        :param issue: Exported issue
+        """
+        self.by_tool[issue.tool.name] += 1
+        self.by_severity[issue.severity] += 1
+        self.by_type[issue.type] += 1
+
+    def close(self, tools: List[Tool]):
         # Load HTML template
-        env = jinja2.Environment(
-            loader=jinja2.PackageLoader("reportmix.exporters", "templates"),
-            autoescape=jinja2.select_autoescape(['html'])
-        )
-        # Custom filters
-        env.filters["limit"] = limit
-        env.filters["prettyfield"] = pretty_field
-        # Report template
-        template = env.get_template('reportmix.html.jinja2')
+        template = load_template()
 
         # Prepare templates values and statistics
         # Issues by tool
-        tools = OrderedDict()
-        tool_names = sorted({t.name for t in report.tools})
-        for tool in tool_names:
-            tools[tool] = len([i for i in report.issues if i.tool.name == tool])
+        tools_count = OrderedDict()
+        for tool in sorted({t.name for t in tools}):
+            tools_count[tool] = self.by_tool[tool]
         # Issues by severity
         severities = OrderedDict()
         for severity in SEVERITIES:
-            severities[severity.name] = len([i for i in report.issues if i.severity == severity])
+            severities[severity.name] = self.by_severity[severity]
         # Issues by type
         types = OrderedDict()
-        type_names = sorted({i.type for i in report.issues}, key=lambda t: t.casefold())
-        for tool in type_names:
-            types[tool] = len([i for i in report.issues if i.type == tool])
-        # Render and write report
-        with open(output_file, "wb") as file:
-            output = template.render(title=self.config["title"], logo=self.config["logo"],
-                                     issues=[i.flatten() for i in report.issues], fields=fields,
-                                     tools=tools, severities=severities, types=types)
-            file.write(output.encode("utf-8"))
+        for issue_type in sorted(self.by_type, key=lambda t: (t or "").casefold()):
+            types[issue_type] = self.by_type[issue_type]
+        # Render and write report (issues are flattened one at a time)
+        file = self.open_output(newline="")
+        try:
+            stream = template.generate(title=self.config["title"], logo=self.config["logo"],
+                                       issues=FlatIssues(self.buffer), fields=self.fields,
+                                       tools=tools_count, severities=severities, types=types)
+            file.writelines(stream)
+        finally:
+            self.close_output(file)
+        self.buffer = []
+
+
+class FlatIssues:
+    """
+    Iterate over flattened issues without building the full list.
+    """
+
+    def __init__(self, issues: Iterable[Issue]):
+        """
+        :param issues: Issues to flatten
+        """
+        self.issues = issues
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (i.flatten() for i in self.issues)
+
+    def __bool__(self) -> bool:
+        return bool(self.issues)
+
+
+@lru_cache(maxsize=None)
+def load_template() -> jinja2.Template:
+    """
+    Load and compile the HTML report template (only once per process).
+    :return: The compiled report template
+    """
+    env = jinja2.Environment(
+        loader=jinja2.PackageLoader("reportmix.exporters", "templates"),
+        autoescape=jinja2.select_autoescape(['html'])
+    )
+    # Custom filters
+    env.filters["limit"] = limit
+    env.filters["prettyfield"] = pretty_field
+    # Report template
+    return env.get_template('reportmix.html.jinja2')
 
 
 #
@@ -3,10 +3,11 @@ JSON report exporter.
 """
 
 import json
-from typing import List
+from typing import Dict, List, Optional, TextIO, Union
 
 from reportmix.exporter import Exporter
-from reportmix.models.report import Report
+from reportmix.models.issue import Issue
+from reportmix.models.tool import Tool
 
 
 class JsonExporter(Exporter):
@@ -14,6 +15,26 @@ class JsonExporter(Exporter):
     Export a merged report to a JSON file.
     """
 
-    def export(self, report: Report, output_file: str, fields: List[str]):
-        with open(output_file, "w") as file:
-            json.dump([i.to_dict() for i in report.issues], file, default=str)
+    def __init__(self, config: Dict[str, str]):
+        super().__init__(config)
+        self.file: Optional[TextIO] = None
+        self.count = 0
+
+    def open(self, output_file: Union[str, TextIO], fields: List[str],
+             buffer: List[Issue] = None):
+        super().open(output_file, fields, buffer)
+        self.file = self.open_output()
+        self.file.write("[")
+        self.count = 0
+
+    def write(self, issue: Issue):
+        # Write issues one at a time (same output as json.dump() on the list of issues,
+        # with the standard json module whatever the JSON backend to keep the format stable)
+        if self.count > 0:
+            self.file.write(", ")
+        self.file.write(json.dumps(issue.to_dict(), default=str))
+        self.count += 1
+
+    def close(self, tools: List[Tool]):
+        self.file.write("]")
+        self.close_output(self.file)
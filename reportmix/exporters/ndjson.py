@@ -0,0 +1,32 @@
+"""
+NDJSON report exporter.
+"""
+
+from typing import Dict, List, Optional, TextIO, Union
+
+from reportmix import json_backend
+from reportmix.exporter import Exporter
+from reportmix.models.issue import Issue
+from reportmix.models.tool import Tool
+
+
+class NdjsonExporter(Exporter):
+    """
+    Export a merged report to a newline-delimited JSON file (one issue per line).
+    """
+
+    def __init__(self, config: Dict[str, str]):
+        super().__init__(config)
+        self.file: Optional[TextIO] = None
+
+    def open(self, output_file: Union[str, TextIO], fields: List[str],
+             buffer: List[Issue] = None):
+        super().open(output_file, fields, buffer)
+        self.file = self.open_output()
+
+    def write(self, issue: Issue):
+        self.file.write(json_backend.dumps(issue.to_dict()))
+        self.file.write("\n")
+
+    def close(self, tools: List[Tool]):
+        self.close_output(self.file)
@@ -0,0 +1,169 @@
+"""
+Issues grouping (aggregated view of issues with the same key, e.g. the same advisory).
+"""
+
+import copy
+import hashlib
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from reportmix.errors import AppError
+from reportmix.models.issue import FLAT_FIELDS, Issue
+from reportmix.models.subject import Subject
+from reportmix.sorting import SEVERITY_ORDINALS, SortKey
+
+# Fields added to aggregated issues (exported after the evidences field)
+GROUP_FIELDS = ["count"]
+
+
+class IssueGroup:
+    """
+    Issues with the same key, aggregated into the first issue of the group.
+    """
+
+    __slots__ = ["key", "issue", "count", "evidences", "severity", "subjects", "locations"]
+
+    def __init__(self, key: Tuple, issue: Issue):
+        """
+        Initialize a group with its first issue.
+        :param key: Group key
+        :param issue: First issue of the group
+        """
+        self.key = key
+        self.issue = issue
+        self.count = 0
+        self.evidences = 0
+        self.severity = issue.severity
+        self.subjects: Dict[Tuple, Subject] = {}
+        self.locations: Dict[str, None] = {}
+        self.add(issue)
+
+    def add(self, issue: Issue):
+        """
+        Add an issue to the group.
+        :param issue: Issue with the key of the group
+        """
+        self.count += 1
+        self.evidences += issue.evidences or 0
+        if SEVERITY_ORDINALS.get(issue.severity, -1) > SEVERITY_ORDINALS.get(self.severity, -1):
+            self.severity = issue.severity
+        subject = issue.subject
+        self.subjects.setdefault((subject.identifier, subject.version), subject)
+        if subject.location:
+            self.locations[subject.location] = None
+
+    def to_issue(self) -> Issue:
+        """
+        Build the aggregated issue: fields of the first issue, the highest severity,
+        the number of grouped issues (count field), the total number of evidences,
+        and the affected subjects and locations.
+        :return: The aggregated issue
+        """
+        issue = copy.copy(self.issue)
+        issue.severity = self.severity
+        issue.count = self.count
+        issue.evidences = self.evidences
+        if len(self.subjects) > 1 or len(self.locations) > 1:
+            subjects = self.subjects.values()
+            issue.subject = Subject(
+                identifier=join(s.identifier for s in subjects),
+                name=join(s.name for s in subjects),
+                description=issue.subject.description if len(subjects) == 1 else "",
+                version=join(s.version for s in subjects),
+                location=join(self.locations),
+                license=join(s.license for s in subjects)
+            )
+        # Values are separated to avoid collisions (e.g. between "ab", "c" and "a", "bc")
+        issue.hash = hashlib.md5(
+            "\x1f".join("" if v is None else str(v) for v in self.key).encode()).hexdigest()
+        return issue
+
+
+class IssueGrouper:
+    """
+    Group issues by key in a single pass (hash map of groups by key).
+    """
+
+    def __init__(self, fields: List[str]):
+        """
+        Initialize the grouper.
+        :param fields: Fields of the group key (from the FLAT_FIELDS list)
+        """
+        self.getter = key_getter(fields)
+        self.groups: Dict[Tuple, IssueGroup] = {}
+        self.count = 0
+
+    def add(self, issue: Issue):
+        """
+        Add an issue to its group.
+        :param issue: Issue to group
+        """
+        key = self.getter(issue)
+        group = self.groups.get(key)
+        if group is None:
+            self.groups[key] = IssueGroup(key, issue)
+        else:
+            group.add(issue)
+        self.count += 1
+
+    def issues(self, key: Optional[SortKey] = None) -> List[Issue]:
+        """
+        Build aggregated issues (one per group).
+        :param key: Sort key function (default: order of the first issue of each group)
+        :return: Aggregated issues
+        """
+        issues = [group.to_issue() for group in self.groups.values()]
+        if key is not None:
+            issues.sort(key=key)
+        return issues
+
+
+def group_issues(issues: Iterable[Issue], fields: List[str],
+                 key: Optional[SortKey] = None) -> List[Issue]:
+    """
+    Group issues by key.
+    :param issues: Issues to group
+    :param fields: Fields of the group key (from the FLAT_FIELDS list)
+    :param key: Sort key function of aggregated issues
+    :return: Aggregated issues (one per group)
+    """
+    grouper = IssueGrouper(fields)
+    for issue in issues:
+        grouper.add(issue)
+    return grouper.issues(key)
+
+
+def parse_group_by(spec: str) -> List[str]:
+    """
+    Parse the fields to group issues by.
+    :param spec: Comma-separated list of fields (e.g. "identifier,subject_identifier")
+    :return: Fields list (empty if issues are not grouped)
+    """
+    fields = [f for f in (f.strip() for f in (spec or "").split(",")) if f]
+    for field in fields:
+        if field not in FLAT_FIELDS:
+            raise AppError("Invalid group field {}".format(field))
+    return fields
+
+
+def key_getter(fields: List[str]) -> Callable[[Issue], Tuple[Any, ...]]:
+    """
+    Build the function returning the group key of an issue.
+    :param fields: Fields of the key (from the FLAT_FIELDS list)
+    :return: The key function
+    """
+    paths = [f.replace("_", ".", 1) if f.split("_", 1)[0] in
+             ["tool", "subject", "project", "meta"] else f for f in fields]
+    getter = attrgetter(*paths)
+    if len(paths) == 1:
+        return lambda issue: (getter(issue),)
+    return getter
+
+
+def join(values: Iterable[Optional[str]]) -> str:
+    """
+    Join distinct non-empty values, in order.
+    :param values: Values to join
+    :return: Comma-separated values
+    """
+    return ", ".join(dict.fromkeys(v for v in values if v))
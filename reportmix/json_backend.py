@@ -0,0 +1,106 @@
+"""
+JSON backend: a faster JSON library (orjson or ujson) if installed,
+the standard json module otherwise.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, IO, List, Union
+
+from reportmix.errors import AppError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+logger = logging.getLogger(__name__)
+
+# Backends by name, in order of preference
+BACKENDS: List[str] = ["orjson", "ujson", "json"]
+
+
+def _orjson_dumps(obj: Any) -> str:
+    # Dates are passed to default=str to keep the json module format
+    # (e.g. "2021-01-01 12:00:00" instead of "2021-01-01T12:00:00")
+    return orjson.dumps(obj, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME).decode()
+
+
+def _ujson_dumps(obj: Any) -> str:
+    return ujson.dumps(obj, default=str, escape_forward_slashes=False)
+
+
+def _json_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=str)
+
+
+# Encoding and decoding functions by backend
+_FUNCTIONS: Dict[str, Dict[str, Callable]] = {
+    "orjson": {"dumps": _orjson_dumps, "loads": lambda s: orjson.loads(s)},
+    "ujson": {"dumps": _ujson_dumps, "loads": lambda s: ujson.loads(s)},
+    "json": {"dumps": _json_dumps, "loads": json.loads}
+}
+
+# Name of the backend in use
+backend = next(b for b in BACKENDS if b == "json" or globals()[b] is not None)
+
+
+def available() -> List[str]:
+    """
+    List installed backends.
+    :return: Names of installed backends, in order of preference
+    """
+    return [b for b in BACKENDS if b == "json" or globals()[b] is not None]
+
+
+def use(name: str) -> str:
+    """
+    Select the backend to use.
+    :param name: Backend name ("auto" for the fastest installed backend)
+    :return: Name of the previous backend
+    """
+    global backend  # pylint: disable=global-statement
+    previous = backend
+    installed = available()
+    if name == "auto":
+        name = installed[0]
+    if name not in installed:
+        raise AppError("JSON backend {} is not installed".format(name))
+    if name != backend:
+        logger.debug("Using %s JSON backend", name)
+    backend = name
+    return previous
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string (values are serialized as json.dumps()
+    with default=str does, e.g. dates and severities as strings, but separators
+    and escaping may differ between backends).
+    :param obj: Object to serialize
+    :return: JSON string
+    """
+    return _FUNCTIONS[backend]["dumps"](obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON document.
+    :param data: JSON document
+    :return: Deserialized object
+    """
+    return _FUNCTIONS[backend]["loads"](data)
+
+
+def load(file: IO) -> Any:
+    """
+    Deserialize a JSON document from a file.
+    :param file: File (text or binary mode)
+    :return: Deserialized object
+    """
+    return loads(file.read())
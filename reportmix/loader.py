@@ -2,9 +2,23 @@
 Report loader parent class.
 """
 
-from typing import Dict
+import glob
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os import path
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple, Type
 
+from reportmix import archive, json_backend
+from reportmix.cache import ReportCache
+from reportmix.errors import LoadingError
+from reportmix.models.issue import Issue
 from reportmix.models.report import Report
+from reportmix.models.tool import Tool
+from reportmix.summary import Summary
+
+logger = logging.getLogger(__name__)
 
 
 class Loader:
@@ -13,12 +27,23 @@ class Loader:
     Load and parse a specific type of report associated to a tool.
     """
 
+    # Order of the issues yielded by iter_issues() (sort specification: list of
+    # fields with the descending flag, empty if issues are not sorted)
+    sorted_by: List[Tuple[str, bool]] = []
+
+    # Version of the parsing logic (change it to invalidate cached reports)
+    version = "1"
+
     def __init__(self, config: Dict[str, str]):
         """
         Initialize the report loader with the given configuration.
         :param config: Report loader configuration.
         """
         self.config = config
+        # Tools involved in the last loaded report
+        self.tools: List[Tool] = []
+        # Cache of parsed report files (disabled if None)
+        self.cache: Optional[ReportCache] = None
 
     def load(self) -> Report:
         """
@@ -26,3 +51,201 @@ class Loader:
         :return: The loaded report.
         """
         return Report([], [])
+
+    def iter_issues(self) -> Iterator[Issue]:
+        """
+        Load the report and yield issues one at a time, without building the full
+        report (tools involved are available in self.tools once all issues are yielded).
+        Loaders should override it to stream issues, the default one loads the report.
+        :return: An iterator over loaded issues.
+        """
+        report = self.load()
+        self.tools = report.tools
+        yield from report.issues
+
+    def count(self) -> Summary:
+        """
+        Count issues by tool, severity and type, without keeping them.
+        Loaders should override it if the source of issues can count them natively,
+        the default one loads issues one at a time.
+        :return: The issues summary.
+        """
+        summary = Summary()
+        for issue in self.iter_issues():
+            summary.add_issue(issue)
+        for tool in self.tools:
+            summary.add_tool(tool.identifier)
+        return summary
+
+    def report_files(self, *extensions: str) -> List[str]:
+        """
+        Return the paths to the existing report files matching the report_file property
+        (comma-separated list of paths and glob patterns, members of archives and "-"
+        for the standard input are supported).
+        :param extensions: Allowed file extensions (other files are ignored).
+        :return: Paths to the report files, sorted by path.
+        """
+        files = []
+        listings = {}  # Each archive is listed once
+        for file in find_files(self.config.get("report_file") or "", listings):
+            if (file == archive.STDIN or file.endswith(extensions or ("",))) \
+                    and archive.is_file(file, listings):
+                files.append(file)
+            else:
+                logger.debug("Report file %s ignored (file not found or not %s)",
+                             file, ", ".join("*" + e for e in extensions))
+        return files
+
+    def iter_file(self, report_file_path: str) -> Iterator[Issue]:
+        """
+        Load a report file and yield issues one at a time
+        (tools involved are available in self.tools once all issues are yielded).
+        :param report_file_path: Path to the report file.
+        :return: An iterator over loaded issues.
+        """
+        raise LoadingError("Loading the report from a file is not supported")
+
+    def related_files(self, report_file_path: str) -> List[str]:
+        """
+        Return the paths to other files read along with a report file, if they exist
+        (e.g. an optional JSON report next to a CSV one), used to detect changes.
+        :param report_file_path: Path to the report file.
+        :return: Paths to the related files.
+        """
+        return []
+
+    def iter_files(self, report_file_paths: List[str]) -> Iterator[Issue]:
+        """
+        Load report files and yield issues one at a time, file by file in the given order.
+        Reports are loaded from the cache if enabled, multiple files
+        are parsed concurrently in worker processes.
+        :param report_file_paths: Paths to the report files.
+        :return: An iterator over loaded issues.
+        """
+        if len(report_file_paths) == 1 and self.cache is None:
+            yield from self.iter_file(report_file_paths[0])
+            return
+        logger.debug("Loading %d report files", len(report_file_paths))
+        tools = {}
+        for report in self._load_files(report_file_paths):
+            yield from report.issues
+            for tool in report.tools:
+                tools.setdefault((tool.identifier, tool.name, tool.version), tool)
+        self.tools = list(tools.values())
+
+    def _load_files(self, report_file_paths: List[str]) -> Iterator[Report]:
+        """
+        Load report files from the cache or parse them (concurrently if there are
+        multiple files to parse) and yield reports in the given order.
+        :param report_file_paths: Paths to the report files.
+        :return: An iterator over loaded reports.
+        """
+        keys, cached = {}, {}
+        if self.cache is not None:
+            for report_file_path in report_file_paths:
+                if report_file_path == archive.STDIN:
+                    continue  # Not cached
+                try:
+                    keys[report_file_path] = self.cache.key(
+                        report_file_path, type(self).__qualname__, self.version,
+                        {k: v for k, v in self.config.items() if k != "report_file"},
+                        self.related_files(report_file_path))
+                except OSError as ex:
+                    raise LoadingError("Failed to read the report: {}".format(ex)) from ex
+                report = self.cache.get(keys[report_file_path])
+                if report is not None:
+                    logger.debug("Report %s loaded from cache", report_file_path)
+                    cached[report_file_path] = report
+        # The standard input is read in this process, other files in worker processes
+        missing = [p for p in report_file_paths if p not in cached and p != archive.STDIN]
+        executor = None
+        if len(missing) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1),
+                                           initializer=json_backend.use,
+                                           initargs=(json_backend.backend,))
+            loaded = executor.map(load_file, repeat(type(self)), repeat(self.config), missing)
+        else:
+            loaded = (load_file(type(self), self.config, p) for p in missing)
+        try:
+            for report_file_path in report_file_paths:
+                if report_file_path in cached:
+                    yield cached.pop(report_file_path)
+                    continue
+                if report_file_path == archive.STDIN:
+                    yield load_file(type(self), self.config, report_file_path)
+                    continue
+                report = next(loaded)
+                if self.cache is not None:
+                    self.cache.put(keys[report_file_path], report)
+                yield report
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def parse(self, report_file: TextIO) -> Report:
+        """
+        Parse the report from a stream and return the list of issues.
+        :param report_file: Report stream.
+        :return: The loaded report.
+        """
+        raise LoadingError("Loading the report from a stream is not supported")
+
+    def parse_data(self, data: Any) -> Report:
+        """
+        Map an already parsed report (e.g. a JSON document) and return the list of issues.
+        :param data: Parsed report.
+        :return: The loaded report.
+        """
+        raise LoadingError("Loading the report from parsed data is not supported")
+
+    def input_files(self) -> List[str]:
+        """
+        Return the paths to the local files the report is loaded from
+        (used to detect changes, remote reports are not listed).
+        :return: Paths to the input files.
+        """
+        return []
+
+
+def load_file(loader: Type[Loader], config: Dict[str, str], report_file_path: str) -> Report:
+    """
+    Load a report file (run in a worker process).
+    :param loader: Loader class
+    :param config: Loader configuration
+    :param report_file_path: Path to the report file
+    :return: Loaded report
+    """
+    instance = loader(config)
+    issues = list(instance.iter_file(report_file_path))
+    return Report(issues, instance.tools)
+
+
+def find_files(patterns: str, listings: Dict[str, Set[str]] = None) -> List[str]:
+    """
+    Find files from a comma-separated list of paths and glob patterns.
+    Paths without glob characters are kept even if the file doesn't exist.
+    Members of archives (archive.zip!/member, the member path can be a glob pattern)
+    and "-" (the standard input) are supported.
+    :param patterns: Paths and glob patterns
+    :param listings: Members by archive path, already listed (updated, default: each
+    archive is listed once per call)
+    :return: Absolute paths to files (without duplicates), sorted by path
+    """
+    files = set()
+    listings = {} if listings is None else listings
+    for pattern in filter(None, (p.strip() for p in patterns.split(","))):
+        archive_path, member = archive.split_member(pattern)
+        if pattern == archive.STDIN:
+            files.add(pattern)
+        elif member is not None:
+            archive_path = path.realpath(archive_path) + archive.MEMBER_SEPARATOR
+            if any(c in member for c in "*?["):
+                files.update(archive.find_members(archive_path + member, listings))
+            else:
+                files.add(archive_path + member)
+        elif any(c in pattern for c in "*?["):
+            files.update(path.realpath(f) for f in glob.glob(pattern, recursive=True)
+                         if path.isfile(f))
+        else:
+            files.add(path.realpath(pattern))
+    return sorted(files)
@@ -2,29 +2,33 @@
 Dependency-Check report loader.
 """
 
-import csv
-import json
 import logging
 import re
-from datetime import datetime
-from os import path
-from typing import List
+from typing import Iterator, List, TextIO
 
+from reportmix import archive, json_backend
 from reportmix.config.property import ConfigProperty
-from reportmix.errors import LoadingError
-from reportmix.loader import Loader
-from reportmix.models import severity
+from reportmix.csv_reader import CsvReader, guess_severity, parse_date
+from reportmix.errors import LoadingError, SkippedError
+from reportmix.loader import Loader, find_files
 from reportmix.models.issue import Issue
 from reportmix.models.project import Project
 from reportmix.models.report import Report
 from reportmix.models.subject import Subject
 from reportmix.models.tool import Tool
 
+logger = logging.getLogger(__name__)
+
 # Configuration properties
 PROPERTIES: List[ConfigProperty] = [
     ConfigProperty("report_file", "path to the report file", False, "dependency-check-report.csv")
 ]
 
+# Columns read from the CSV report
+COLUMNS = ["CVE", "CWE", "Vulnerability", "ScanDate", "CVSSv3_BaseSeverity", "CVSSv3",
+           "CPE Confidence", "Evidence Count", "Source", "Identifiers", "Description",
+           "DependencyName", "DependencyPath", "License", "Project"]
+
 
 class DependencyCheckLoader(Loader):
     """
@@ -37,70 +41,139 @@ class DependencyCheckLoader(Loader):
         parse it, map vulnerabilities to issues, and return the list.
         :return: Report of vulnerabilities.
         """
-        report_file_path = path.realpath(self.config["report_file"])
-        if not (report_file_path.endswith(".csv") and path.exists(report_file_path)):
-            raise LoadingError("Dependency-Check report ignored (file not found or not *.csv)")
+        issues = list(self.iter_issues())
+        return Report(issues, self.tools)
+
+    def iter_issues(self) -> Iterator[Issue]:
+        """
+        Load the Dependency Check report files (CSV required, JSON optional),
+        parse them, and yield vulnerabilities mapped to issues one at a time.
+        :return: An iterator over vulnerabilities.
+        """
+        report_file_paths = self.report_files(".csv")
+        if not report_file_paths:
+            raise SkippedError("Dependency-Check report ignored (file not found or not *.csv)")
+        yield from self.iter_files(report_file_paths)
 
-        logging.debug("Loading report %s", report_file_path)
+    def iter_file(self, report_file_path: str) -> Iterator[Issue]:
+        """
+        Load a Dependency Check report file (CSV required, JSON optional),
+        parse it, and yield vulnerabilities mapped to issues one at a time.
+        :param report_file_path: Path to the CSV report file.
+        :return: An iterator over vulnerabilities.
+        """
+        logger.debug("Loading report %s", report_file_path)
+
+        # Open the CSV report and the JSON report (if available)
+        json_report_file_path = json_file(report_file_path)
+        try:
+            with archive.open_text(report_file_path, newline='') as report_file:
+                if report_file_path == archive.STDIN or not archive.is_file(json_report_file_path):
+                    yield from self.iter_parse(report_file)
+                    return
+                with archive.open_text(json_report_file_path, encoding="utf8") as json_report_file:
+                    yield from self.iter_parse(report_file, json_report_file)
+        except OSError as ex:
+            raise LoadingError("Failed to read the report: {}".format(ex)) from ex
+
+    def parse(self, report_file: TextIO, json_report_file: TextIO = None) -> Report:
+        """
+        Parse the Dependency Check report (CSV required, JSON optional),
+        map vulnerabilities to issues, and return the list.
+        :param report_file: CSV report stream.
+        :param json_report_file: JSON report stream (optional).
+        :return: Report of vulnerabilities.
+        """
+        issues = list(self.iter_parse(report_file, json_report_file))
+        return Report(issues, self.tools)
 
+    def iter_parse(self, report_file: TextIO, json_report_file: TextIO = None) -> Iterator[Issue]:
+        """
+        Parse the Dependency Check report (CSV required, JSON optional)
+        and yield vulnerabilities mapped to issues one at a time.
+        :param report_file: CSV report stream.
+        :param json_report_file: JSON report stream (optional).
+        :return: An iterator over vulnerabilities.
+        """
         try:
             # Load the JSON report to extract scan and project info
-            json_report_file_path = re.sub(r"\.csv$", ".json", report_file_path)
             scan, project = {}, {}
-            if path.exists(json_report_file_path):
-                with open(json_report_file_path, "r", encoding="utf8") as json_report_file:
-                    json_report = json.load(json_report_file)
-                    scan = json_report["scanInfo"]
-                    project = json_report["projectInfo"]
+            if json_report_file is not None:
+                json_report = json_backend.load(json_report_file)
+                scan = json_report["scanInfo"]
+                project = json_report["projectInfo"]
+
+            # Values shared by all vulnerabilities
+            tool = Tool(
+                identifier="dependency_check",
+                name="Dependency-Check",
+                version=scan["engineVersion"] if "engineVersion" in scan else ""
+            )
+            project_identifier = None
+            if "groupID" in project and "artifactID" in project:
+                project_identifier = project["groupID"] + ":" + project["artifactID"]
+            project_version = project["version"] if "version" in project else ""
+            projects = {}
 
             # Load vulnerabilities from the CSV report and map them to issues
-            with open(report_file_path, "r", newline='') as report_file:
-                report = csv.DictReader(report_file, delimiter=',', quotechar='"')
-                issues = []
-                for row in report:
-                    if "groupID" in project and "artifactID" in project:
-                        project_identifier = project["groupID"] + ":" + project["artifactID"]
-                    else:
-                        project_identifier = row["Project"]
-                    issues.append(Issue(
-                        ref="",
-                        identifier=row["CVE"],
-                        name=row["CVE"],
-                        type="VULNERABILITY",
-                        category=row["CWE"],
-                        description=row["Vulnerability"],
-                        more="",
-                        action="",
-                        effort="",
-                        analysis_date=datetime.strptime(row["ScanDate"][:24],
-                                                        "%a, %d %b %Y %H:%M:%S"),
-                        severity=severity.guess(row["CVSSv3_BaseSeverity"]),
-                        score=row["CVSSv3"],
-                        confidence=row["CPE Confidence"],
-                        evidences=int(row["Evidence Count"]),
-                        source=row["Source"],
-                        source_date=None,
-                        url="",
-                        tool=Tool(
-                            identifier="dependency_check",
-                            name="Dependency-Check",
-                            version=scan["engineVersion"] if "engineVersion" in scan else ""
-                        ),
-                        subject=Subject(
-                            identifier=row["Identifiers"],
-                            name=row["Description"],
-                            description=row["DependencyName"],
-                            version="",
-                            location=row["DependencyPath"],
-                            license=row["License"]
-                        ),
-                        project=Project(
-                            identifier=project_identifier,
-                            name=row["Project"],
-                            version=project["version"] if "version" in project else ""
-                        )
-                    ))
-                tool_version = issues[0].tool.version if len(issues) > 0 else ""
-                return Report(issues, [Tool("dependency_check", "Dependency-Check", tool_version)])
+            report = CsvReader(report_file, COLUMNS, COLUMNS)
+            count = 0
+            for cve, cwe, vulnerability, scan_date, base_severity, cvss, confidence, \
+                    evidences, source, identifiers, description, dependency_name, \
+                    dependency_path, dependency_license, project_name in report:
+                if project_name not in projects:
+                    projects[project_name] = Project(
+                        identifier=project_identifier or project_name,
+                        name=project_name,
+                        version=project_version
+                    )
+                count += 1
+                yield Issue(
+                    ref="",
+                    identifier=cve,
+                    name=cve,
+                    type="VULNERABILITY",
+                    category=cwe,
+                    description=vulnerability,
+                    more="",
+                    action="",
+                    effort="",
+                    analysis_date=parse_date(scan_date[:24], "%a, %d %b %Y %H:%M:%S"),
+                    severity=guess_severity(base_severity),
+                    score=cvss,
+                    confidence=confidence,
+                    evidences=int(evidences),
+                    source=source,
+                    source_date=None,
+                    url="",
+                    tool=tool,
+                    subject=Subject(
+                        identifier=identifiers,
+                        name=description,
+                        description=dependency_name,
+                        version="",
+                        location=dependency_path,
+                        license=dependency_license
+                    ),
+                    project=projects[project_name]
+                )
+            tool_version = tool.version if count > 0 else ""
+            self.tools = [Tool("dependency_check", "Dependency-Check", tool_version)]
         except Exception as ex:
             raise LoadingError("Failed to load, parse and map the report: {}".format(ex)) from ex
+
+    def related_files(self, report_file_path: str) -> List[str]:
+        return [] if report_file_path == archive.STDIN else [json_file(report_file_path)]
+
+    def input_files(self) -> List[str]:
+        return [f for report_file_path in find_files(self.config["report_file"] or "")
+                for f in [report_file_path, *self.related_files(report_file_path)]]
+
+
+def json_file(report_file_path: str) -> str:
+    """
+    Get the path to the optional JSON report next to a CSV report.
+    :param report_file_path: Path to the CSV report file
+    :return: Path to the JSON report file
+    """
+    return re.sub(r"\.csv$", ".json", report_file_path)
@@ -2,15 +2,14 @@
 npm audit report loader.
 """
 
-import json
 import logging
 from datetime import datetime
-from os import path
-from typing import List
+from typing import Any, Dict, Iterator, List, TextIO
 
+from reportmix import archive, json_backend
 from reportmix.config.property import ConfigProperty
-from reportmix.errors import LoadingError
-from reportmix.loader import Loader
+from reportmix.errors import LoadingError, SkippedError
+from reportmix.loader import Loader, find_files
 from reportmix.models import severity
 from reportmix.models.issue import Issue
 from reportmix.models.project import Project
@@ -18,6 +17,8 @@ from reportmix.models.report import Report
 from reportmix.models.subject import Subject
 from reportmix.models.tool import Tool
 
+logger = logging.getLogger(__name__)
+
 # Configuration properties
 PROPERTIES: List[ConfigProperty] = [
     ConfigProperty("report_file", "path to the report file", True, "npm-audit.json")
@@ -35,57 +36,118 @@ class NpmAuditLoader(Loader):
         parse it, map vulnerabilities to issues, and return the list.
         :return: Report of vulnerabilities.
         """
-        report_file_path = path.realpath(self.config["report_file"])
-        if not (report_file_path.endswith(".json") and path.exists(report_file_path)):
-            raise LoadingError("npm audit report ignored (file not found or not *.json)")
+        issues = list(self.iter_issues())
+        return Report(issues, self.tools)
 
-        logging.debug("Loading report %s", report_file_path)
+    def iter_issues(self) -> Iterator[Issue]:
+        """
+        Load the npm audit report files in JSON format, parse them,
+        and yield vulnerabilities mapped to issues one at a time.
+        :return: An iterator over vulnerabilities.
+        """
+        report_file_paths = self.report_files(".json")
+        if not report_file_paths:
+            raise SkippedError("npm audit report ignored (file not found or not *.json)")
+        yield from self.iter_files(report_file_paths)
+
+    def iter_file(self, report_file_path: str) -> Iterator[Issue]:
+        """
+        Load a npm audit report file in JSON format, parse it,
+        and yield vulnerabilities mapped to issues one at a time.
+        :param report_file_path: Path to the JSON report file.
+        :return: An iterator over vulnerabilities.
+        """
+        logger.debug("Loading report %s", report_file_path)
 
         try:
-            with open(report_file_path, "r", encoding="utf8") as report_file:
-                report = json.load(report_file)
-                advisories = report["advisories"]
-                issues = []
-                for number, adv in advisories.items():
-                    for finding in adv["findings"]:
-                        issues.append(Issue(
-                            ref=adv["id"] or number,
-                            identifier=", ".join(adv["cves"]) or adv["title"],
-                            name=adv["title"],
-                            type="VULNERABILITY",
-                            category=adv["cwe"],
-                            description=str(adv["overview"]).strip(),
-                            more="",
-                            action=str(adv["recommendation"]).strip(),
-                            effort="",
-                            analysis_date=None,
-                            severity=severity.guess(adv["severity"]),
-                            score="",
-                            confidence="",
-                            evidences=len(adv["findings"]),
-                            source="NPM Public Advisories",
-                            source_date=datetime.strptime(adv["created"][:19], "%Y-%m-%dT%H:%M:%S"),
-                            url=adv["url"],
-                            tool=Tool(
-                                identifier="npm_audit",
-                                name="npm audit",
-                                version=""
-                            ),
-                            subject=Subject(
-                                identifier=adv["module_name"],
-                                name=adv["module_name"],
-                                description="",
-                                version="Vulnerable versions: {}, Patched versions: {}".format(
-                                    adv["vulnerable_versions"], adv["patched_versions"]),
-                                location=finding["paths"][0] if finding["paths"] else "",
-                                license=""
-                            ),
-                            project=Project(
-                                identifier="",
-                                name="",
-                                version=""
-                            )
-                        ))
-                return Report(issues, [Tool("npm_audit", "npm audit", "")])
+            with archive.open_text(report_file_path, encoding="utf8") as report_file:
+                yield from self.iter_parse(report_file)
+        except OSError as ex:
+            raise LoadingError("Failed to read the report: {}".format(ex)) from ex
+
+    def parse(self, report_file: TextIO) -> Report:
+        """
+        Parse the npm audit report in JSON format,
+        map vulnerabilities to issues, and return the list.
+        :param report_file: JSON report stream.
+        :return: Report of vulnerabilities.
+        """
+        issues = list(self.iter_parse(report_file))
+        return Report(issues, self.tools)
+
+    def iter_parse(self, report_file: TextIO) -> Iterator[Issue]:
+        """
+        Parse the npm audit report in JSON format
+        and yield vulnerabilities mapped to issues one at a time.
+        :param report_file: JSON report stream.
+        :return: An iterator over vulnerabilities.
+        """
+        try:
+            report = json_backend.load(report_file)
+        except Exception as ex:
+            raise LoadingError("Failed to load, parse and map the report: {}".format(ex)) from ex
+        yield from self.iter_parse_data(report)
+
+    def parse_data(self, data: Dict[str, Any]) -> Report:
+        """
+        Map vulnerabilities of a parsed npm audit report to issues, and return the list.
+        :param data: Parsed JSON report.
+        :return: Report of vulnerabilities.
+        """
+        issues = list(self.iter_parse_data(data))
+        return Report(issues, self.tools)
+
+    def iter_parse_data(self, report: Dict[str, Any]) -> Iterator[Issue]:
+        """
+        Map vulnerabilities of a parsed npm audit report to issues and yield them one at a time.
+        :param report: Parsed JSON report.
+        :return: An iterator over vulnerabilities.
+        """
+        try:
+            advisories = report["advisories"]
+            for number, adv in advisories.items():
+                for finding in adv["findings"]:
+                    yield Issue(
+                        ref=adv["id"] or number,
+                        identifier=", ".join(adv["cves"]) or adv["title"],
+                        name=adv["title"],
+                        type="VULNERABILITY",
+                        category=adv["cwe"],
+                        description=str(adv["overview"]).strip(),
+                        more="",
+                        action=str(adv["recommendation"]).strip(),
+                        effort="",
+                        analysis_date=None,
+                        severity=severity.guess(adv["severity"]),
+                        score="",
+                        confidence="",
+                        evidences=len(adv["findings"]),
+                        source="NPM Public Advisories",
+                        source_date=datetime.strptime(adv["created"][:19], "%Y-%m-%dT%H:%M:%S"),
+                        url=adv["url"],
+                        tool=Tool(
+                            identifier="npm_audit",
+                            name="npm audit",
+                            version=""
+                        ),
+                        subject=Subject(
+                            identifier=adv["module_name"],
+                            name=adv["module_name"],
+                            description="",
+                            version="Vulnerable versions: {}, Patched versions: {}".format(
+                                adv["vulnerable_versions"], adv["patched_versions"]),
+                            location=finding["paths"][0] if finding["paths"] else "",
+                            license=""
+                        ),
+                        project=Project(
+                            identifier="",
+                            name="",
+                            version=""
+                        )
+                    )
+            self.tools = [Tool("npm_audit", "npm audit", "")]
         except Exception as ex:
             raise LoadingError("Failed to load, parse and map the report: {}".format(ex)) from ex
+
+    def input_files(self) -> List[str]:
+        return find_files(self.config["report_file"] or "")
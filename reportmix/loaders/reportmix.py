@@ -2,103 +2,261 @@
 ReportMix report loader.
 """
 
-import csv
 import logging
 from datetime import datetime
-from os import path
-from typing import List
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
 
+from reportmix import archive, json_backend
 from reportmix.config.property import ConfigProperty
-from reportmix.errors import LoadingError
-from reportmix.loader import Loader
-from reportmix.models import severity
+from reportmix.csv_reader import CsvReader, parse_iso_date, severity_from_identifier
+from reportmix.errors import LoadingError, SkippedError
+from reportmix.loader import Loader, find_files
 from reportmix.models.issue import Issue
+from reportmix.models.meta import Meta
 from reportmix.models.project import Project
 from reportmix.models.report import Report
+from reportmix.models.severity import Severity
 from reportmix.models.subject import Subject
 from reportmix.models.tool import Tool
 
+logger = logging.getLogger(__name__)
+
 # Configuration properties
 PROPERTIES: List[ConfigProperty] = [
-    ConfigProperty("report_file", "path to the report file", False)
+    ConfigProperty("report_file", "path to the report file (CSV, JSON or NDJSON)", False),
+    ConfigProperty("verify", "verify hashes loaded from JSON and NDJSON reports "
+                             "(true or false)", False, "false", "^(true|false)$")
 ]
 
+# Columns read from the CSV report (meta and hash are ignored)
+COLUMNS = ["ref", "identifier", "name", "type", "category", "description", "more", "action",
+           "effort", "analysis_date", "severity", "score", "confidence", "evidences", "source",
+           "source_date", "url", "tool_identifier", "tool_name", "tool_version",
+           "subject_identifier", "subject_name", "subject_description", "subject_version",
+           "subject_location", "subject_license", "project_identifier", "project_name",
+           "project_version"]
+REQUIRED_COLUMNS = ["identifier", "tool_identifier", "subject_identifier"]
+
 
 class ReportMixLoader(Loader):
     """
-    ReportMix report loader (CSV required).
+    ReportMix report loader (CSV, JSON or NDJSON).
+    Hash and metadata fields are kept from JSON and NDJSON reports
+    (lossless reload), they are ignored in CSV reports.
     """
 
     def load(self) -> Report:
         """
-        Load the ReportMix report file (CSV required), parse it, and return the
+        Load the ReportMix report file (CSV, JSON or NDJSON), parse it, and return the
         list of issues.
         :return: Loaded issues.
         """
+        issues = list(self.iter_issues())
+        return Report(issues, self.tools)
+
+    def iter_issues(self) -> Iterator[Issue]:
+        """
+        Load the ReportMix report files (CSV, JSON or NDJSON), parse them,
+        and yield issues one at a time.
+        :return: An iterator over loaded issues.
+        """
         if "report_file" not in self.config or self.config["report_file"] is None:
-            raise LoadingError("ReportMix report ignored (report file path required)")
+            raise SkippedError("ReportMix report ignored (report file path required)")
+
+        report_file_paths = self.report_files(".csv", ".json", ".ndjson")
+        if not report_file_paths:
+            raise SkippedError("ReportMix report ignored "
+                               "(file not found or not *.csv, *.json or *.ndjson)")
+        yield from self.iter_files(report_file_paths)
+
+    def iter_file(self, report_file_path: str) -> Iterator[Issue]:
+        """
+        Load a ReportMix report file (CSV, JSON or NDJSON), parse it,
+        and yield issues one at a time.
+        :param report_file_path: Path to the report file.
+        :return: An iterator over loaded issues.
+        """
+        logger.debug("Loading report %s", report_file_path)
 
-        report_file_path = path.realpath(self.config["report_file"])
-        if not (report_file_path.endswith(".csv") and path.exists(report_file_path)):
-            raise LoadingError("ReportMix report ignored (file not found or not *.csv)")
+        try:
+            if not report_file_path.endswith((".json", ".ndjson")):
+                with archive.open_text(report_file_path, newline='') as report_file:
+                    yield from self.iter_parse(report_file)
+            else:
+                with archive.open_text(report_file_path, encoding="utf-8") as report_file:
+                    if report_file_path.endswith(".ndjson"):
+                        items = (json_backend.loads(line) for line in report_file if line.strip())
+                    else:
+                        items = json_backend.load(report_file)
+                    yield from self.iter_parse_json(items)
+        except OSError as ex:
+            raise LoadingError("Failed to read the report: {}".format(ex)) from ex
+        except ValueError as ex:
+            raise LoadingError("Failed to load and parse the report: {}".format(ex)) from ex
 
-        logging.debug("Loading report %s", report_file_path)
+    def parse(self, report_file: TextIO) -> Report:
+        """
+        Parse the ReportMix report (CSV, JSON or NDJSON, detected from the first line)
+        and return the list of issues.
+        :param report_file: Report stream.
+        :return: Loaded issues.
+        """
+        first_line = report_file.readline()
+        lines = chain([first_line], report_file)
+        if first_line.lstrip().startswith("["):
+            try:
+                items = json_backend.loads("".join(lines))
+            except Exception as ex:
+                raise LoadingError("Failed to load and parse the report: {}".format(ex)) from ex
+            issues = list(self.iter_parse_json(items))
+        elif first_line.lstrip().startswith("{"):
+            try:
+                issues = list(self.iter_parse_json(
+                    json_backend.loads(line) for line in lines if line.strip()))
+            except ValueError as ex:
+                raise LoadingError("Failed to load and parse the report: {}".format(ex)) from ex
+        else:
+            issues = list(self.iter_parse(lines))
+        return Report(issues, self.tools)
+
+    def parse_data(self, data: List[Dict[str, Any]]) -> Report:
+        """
+        Map issues of a parsed JSON report and return the list.
+        :param data: Parsed JSON report (issues exported in JSON format).
+        :return: Loaded issues.
+        """
+        issues = list(self.iter_parse_json(data))
+        return Report(issues, self.tools)
 
+    def iter_parse(self, report_file: Iterable[str]) -> Iterator[Issue]:
+        """
+        Parse the ReportMix report (CSV required) and yield issues one at a time.
+        :param report_file: CSV report stream (or lines).
+        :return: An iterator over loaded issues.
+        """
         try:
             # Load issues from the CSV report
-            with open(report_file_path, "r", newline='') as report_file:
-                report = csv.DictReader(report_file, delimiter=',', quotechar='"')
-                issues = []
-                for row in report:
-                    analysis_date = None
-                    if row.get("analysis_date"):
-                        analysis_date = datetime.fromisoformat(row["analysis_date"])
-                    source_date = None
-                    if row.get("source_date"):
-                        source_date = datetime.fromisoformat(row["source_date"])
-                    evidences = 1
-                    if row.get("evidences", "1").isdecimal():
-                        evidences = int(row.get("evidences", "1"))
-                    issues.append(Issue(
-                        ref=row.get("ref"),
-                        identifier=row["identifier"],  # Required
-                        name=row.get("name"),
-                        type=row.get("type"),
-                        category=row.get("category"),
-                        description=row.get("description"),
-                        more=row.get("more"),
-                        action=row.get("action"),
-                        effort=row.get("effort"),
-                        analysis_date=analysis_date,
-                        severity=severity.from_identifier(row.get("severity")),
-                        score=row.get("score"),
-                        confidence=row.get("confidence"),
-                        evidences=evidences,
-                        source=row.get("source"),
-                        source_date=source_date,
-                        url=row.get("url"),
-                        tool=Tool(
-                            identifier=row["tool_identifier"],  # Required
-                            name=row.get("tool_name"),
-                            version=row.get("tool_version"),
-                        ),
-                        subject=Subject(
-                            identifier=row["subject_identifier"],  # Required
-                            name=row.get("subject_name"),
-                            description=row.get("subject_description"),
-                            version=row.get("subject_version"),
-                            location=row.get("subject_location"),
-                            license=row.get("subject_license"),
-                        ),
-                        project=Project(
-                            identifier=row.get("project_identifier"),
-                            name=row.get("project_name"),
-                            version=row.get("project_version"),
-                        ),
-                        # meta ignored
-                        # hash ignored
-                    ))
-                tools = list({i.tool.identifier: i.tool for i in issues}.values())
-                return Report(issues, tools)
+            report = CsvReader(report_file, COLUMNS, REQUIRED_COLUMNS)
+            tools = {}
+            for ref, identifier, name, issue_type, category, description, more, action, \
+                    effort, analysis_date, severity, score, confidence, evidences, source, \
+                    source_date, url, tool_identifier, tool_name, tool_version, \
+                    subject_identifier, subject_name, subject_description, subject_version, \
+                    subject_location, subject_license, project_identifier, project_name, \
+                    project_version in report:
+                # Tools are shared by issues
+                tool_key = (tool_identifier, tool_name, tool_version)
+                if tool_key not in tools:
+                    tools[tool_key] = Tool(
+                        identifier=tool_identifier,
+                        name=tool_name,
+                        version=tool_version,
+                    )
+                yield Issue(
+                    ref=ref,
+                    identifier=identifier,
+                    name=name,
+                    type=issue_type,
+                    category=category,
+                    description=description,
+                    more=more,
+                    action=action,
+                    effort=effort,
+                    analysis_date=parse_iso_date(analysis_date) if analysis_date else None,
+                    severity=severity_from_identifier(severity),
+                    score=score,
+                    confidence=confidence,
+                    evidences=int(evidences) if evidences and evidences.isdecimal() else 1,
+                    source=source,
+                    source_date=parse_iso_date(source_date) if source_date else None,
+                    url=url,
+                    tool=tools[tool_key],
+                    subject=Subject(
+                        identifier=subject_identifier,
+                        name=subject_name,
+                        description=subject_description,
+                        version=subject_version,
+                        location=subject_location,
+                        license=subject_license,
+                    ),
+                    project=Project(
+                        identifier=project_identifier,
+                        name=project_name,
+                        version=project_version,
+                    ),
+                    # meta ignored
+                    # hash ignored
+                )
+            self.tools = list({t.identifier: t for t in tools.values()}.values())
         except Exception as ex:
             raise LoadingError("Failed to load and parse the report: {}".format(ex)) from ex
+
+    def iter_parse_json(self, items: Iterable[Dict[str, Any]]) -> Iterator[Issue]:
+        """
+        Map issues exported in JSON format (JSON or NDJSON report, or issues
+        mapped with Issue.to_dict()) and yield them one at a time, with their
+        hash and metadata fields.
+        :param items: Exported issues.
+        :return: An iterator over loaded issues.
+        """
+        try:
+            tools = {}
+            for item in items:
+                tool = item["tool"]
+                tool_key = (tool["identifier"], tool.get("name"), tool.get("version"))
+                if tool_key not in tools:
+                    tools[tool_key] = Tool(*tool_key)
+                meta = item.get("meta")
+                yield Issue(
+                    ref=item.get("ref"),
+                    identifier=item["identifier"],  # Required
+                    name=item.get("name"),
+                    type=item.get("type"),
+                    category=item.get("category"),
+                    description=item.get("description"),
+                    more=item.get("more"),
+                    action=item.get("action"),
+                    effort=item.get("effort"),
+                    analysis_date=json_date(item.get("analysis_date")),
+                    severity=json_severity(item.get("severity")),
+                    score=item.get("score"),
+                    confidence=item.get("confidence"),
+                    evidences=item.get("evidences", 1),
+                    source=item.get("source"),
+                    source_date=json_date(item.get("source_date")),
+                    url=item.get("url"),
+                    tool=tools[tool_key],
+                    subject=Subject(**item["subject"]),
+                    project=Project(**item["project"]),
+                    meta=Meta(**meta) if meta else None,
+                    hash=item.get("hash")
+                )
+            self.tools = list({t.identifier: t for t in tools.values()}.values())
+        except Exception as ex:
+            raise LoadingError("Failed to load and parse the report: {}".format(ex)) from ex
+
+    def input_files(self) -> List[str]:
+        if "report_file" not in self.config or self.config["report_file"] is None:
+            return []
+        return find_files(self.config["report_file"])
+
+
+def json_date(value: Any) -> Optional[datetime]:
+    """
+    Parse a date of an issue exported in JSON format.
+    :param value: Date in ISO format (or an already parsed date)
+    :return: The parsed date (None if empty)
+    """
+    if not value:
+        return None
+    return value if isinstance(value, datetime) else parse_iso_date(value)
+
+
+def json_severity(value: Any) -> Optional[Severity]:
+    """
+    Parse the severity of an issue exported in JSON format.
+    :param value: Severity identifier (or a severity)
+    :return: The severity (None if unknown)
+    """
+    return value if isinstance(value, Severity) else severity_from_identifier(value)
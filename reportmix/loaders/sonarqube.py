@@ -2,21 +2,43 @@
 SonarQube report loader.
 """
 
+import hashlib
+import heapq
+import html
 import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from os import path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from reportmix.cache import MetadataCache
+from reportmix.client import HttpClient, RateLimiter
 from reportmix.config.property import ConfigProperty
-from reportmix.errors import LoadingError
+from reportmix.errors import LoadingError, SkippedError
 from reportmix.loader import Loader
+from reportmix.models import severity as severities
 from reportmix.models.issue import Issue
 from reportmix.models.project import Project
 from reportmix.models.report import Report
 from reportmix.models.severity import SEVERITIES
 from reportmix.models.subject import Subject
 from reportmix.models.tool import Tool
+from reportmix.summary import Summary
+
+logger = logging.getLogger(__name__)
+
+# Type of prefetched items
+T = TypeVar("T")
 
 # Possible values for types and statuses request parameters
 TYPES = ["CODE_SMELL", "BUG", "VULNERABILITY", "SECURITY_HOTSPOT"]
@@ -25,17 +47,51 @@ STATUSES = ["OPEN", "CONFIRMED", "REOPENED", "RESOLVED", "CLOSED",
             "TO_REVIEW", "IN_REVIEW", "REVIEWED"]
 DEFAULT_STATUSES = ",".join(STATUSES[0:3])
 
+# Security hotspots are not returned by the issues search but by the hotspots search
+HOTSPOT_TYPE = TYPES[3]
+HOTSPOT_STATUSES = ["TO_REVIEW", "REVIEWED"]
+
+# Number of items in a result page
+PAGE_SIZE = 500
+# Maximum number of items returned by a search (p * ps)
+MAX_RESULTS = 10000
+# Number of rules requested at once
+RULES_BATCH_SIZE = 100
+# Maximum number of issue pages fetched ahead of the processed one
+PREFETCH_PAGES = 4
+# Maximum number of connections kept open to a server
+# (and of project branches fetched concurrently)
+POOL_SIZE = 32
+
 # Configuration properties
 # https://docs.sonarqube.org/latest/analysis/analysis-parameters/
 PROPERTIES: List[ConfigProperty] = [
     ConfigProperty("host_url", "the server URL", False, "http://localhost:9000"),
     ConfigProperty("login", "the login or authentication token"),
     ConfigProperty("password", "the password that goes with the login username"),
-    ConfigProperty("project_key", "the project's unique key"),
+    ConfigProperty("project_key", "the project's unique key (or comma-separated list "
+                                  "of keys and glob patterns, e.g. acme:*)"),
+    ConfigProperty("branches", "comma-separated list of branch names and glob patterns "
+                               "(e.g. release/*) to fetch instead of the main branch", False),
+    ConfigProperty("pull_requests", "comma-separated list of pull request identifiers "
+                                    "to fetch instead of the main branch", False),
     ConfigProperty("types", "issue types ({})".format(", ".join(TYPES)), False,
                    DEFAULT_TYPES, "^((T),)*(T)$".replace("T", "|".join(TYPES))),
     ConfigProperty("statuses", "issue statuses ({})".format(", ".join(STATUSES)), False,
-                   DEFAULT_STATUSES, "^((S),)*(S)$".replace("S", "|".join(STATUSES)))
+                   DEFAULT_STATUSES, "^((S),)*(S)$".replace("S", "|".join(STATUSES))),
+    ConfigProperty("timeout", "connect and read timeout in seconds (0 to disable)",
+                   False, "30", r"^\d+(\.\d+)?$"),
+    ConfigProperty("retries", "maximum number of retries of a failed request",
+                   False, "3", r"^\d+$"),
+    ConfigProperty("backoff", "base delay in seconds before retrying a failed request "
+                              "(doubled on each retry, with jitter)",
+                   False, "0.5", r"^\d+(\.\d+)?$"),
+    ConfigProperty("rate_limit", "maximum number of requests per second to the server "
+                                 "(0 to disable)", False, "0", r"^\d+(\.\d+)?$"),
+    ConfigProperty("rules_ttl", "time to live of cached rules (name and description) in hours "
+                                "(0 to not load rules)", False, "24", r"^\d+(\.\d+)?$"),
+    ConfigProperty("workers", "maximum number of project branches fetched concurrently",
+                   False, "8", r"^\d+$")
 ]
 
 
@@ -44,106 +100,718 @@ class SonarQubeLoader(Loader):
     SonarQube project report loader using the Web API.
     """
 
+    # Issues are requested sorted by decreasing severity
+    sorted_by = [("severity", True)]
+
     def load(self) -> Report:
         """
         Load project issues from the SonarQube Web API,
         parse them, map them, and return the list.
         :return: Loaded issues.
         """
+        issues = list(self.iter_issues())
+        return Report(issues, self.tools)
+
+    def iter_issues(self) -> Iterator[Issue]:
+        """
+        Load issues of the requested projects and branches from the SonarQube Web API,
+        page by page, and yield them mapped to issues one at a time (sorted by decreasing
+        severity). Security hotspots are fetched in parallel and merged with other issues,
+        multiple projects and branches are fetched concurrently.
+        :return: An iterator over loaded issues.
+        """
         cfg = self.config
-        if not (cfg["host_url"] and cfg["project_key"]):
-            raise LoadingError("SonarQube report ignored (required params: host_url, project_key)")
+        client, auth = self._client()
+        types = (cfg["types"] or DEFAULT_TYPES).split(",")
+        workers = min(int(cfg["workers"] or 1) or 1, POOL_SIZE)
+        # Projects and security hotspots are fetched in separate pools
+        # (a project waits for its hotspots)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        hotspots_executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Fetch projects and branches info
+            try:
+                targets = self._targets(client, auth, executor)
+            except LoadingError:
+                raise
+            except Exception as ex:
+                raise LoadingError("Failed to get project information: {}".format(ex)) from ex
 
-        # Authentication params
-        auth = (cfg["login"] or "", cfg["password"] or "")
+            # Fetch issues and security hotspots info
+            tool = Tool("sonarqube", "SonarQube", "")
+            try:
+                if len(targets) == 1:
+                    streams = [self._iter_target(client, auth, types, targets[0], tool,
+                                                 hotspots_executor)]
+                else:
+                    streams = [iter_result(executor.submit(
+                        self._load_target, client, auth, types, t, tool, hotspots_executor))
+                        for t in targets]
+                # All streams are sorted by decreasing severity
+                yield from heapq.merge(*streams, key=severity_rank)
+                self.tools = [tool]
+            except LoadingError:
+                raise
+            except Exception as ex:
+                raise LoadingError("Failed to process issues: {}".format(ex)) from ex
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            hotspots_executor.shutdown(wait=False, cancel_futures=True)
 
-        # Fetch project info
-        project_url = "{}/api/projects/search?q={}".format(cfg["host_url"], cfg["project_key"])
-        try:
-            resp = requests.get(project_url, auth=auth)
-            project_resp = resp.json()["components"][0]
-            project = Project(project_resp["key"], project_resp["name"], "")
-        except Exception as ex:
-            raise LoadingError("Failed to get project information: {}".format(ex)) from ex
+    def _targets(self, client: HttpClient, auth: Tuple[str, str],
+                 executor: ThreadPoolExecutor) -> List["Target"]:
+        """
+        Resolve project keys (with a single, paginated, projects search) and branches
+        (concurrently, if any) to fetch issues from.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param executor: Executor to resolve branches with
+        :return: Projects and branches to fetch issues from
+        """
+        cfg = self.config
+        keys = split_list(cfg["project_key"])
+        projects_url = "{}/api/projects/search?ps={}".format(cfg["host_url"], PAGE_SIZE)
+        if not any(is_pattern(k) for k in keys):
+            projects_url += "&projects=" + quote(",".join(keys), safe=":,")
+        components = [c for _, page in fetch_pages(client, auth, projects_url, "components")
+                      for c in page]
+        projects = []
+        for key in keys:
+            matches = sorted((c for c in components if fnmatchcase(c["key"], key)),
+                             key=lambda c: c["key"])
+            if not matches:
+                if not is_pattern(key):
+                    raise LoadingError("Project {} not found".format(key))
+                logger.warning("No SonarQube project matching %s", key)
+            for component in matches:
+                if "lastAnalysisDate" not in component:
+                    logger.warning("SonarQube project %s ignored (never analyzed)",
+                                   component["key"])
+                elif component not in projects:
+                    projects.append(component)
+        if not projects:
+            raise LoadingError("No analyzed project matching {}".format(cfg["project_key"]))
+
+        branches, pull_requests = split_list(cfg["branches"]), split_list(cfg["pull_requests"])
+        branch_targets = executor.map(lambda c: self._branch_targets(client, auth, c, branches),
+                                      projects) if branches else [[]] * len(projects)
+        targets = []
+        for component, project_branches in zip(projects, branch_targets):
+            analysis_date = parse_date(component["lastAnalysisDate"])
+            if not (branches or pull_requests):
+                project = Project(component["key"], component["name"], "")
+                targets.append(Target(project, analysis_date))
+            targets.extend(project_branches)
+            targets.extend(Target(Project(component["key"], component["name"], "PR-" + p),
+                                  analysis_date, pull_request=p) for p in pull_requests)
+        if not targets:
+            raise LoadingError("No analyzed branch matching {}".format(cfg["branches"]))
+        logger.info("Fetching SonarQube issues from %d project(s) and branch(es)", len(targets))
+        return targets
 
-        # Fetch issues info
-        page_size = 500  # Number of issues in a result page
-        page_index = 1  # Current page index
-        total = page_size  # Total number of issues
+    def _branch_targets(self, client: HttpClient, auth: Tuple[str, str], component: Dict,
+                        branches: List[str]) -> List["Target"]:
+        """
+        Resolve branches (names or patterns) of a project.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param component: Project (as returned by the projects search)
+        :param branches: Branch names or patterns
+        :return: Branches to fetch issues from
+        """
+        branches_url = "{}/api/project_branches/list?project={}".format(
+            self.config["host_url"], quote(component["key"], safe=":"))
+        logger.debug("Fetching branches from %s", branches_url)
+        result = client.get(branches_url, auth=auth).json()
+        if "branches" not in result:
+            raise LoadingError("Server response is invalid ('branches' key missing)")
+        targets = []
+        for branch in result["branches"]:
+            if "analysisDate" in branch and any(fnmatchcase(branch["name"], b) for b in branches):
+                project = Project(component["key"], component["name"], branch["name"])
+                # The main branch is requested without the branch parameter
+                targets.append(Target(project, parse_date(branch["analysisDate"]),
+                                      branch="" if branch.get("isMain") else branch["name"]))
+        if not targets:
+            logger.warning("No analyzed branch of SonarQube project %s matching %s",
+                           component["key"], ",".join(branches))
+        return targets
+
+    def _iter_target(self, client: HttpClient, auth: Tuple[str, str], types: List[str],
+                     target: "Target", tool: Tool,
+                     hotspots_executor: ThreadPoolExecutor) -> Iterator[Issue]:
+        """
+        Fetch issues of a project branch page by page, and security hotspots in
+        the background, and yield them one at a time (sorted by decreasing severity).
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param types: Issue types
+        :param target: Project branch
+        :param tool: Tool (its version is set from responses)
+        :param hotspots_executor: Executor to fetch security hotspots with
+        :return: An iterator over issues
+        """
+        start = time.perf_counter()
+        streams = []
+        if HOTSPOT_TYPE in types:
+            hotspots = hotspots_executor.submit(self._load_hotspots, client, auth, target, tool)
+            streams.append(iter_result(hotspots))
+        issue_types = [t for t in types if t != HOTSPOT_TYPE]
+        if issue_types:
+            # Start fetching issue pages before waiting for hotspots
+            streams.insert(0, self._iter_issues(client, auth, issue_types, target, tool))
+        count = 0
+        for issue in heapq.merge(*streams, key=severity_rank):
+            count += 1
+            yield issue
+        logger.info("Fetched %d SonarQube issues from %s in %.3fs",
+                    count, target, time.perf_counter() - start)
 
-        issues_base_url = "{}/api/issues/search?componentKeys={}&statuses={}&s=SEVERITY" \
+    def _load_target(self, client: HttpClient, auth: Tuple[str, str], types: List[str],
+                     target: "Target", tool: Tool,
+                     hotspots_executor: ThreadPoolExecutor) -> List[Issue]:
+        """
+        Fetch issues of a project branch.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param types: Issue types
+        :param target: Project branch
+        :param tool: Tool (its version is set from responses)
+        :param hotspots_executor: Executor to fetch security hotspots with
+        :return: Issues sorted by decreasing severity
+        """
+        return list(self._iter_target(client, auth, types, target, tool, hotspots_executor))
+
+    def _iter_issues(self, client: HttpClient, auth: Tuple[str, str], types: List[str],
+                     target: "Target", tool: Tool) -> Iterator[Issue]:
+        """
+        Fetch issues page by page (sorted by decreasing severity) in the background,
+        resolve the rules of each page and yield issues one at a time (next pages are
+        fetched while previous ones are processed, or while waiting for hotspots).
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param types: Issue types
+        :param target: Project branch
+        :param tool: Tool (its version is set from responses)
+        :return: An iterator over issues
+        """
+        cfg = self.config
+        issues_base_url = "{}/api/issues/search?componentKeys={}{}&statuses={}&s=SEVERITY" \
                           "&asc=false&types={}&ps={}" \
-            .format(cfg["host_url"], cfg["project_key"], cfg["statuses"] or DEFAULT_STATUSES,
-                    cfg["types"] or DEFAULT_TYPES, page_size)
+            .format(cfg["host_url"], target.key, target.params,
+                    cfg["statuses"] or DEFAULT_STATUSES, ",".join(types), PAGE_SIZE)
+        for resp, issues in prefetch(fetch_pages(client, auth, issues_base_url, "issues"),
+                                     PREFETCH_PAGES):
+            tool.version = resp.headers["Sonar-Version"]
+            rules = self._rules(client, auth, {i["rule"] for i in issues})
+            for issue in issues:
+                yield map_issue(issue, rules.get(issue["rule"]) or {},
+                                target.project, target.analysis_date, tool)
+
+    def _search_hotspots(self, client: HttpClient, auth: Tuple[str, str], target: "Target",
+                         tool: Tool) -> List[Dict]:
+        """
+        Fetch security hotspots with the requested statuses.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param target: Project branch
+        :param tool: Tool (its version is set from responses)
+        :return: Security hotspots (as returned by the server)
+        """
+        cfg = self.config
+        statuses = [s for s in (cfg["statuses"] or DEFAULT_STATUSES).split(",")
+                    if s in HOTSPOT_STATUSES] or HOTSPOT_STATUSES[:1]
+        hotspots = []
+        for status in statuses:
+            hotspots_base_url = "{}/api/hotspots/search?projectKey={}{}&status={}&ps={}" \
+                .format(cfg["host_url"], target.key, target.params, status, PAGE_SIZE)
+            for resp, page in fetch_pages(client, auth, hotspots_base_url, "hotspots"):
+                tool.version = resp.headers["Sonar-Version"]
+                hotspots.extend(page)
+        return hotspots
+
+    def _load_hotspots(self, client: HttpClient, auth: Tuple[str, str], target: "Target",
+                       tool: Tool) -> List[Issue]:
+        """
+        Fetch security hotspots, resolve their rules and map them to issues.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param target: Project branch
+        :param tool: Tool (its version is set from responses)
+        :return: Issues sorted by decreasing severity (the hotspots search cannot sort them)
+        """
+        hotspots = self._search_hotspots(client, auth, target, tool)
+        rules = self._rules(client, auth, {h["ruleKey"] for h in hotspots if h.get("ruleKey")})
+        issues = [map_hotspot(h, rules.get(h.get("ruleKey")) or {}, target.project,
+                              target.analysis_date, tool) for h in hotspots]
+        issues.sort(key=severity_rank)
+        return issues
+
+    def _rules(self, client: HttpClient, auth: Tuple[str, str],
+               keys: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Resolve rules (name and description) from the rules cache, missing rules
+        are requested by batch to the SonarQube Web API and cached.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param keys: Rule keys
+        :return: Rules by key (empty if rules are not loaded)
+        """
+        cfg = self.config
+        ttl = float(cfg["rules_ttl"] or 0) * 3600
+        if ttl <= 0:
+            return {}
+        cache = get_rules_cache(cfg["host_url"], self._rules_cache_file(), ttl)
+        rules = cache.get(keys)
+        missing = sorted(k for k in keys if k not in rules)
+        fetched = {}
+        for index in range(0, len(missing), RULES_BATCH_SIZE):
+            batch = missing[index:index + RULES_BATCH_SIZE]
+            rules_url = "{}/api/rules/search?rule_keys={}&f=name,htmlDesc,mdDesc&ps={}" \
+                .format(cfg["host_url"], quote(",".join(batch), safe=":,"), RULES_BATCH_SIZE)
+            logger.debug("Fetching %d rules from %s", len(batch), rules_url)
+            result = client.get(rules_url, auth=auth).json()
+            if "rules" not in result:
+                raise LoadingError("Server response is invalid ('rules' key missing)")
+            # Unknown rules are cached too (to not request them again)
+            fetched.update((k, {"name": "", "description": ""}) for k in batch)
+            for rule in result["rules"]:
+                fetched[rule["key"]] = {
+                    "name": rule.get("name", ""),
+                    "description": html_to_text(rule.get("htmlDesc") or rule.get("mdDesc") or "")
+                }
+        if fetched:
+            cache.put(fetched)
+            rules.update(fetched)
+        return rules
+
+    def _rules_cache_file(self) -> Optional[str]:
+        """
+        Get the path to the rules cache file (in the cache directory, if enabled).
+        :return: The path to the cache file (None to only cache rules in memory)
+        """
+        if self.cache is None:
+            return None
+        host_hash = hashlib.sha1(self.config["host_url"].encode("utf-8")).hexdigest()[:12]
+        return path.join(self.cache.directory, "sonarqube-rules-{}.json".format(host_hash))
+
+    def count(self) -> Summary:
+        """
+        Count issues of the requested projects and branches by severity and type
+        with a single request per project branch to the SonarQube Web API (facets),
+        without fetching them (projects and branches are resolved first if needed).
+        Security hotspots (not supported by facets) are fetched and counted.
+        :return: The issues summary.
+        """
+        cfg = self.config
+        client, auth = self._client()
+        types = (cfg["types"] or DEFAULT_TYPES).split(",")
+        workers = min(int(cfg["workers"] or 1) or 1, POOL_SIZE)
         try:
-            issues = []
-            # For each page (while total > max items fetched during the last iteration
-            # and no more than 10000 issues have been requested)
-            while total >= (page_index - 1) * page_size and page_index * page_size <= 10000:
-                issues_url = issues_base_url + "&p=" + str(page_index)
-                logging.debug("Fetching issues from %s", issues_url)
-                # Request
-                resp = requests.get(issues_url, auth=auth)
-                result = resp.json()
-                # Check response body
-                if "paging" not in result or "issues" not in result:
-                    raise LoadingError(("Server response is invalid "
-                                        "('paging' and 'issues' keys missing)"))
-                total = result["paging"]["total"]
-                fetched_count = (page_index - 1) * page_size + len(result["issues"])
-                logging.debug("Fetched %d / %d issues", fetched_count, total)
-                # Map issues
-                for issue in result["issues"]:
-                    # Severity
-                    if "severity" in issue and issue["severity"] in SONARQUBE_SEVERITIES:
-                        severity = SONARQUBE_SEVERITIES[issue["severity"]]
-                    else:
-                        severity = SEVERITIES[0]
-                    # Subject location
-                    location = issue["component"]
-                    if "line" in issue:
-                        location += ":" + str(issue["line"])
-                    # Issue
-                    issues.append(Issue(
-                        ref=issue["key"],
-                        identifier=issue["rule"],
-                        name=issue["rule"],
-                        type=issue["type"],
-                        category=issue["type"],
-                        description=issue["message"],
-                        more=", ".join(issue["tags"]),
-                        action=issue["message"],
-                        effort=issue["effort"] if "effort" in issue else "",
-                        analysis_date=datetime.strptime(project_resp["lastAnalysisDate"][:19],
-                                                        "%Y-%m-%dT%H:%M:%S"),
-                        severity=severity,
-                        score="",
-                        confidence="",
-                        evidences=1,
-                        source=issue["rule"],
-                        source_date=datetime.strptime(issue["creationDate"][:19],
-                                                      "%Y-%m-%dT%H:%M:%S"),
-                        url="",
-                        tool=Tool(
-                            identifier="sonarqube",
-                            name="SonarQube",
-                            version=resp.headers["Sonar-Version"]
-                        ),
-                        subject=Subject(
-                            identifier=issue["component"],
-                            name=issue["component"],
-                            description="",
-                            version="",
-                            location=location,
-                            license=""
-                        ),
-                        project=project
-                    ))
-                page_index += 1  # Go to the next result page
-            tool_version = issues[0].tool.version if len(issues) > 0 else ""
-            return Report(issues, [Tool("sonarqube", "SonarQube", tool_version)])
+            tool = Tool("sonarqube", "SonarQube", "")
+            summary = Summary()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                keys = split_list(cfg["project_key"])
+                if len(keys) == 1 and not is_pattern(keys[0]) \
+                        and not (cfg["branches"] or cfg["pull_requests"]):
+                    # A single project: counted without resolving it
+                    targets = [Target(Project(keys[0], keys[0], ""), datetime.now())]
+                else:
+                    targets = self._targets(client, auth, executor)
+                for target_summary in executor.map(
+                        lambda t: self._count(client, auth, types, t, tool), targets):
+                    summary.update(target_summary)
+            self.tools = [tool]
+            return summary
+        except LoadingError:
+            raise
         except Exception as ex:
-            raise LoadingError("Failed to process issues: {}".format(ex)) from ex
+            raise LoadingError("Failed to count issues: {}".format(ex)) from ex
+
+    def _count(self, client: HttpClient, auth: Tuple[str, str], types: List[str],
+               target: "Target", tool: Tool) -> Summary:
+        """
+        Count issues of a project branch by severity and type.
+        :param client: HTTP client
+        :param auth: Authentication params
+        :param types: Issue types
+        :param target: Project branch
+        :param tool: Tool (its version is set from responses)
+        :return: The issues summary
+        """
+        cfg = self.config
+        summary = Summary()
+        issue_types = [t for t in types if t != HOTSPOT_TYPE]
+        if issue_types:
+            issues_url = "{}/api/issues/search?componentKeys={}{}&statuses={}&types={}&ps=1" \
+                         "&facets=severities,types" \
+                .format(cfg["host_url"], target.key, target.params,
+                        cfg["statuses"] or DEFAULT_STATUSES, ",".join(issue_types))
+            logger.debug("Counting issues from %s", issues_url)
+            resp = client.get(issues_url, auth=auth)
+            result = resp.json()
+            if "paging" not in result or "facets" not in result:
+                raise LoadingError(("Server response is invalid "
+                                    "('paging' and 'facets' keys missing)"))
+            summary.totals["sonarqube"] += result["paging"]["total"]
+            for facet in result["facets"]:
+                for value in facet["values"]:
+                    if facet["property"] == "severities":
+                        severity = SONARQUBE_SEVERITIES.get(value["val"], SEVERITIES[0])
+                        summary.severities["sonarqube", severity] += value["count"]
+                    elif facet["property"] == "types" and value["val"] in types:
+                        # Facets are not filtered by their own parameter
+                        summary.types["sonarqube", value["val"]] += value["count"]
+            tool.version = resp.headers["Sonar-Version"]
+        if HOTSPOT_TYPE in types:
+            for hotspot in self._search_hotspots(client, auth, target, tool):
+                summary.totals["sonarqube"] += 1
+                summary.severities["sonarqube", hotspot_severity(hotspot)] += 1
+                summary.types["sonarqube", HOTSPOT_TYPE] += 1
+        return summary
+
+    def _client(self) -> Tuple[HttpClient, Tuple[str, str]]:
+        """
+        Check the configuration and get the HTTP client to the server.
+        :return: The HTTP client and the authentication params
+        """
+        cfg = self.config
+        if not (cfg["host_url"] and cfg["project_key"]):
+            raise SkippedError("SonarQube report ignored (required params: host_url, project_key)")
+        auth = (cfg["login"] or "", cfg["password"] or "")
+        client = HttpClient(get_session(cfg["host_url"]), float(cfg["timeout"] or 0),
+                            int(cfg["retries"] or 0), float(cfg["backoff"] or 0),
+                            rate_limiter=get_rate_limiter(cfg["host_url"],
+                                                          float(cfg["rate_limit"] or 0)))
+        return client, auth
+
+
+class Target:
+    """
+    A project branch (or pull request) to fetch issues from.
+    """
+
+    def __init__(self, project: Project, analysis_date: datetime,
+                 branch: str = "", pull_request: str = ""):
+        """
+        Initialize a project branch.
+        :param project: Project (its version is the branch name, if requested)
+        :param analysis_date: Branch analysis date
+        :param branch: Branch name (empty for the main branch)
+        :param pull_request: Pull request identifier
+        """
+        self.project = project
+        self.analysis_date = analysis_date
+        self.branch = branch
+        self.pull_request = pull_request
+
+    @property
+    def key(self) -> str:
+        """
+        :return: The project key
+        """
+        return quote(self.project.identifier, safe=":")
+
+    @property
+    def params(self) -> str:
+        """
+        :return: Search parameters selecting the branch
+        """
+        if self.branch:
+            return "&branch=" + quote(self.branch, safe="")
+        if self.pull_request:
+            return "&pullRequest=" + quote(self.pull_request, safe="")
+        return ""
+
+    def __str__(self) -> str:
+        if self.pull_request:
+            return "{} (pull request {})".format(self.project.identifier, self.pull_request)
+        if self.project.version:
+            return "{} (branch {})".format(self.project.identifier, self.project.version)
+        return self.project.identifier
+
+
+def fetch_pages(client: HttpClient, auth: Tuple[str, str], base_url: str,
+                key: str) -> Iterator[Tuple[requests.Response, List[Dict]]]:
+    """
+    Fetch the result pages of a search (no more than 10000 items).
+    :param client: HTTP client
+    :param auth: Authentication params
+    :param base_url: Search URL (without the page index)
+    :param key: Key of the items in the response body (e.g. issues)
+    :return: An iterator over responses and their items
+    """
+    page_index = 1  # Current page index
+    total = PAGE_SIZE  # Total number of items
+    # For each page (while total > max items fetched during the last iteration
+    # and no more than 10000 items have been requested)
+    while total >= (page_index - 1) * PAGE_SIZE and page_index * PAGE_SIZE <= MAX_RESULTS:
+        url = base_url + "&p=" + str(page_index)
+        logger.debug("Fetching %s from %s", key, url)
+        # Request
+        resp = client.get(url, auth=auth)
+        result = resp.json()
+        # Check response body
+        if "paging" not in result or key not in result:
+            raise LoadingError(("Server response is invalid "
+                                "('paging' and '{}' keys missing)").format(key))
+        total = result["paging"]["total"]
+        fetched_count = (page_index - 1) * PAGE_SIZE + len(result[key])
+        logger.debug("Fetched %d / %d %s", fetched_count, total, key)
+        yield resp, result[key]
+        page_index += 1  # Go to the next result page
+
+
+def prefetch(items: Iterator[T], size: int) -> Iterator[T]:
+    """
+    Start producing items in a background thread (e.g. result pages fetched while
+    previous ones are processed), up to a number of items ahead, and iterate over them.
+    Errors raised by the producer are raised again by the iteration,
+    the producer is stopped when the iteration is closed.
+    :param items: Items to produce
+    :param size: Maximum number of items produced ahead
+    :return: An iterator over items
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    end = object()
+
+    def put(entry: Tuple) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((end, None))
+        except Exception as ex:  # pylint: disable=broad-except
+            put((end, ex))
+
+    def consume():
+        try:
+            while True:
+                item, error = buffer.get()
+                if error is not None:
+                    raise error
+                if item is end:
+                    return
+                yield item
+        finally:
+            stopped.set()
+
+    threading.Thread(target=produce, name="reportmix-prefetch", daemon=True).start()
+    return consume()
+
+
+def iter_result(future) -> Iterator[Issue]:
+    """
+    Wait for issues loaded in the background and yield them.
+    :param future: Future list of issues
+    :return: An iterator over issues
+    """
+    yield from future.result()
+
+
+def map_issue(issue: Dict, rule: Dict[str, str], project: Project,
+              analysis_date: datetime, tool: Tool) -> Issue:
+    """
+    Map a SonarQube issue.
+    :param issue: SonarQube issue
+    :param rule: Issue rule (name and description, empty if unknown)
+    :param project: Project
+    :param analysis_date: Project analysis date
+    :param tool: Tool
+    :return: The issue
+    """
+    # Severity
+    if "severity" in issue and issue["severity"] in SONARQUBE_SEVERITIES:
+        severity = SONARQUBE_SEVERITIES[issue["severity"]]
+    else:
+        severity = SEVERITIES[0]
+    return Issue(
+        ref=issue["key"],
+        identifier=issue["rule"],
+        name=rule.get("name") or issue["rule"],
+        type=issue["type"],
+        category=issue["type"],
+        description=rule.get("description") or issue["message"],
+        more=", ".join(issue["tags"]),
+        action=issue["message"],
+        effort=issue["effort"] if "effort" in issue else "",
+        analysis_date=analysis_date,
+        severity=severity,
+        score="",
+        confidence="",
+        evidences=1,
+        source=issue["rule"],
+        source_date=parse_date(issue["creationDate"]),
+        url="",
+        tool=tool,
+        subject=map_subject(issue),
+        project=project
+    )
+
+
+def map_hotspot(hotspot: Dict, rule: Dict[str, str], project: Project,
+                analysis_date: datetime, tool: Tool) -> Issue:
+    """
+    Map a SonarQube security hotspot (the vulnerability probability
+    is used as the severity and the confidence).
+    :param hotspot: SonarQube security hotspot
+    :param rule: Hotspot rule (name and description, empty if unknown)
+    :param project: Project
+    :param analysis_date: Project analysis date
+    :param tool: Tool
+    :return: The issue
+    """
+    category = hotspot.get("securityCategory", "")
+    # The rule key is only returned by recent versions
+    identifier = hotspot.get("ruleKey") or category
+    return Issue(
+        ref=hotspot["key"],
+        identifier=identifier,
+        name=rule.get("name") or identifier,
+        type=HOTSPOT_TYPE,
+        category=category,
+        description=rule.get("description") or hotspot["message"],
+        more="",
+        action=hotspot["message"],
+        effort="",
+        analysis_date=analysis_date,
+        severity=hotspot_severity(hotspot),
+        score="",
+        confidence=hotspot.get("vulnerabilityProbability", ""),
+        evidences=1,
+        source=identifier,
+        source_date=parse_date(hotspot["creationDate"]),
+        url="",
+        tool=tool,
+        subject=map_subject(hotspot),
+        project=project
+    )
+
+
+def map_subject(item: Dict) -> Subject:
+    """
+    Map the component of a SonarQube issue or security hotspot.
+    :param item: SonarQube issue or security hotspot
+    :return: The subject
+    """
+    location = item["component"]
+    if "line" in item:
+        location += ":" + str(item["line"])
+    return Subject(
+        identifier=item["component"],
+        name=item["component"],
+        description="",
+        version="",
+        location=location,
+        license=""
+    )
+
+
+def hotspot_severity(hotspot: Dict) -> severities.Severity:
+    """
+    Get the severity of a security hotspot from its vulnerability probability.
+    :param hotspot: SonarQube security hotspot
+    :return: The severity (HIGH, MEDIUM or LOW)
+    """
+    return severities.guess(hotspot.get("vulnerabilityProbability", "")) or SEVERITIES[0]
+
+
+def severity_rank(issue: Issue) -> int:
+    """
+    Sort key of issues by decreasing severity.
+    :param issue: Issue
+    :return: The sort key
+    """
+    return -SEVERITIES.index(issue.severity)
+
+
+def split_list(value: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated list.
+    :param value: Comma-separated list
+    :return: Non-empty values
+    """
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+def is_pattern(value: str) -> bool:
+    """
+    Check if a value is a glob pattern.
+    :param value: Value
+    :return: true if the value contains a wildcard
+    """
+    return any(c in value for c in "*?[")
+
+
+def parse_date(value: str) -> datetime:
+    """
+    Parse a date returned by the SonarQube Web API (the timezone is ignored).
+    :param value: Date (e.g. 2021-06-01T12:00:00+0200)
+    :return: The date
+    """
+    return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+
+def html_to_text(value: str) -> str:
+    """
+    Convert a rule description (HTML) to plain text.
+    :param value: HTML description
+    :return: The text (tags removed and whitespaces collapsed)
+    """
+    return " ".join(html.unescape(re.sub(r"<[^>]+>", " ", value)).split())
+
+
+@lru_cache(maxsize=None)
+def get_session(host_url: str) -> requests.Session:
+    """
+    Get the HTTP session to a SonarQube server (only one session per server
+    and process to reuse connections across projects).
+    :param host_url: Server URL
+    :return: The HTTP session
+    """
+    logger.debug("Opening session to %s", host_url)
+    session = requests.Session()
+    # Keep a connection open for each concurrent request
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2 * POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(host_url: str, rate: float) -> RateLimiter:
+    """
+    Get the rate limiter of requests to a SonarQube server (shared by all requests
+    to the server in the process).
+    :param host_url: Server URL
+    :param rate: Maximum number of requests per second
+    :return: The rate limiter
+    """
+    return RateLimiter(rate)
+
+
+@lru_cache(maxsize=None)
+def get_rules_cache(host_url: str, file_path: Optional[str], ttl: float) -> MetadataCache:
+    """
+    Get the cache of rules of a SonarQube server (shared by all projects
+    in the process, and across runs if stored in a file).
+    :param host_url: Server URL
+    :param file_path: Path to the cache file (None to only cache rules in memory)
+    :param ttl: Time to live of cached rules in seconds
+    :return: The rules cache
+    """
+    logger.debug("Opening rules cache of %s (%s)", host_url, file_path or "in memory")
+    return MetadataCache(file_path, ttl)
 
 
 # SonarQube severities are a bit "excessive" so we define
@@ -7,8 +7,13 @@ Application main function and version.
 import logging
 import sys
 
-from reportmix.config.builder import ConfigBuilder
+from reportmix import json_backend
+from reportmix.batch import BatchMixer
+from reportmix.config.builder import ConfigBuilder, GLOBAL_CONFIG
+from reportmix.errors import GateError
 from reportmix.mixer import ReportMixer
+from reportmix.server import ReportServer
+from reportmix.watcher import ReportWatcher
 
 __version__ = "0.6.0"
 
@@ -20,14 +25,32 @@ def main():
 
     # Load configuration
     try:
-        config = ConfigBuilder(__version__).build()
+        builder = ConfigBuilder(__version__)
+        config = builder.build()
     except Exception as ex:
         logging.error(ex)
         sys.exit(1)
 
     # Merge reports
     try:
-        ReportMixer(config).merge()
+        global_config = config[GLOBAL_CONFIG]
+        # The JSON backend is selected once (worker processes use the same one)
+        json_backend.use(global_config["json_backend"])
+        if global_config["batch"]:
+            BatchMixer(builder, config).merge()
+        elif global_config["serve"]:
+            host, port = global_config["serve"].rsplit(":", 1)
+            ReportServer(config).serve(host, int(port))
+        elif float(global_config["watch"]) > 0:
+            ReportWatcher(ReportMixer(config), float(global_config["watch"]),
+                          float(global_config["watch_debounce"])).watch()
+        else:
+            ReportMixer(config).run()
+    except KeyboardInterrupt:
+        logging.info("Interrupted")
+    except GateError as ex:
+        logging.error(ex)
+        sys.exit(3)
     except Exception as ex:
         logging.error(ex)
         sys.exit(2)
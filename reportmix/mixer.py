@@ -2,22 +2,59 @@
 Main class.
 """
 
+import heapq
+import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from os import path
-from typing import Dict, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 
+from reportmix.cache import ReportCache
 from reportmix.config.builder import GLOBAL_CONFIG
-from reportmix.errors import LoadingError, AppError
+from reportmix.errors import GateError, LoadingError, AppError, SkippedError
+from reportmix.exporter import Exporter
 from reportmix.exporters.csv import CsvExporter
 from reportmix.exporters.html import HtmlExporter
 from reportmix.exporters.json import JsonExporter
+from reportmix.exporters.ndjson import NdjsonExporter
+from reportmix.grouping import GROUP_FIELDS, IssueGrouper, group_issues, parse_group_by
+from reportmix.loader import Loader
 from reportmix.loaders.dependency_check import DependencyCheckLoader
 from reportmix.loaders.npm_audit import NpmAuditLoader
 from reportmix.loaders.reportmix import ReportMixLoader
 from reportmix.loaders.sonarqube import SonarQubeLoader
-from reportmix.models.issue import FLAT_FIELDS, HASH_FIELDS, select_fields
+from reportmix.models.issue import FLAT_FIELDS, HASH_FIELDS, Issue, select_fields
 from reportmix.models.meta import Meta
 from reportmix.models.report import Report
+from reportmix.models.store import IssueStore, MemoryBudget
+from reportmix.models.tool import Tool
+from reportmix.nvd import Enricher, open_enricher
+from reportmix.profiler import Profiler
+from reportmix.sharding import Shard, split
+from reportmix.sorting import SortKey, is_prefix, parse_sort, sort_groups, sort_key
+from reportmix.summary import Summary, check_gate, parse_gate
+from reportmix.suppression import Suppressions, load_suppressions
+
+logger = logging.getLogger(__name__)
+
+# Available report loaders
+LOADERS: Dict[str, Type[Loader]] = {
+    "dependency_check": DependencyCheckLoader,
+    "npm_audit": NpmAuditLoader,
+    "sonarqube": SonarQubeLoader,
+    "reportmix": ReportMixLoader
+}
+
+# Available report exporters
+EXPORTERS: Dict[str, Type[Exporter]] = {
+    "csv": CsvExporter,
+    "json": JsonExporter,
+    "ndjson": NdjsonExporter,
+    "html": HtmlExporter
+}
 
 
 class ReportMixer:
@@ -25,79 +62,587 @@ class ReportMixer:
     Merge reports from multiple tools into one single file.
     """
 
-    def __init__(self, config: Dict[str, Union[str, Dict[str, str]]]):
+    def __init__(self, config: Dict[str, Union[str, Dict[str, str]]], update_nvd: bool = True):
         """
         Initialize the report mixer.
         :param config: Configuration
+        :param update_nvd: Update the NVD index (if enabled), False if it has already been
+        updated, e.g. before merging reports of multiple projects concurrently
         """
         self.config = config[GLOBAL_CONFIG]
         self.meta_config = config["meta"]
-        self.loaders = {
-            "dependency_check": DependencyCheckLoader(config["dependency_check"]),
-            "npm_audit": NpmAuditLoader(config["npm_audit"]),
-            "sonarqube": SonarQubeLoader(config["sonarqube"]),
-            "reportmix": ReportMixLoader(config["reportmix"])
-        }
-        self.exporters = {
-            "csv": CsvExporter(self.config),
-            "json": JsonExporter(self.config),
-            "html": HtmlExporter(self.config)
-        }
-
-    def merge(self) -> None:
+        self.loaders: Dict[str, Loader] = {name: loader(config[name])
+                                           for name, loader in LOADERS.items()}
+        self.exporters: Dict[str, Exporter] = {name: exporter(self.config)
+                                               for name, exporter in EXPORTERS.items()}
+        # Last report loaded by each loader
+        self.reports: Dict[str, Report] = {}
+        # Last merged report and its number of issues
+        self.report: Optional[Report] = None
+        self.count = 0
+        self.profiler = Profiler(bool(self.config["profile"]))
+        # Memory budget for loaded issues (spilled to disk beyond)
+        memory_limit = int(self.config["memory_limit"]) * 1024 * 1024
+        self.budget = MemoryBudget(memory_limit) if memory_limit else None
+        # Sort specification and key function
+        self.sort = parse_sort(self.config["sort"])
+        self.key = sort_key(self.sort) if self.sort else None
+        # Fields to group issues by (not grouped if empty)
+        self.group_by = parse_group_by(self.config["group_by"])
+        # Sharding (the merged report is split if a field or a maximum shard size is set)
+        self.shard_by = self.config["shard_by"]
+        if self.shard_by and self.shard_by not in FLAT_FIELDS:
+            raise AppError("Invalid shard field {}".format(self.shard_by))
+        self.shard_rows = int(self.config["shard_rows"])
+        self.shard_size = int(self.config["shard_size"]) * 1024 * 1024
+        self.sharded = bool(self.shard_by or self.shard_rows or self.shard_size)
+        if self.sharded and self.config["stream"] == "true":
+            raise AppError("Sharding is not supported in streaming mode")
+        # Quality gate and summary of the last merge (only if a quality gate is defined)
+        self.gate = parse_gate(self.config["fail_on"])
+        self.summary: Optional[Summary] = None
+        # Suppression rules (compiled once) and number of suppressed issues by loader
+        self.suppressions: Optional[Suppressions] = None
+        if self.config["suppression_file"]:
+            self.suppressions = load_suppressions(self.config["suppression_file"])
+        self.suppressed: Dict[str, int] = {}
+        # Errors of the last load by loader name (loaders skipped because they are not
+        # configured are not included), reported as quality gate failures
+        self.failures: Dict[str, str] = {}
+        # Enrichment of issues from the NVD feeds (index updated once per run)
+        self.enricher: Optional[Enricher] = None
+        if self.config["nvd_dir"]:
+            self.enricher = open_enricher(self.config["nvd_dir"], self.config["nvd_index"],
+                                          update_nvd)
+        # Cache of parsed report files (shared by loaders)
+        if self.config["cache_dir"]:
+            cache_size = int(self.config["cache_size"]) * 1024 * 1024
+            cache = ReportCache(self.config["cache_dir"], cache_size)
+            for loader in self.loaders.values():
+                loader.cache = cache
+
+    def run(self):
+        """
+        Merge reports (or only count issues in summary mode),
+        then check the quality gate (if defined).
+        """
+        if self.config["summary"] == "true":
+            self.summarize()
+        else:
+            self.merge()
+        if self.summary is not None:
+            for line in self.summary.table():
+                logger.info(line)
+        if self.gate:
+            failures = ["{} report not loaded ({})".format(name, self.failures[name])
+                        for name in self.loaders if name in self.failures]
+            failures += check_gate(self.summary, self.gate)
+            if failures:
+                raise GateError("Quality gate failed: {}".format(", ".join(failures)))
+            logger.info("Quality gate passed")
+
+    def summarize(self) -> Summary:
+        """
+        Count issues from all loaders by tool, severity and type, without merging
+        and exporting them (loaders count issues natively when they can, unless
+        suppression rules or the NVD enrichment are enabled).
+        :return: The issues summary
+        """
+        self.profiler.reset()
+        summary = Summary()
+        hash_fields = select_fields(self.config["hash"] or HASH_FIELDS)
+        with self.profiler.stage("summary"):
+            for name, loader in self.loaders.items():
+                logger.info("Counting issues from %s report", name)
+                self.failures.pop(name, None)
+                with self.profiler.stage(name):
+                    try:
+                        if self.suppressions is None and self.enricher is None:
+                            summary.update(loader.count())
+                        else:
+                            # Suppression rules and enrichment are applied to loaded issues
+                            for issue in self._prepare_all(name, loader.iter_issues(),
+                                                           hash_fields):
+                                summary.add_issue(issue)
+                            for tool in loader.tools:
+                                summary.add_tool(tool.identifier)
+                    except LoadingError as err:
+                        self._failed(name, err)
+        self.summary = summary
+        self.count = sum(summary.totals.values())
+        logger.info("Counted %d issue(s) from %d tools(s)", self.count, len(summary.totals))
+        self._log_suppressions()
+        self._profile()
+        return summary
+
+    def merge(self, names: Iterable[str] = None, export: bool = True) -> Report:
         """
         Load and merge all available reports.
+        :param names: Names of the loaders to run again (default: all loaders),
+        other loaders reuse the report they previously loaded (streaming mode:
+        all loaders are run again)
+        :param export: Export the merged report (always exported in streaming mode)
+        :return: Merged report (streaming mode: without issues)
+        """
+        self.profiler.reset()
+        if self.report is not None:
+            self._close(self.report.issues)
+        self.summary = Summary() if self.gate else None
+        with self.profiler.stage("merge"):
+            if self.config["stream"] == "true":
+                # Load, merge and export one issue at a time
+                report = self._stream()
+            else:
+                # Load and merge
+                report = self._load(names)
+                self.count = len(report.issues)
+                if not report.issues:
+                    logger.warning("No issue has been loaded, report(s) will be empty")
+                # Export
+                if export:
+                    self._export(report)
+            self.report = report
+            if self.summary is not None:
+                for tool in report.tools:
+                    self.summary.add_tool(tool.identifier)
+        self._log_suppressions()
+        self._profile()
+        return report
+
+    def _log_suppressions(self):
+        """
+        Log the number of suppressed issues and unused suppression rules (if any).
         """
-        # Load and merge
-        report = self._load()
-        if not report.issues:
-            logging.warning("No issue has been loaded, report(s) will be empty")
-        # Export
-        self._export(report)
+        if self.suppressions is None:
+            return
+        logger.info("Suppressed %d issue(s) in total", sum(self.suppressed.values()))
+        unused = self.suppressions.unused()
+        if unused:
+            logger.info("%d suppression rule(s) never matched an issue (lines: %s)", len(unused),
+                        ", ".join(str(r.line) for r in unused))
 
-    def _load(self) -> Report:
+    def _profile(self):
+        """
+        Log and export the profile of the last run (if enabled).
+        """
+        if self.profiler.enabled:
+            self.profiler.log()
+        if self.config["profile"] == "json":
+            profile_file_path = path.join(path.realpath(self.config["output_dir"]),
+                                          "reportmix-profile.json")
+            self.profiler.write(profile_file_path)
+            logger.info("Profile exported: %s", profile_file_path)
+
+    def _load(self, names: Iterable[str] = None) -> Report:
         """
         Load and merge issues from all loaders.
         Set metadata fields from configuration.
+        :param names: Names of the loaders to run again (default: all loaders)
         :return: Loaded issues
         """
-        # Load and merge
-        report = Report([], [])
-        logging.info("Merge reports: %s", ", ".join(self.loaders.keys()))
-        for name, loader in self.loaders.items():
-            logging.info("Loading %s report", name)
-            try:
-                report.extend(loader.load())
-            except LoadingError as err:
-                logging.warning("%s report not loaded: %s", name, err)
-        logging.info("Loaded %d issue(s) from %d tools(s)", len(report.issues), len(report.tools))
-        # Set metadata fields
+        # Load and set metadata fields (once per loaded report)
+        names = set(self.loaders.keys() if names is None else names)
+        names = [n for n in self.loaders if n in names or n not in self.reports]
+        if names:
+            logger.info("Load reports: %s", ", ".join(names))
         hash_fields = select_fields(self.config["hash"] or HASH_FIELDS)
-        for issue in report.issues:
-            issue.meta = Meta(self.meta_config["product"], self.meta_config["version"],
-                              self.meta_config["organization"], self.meta_config["client"],
-                              self.meta_config["audit_date"])
-            issue.hash = issue.compute_hash(hash_fields)
+        with self.profiler.stage("load"):
+            for name in names:
+                logger.info("Loading %s report", name)
+                with self.profiler.stage(name):
+                    try:
+                        self._load_report(name, hash_fields)
+                    except LoadingError as err:
+                        if name in self.reports:
+                            self._failed(name, err, len(self.reports[name].issues))
+                        else:
+                            self._failed(name, err)
+                            self.set_report(name, Report([], []))
+        # Merge
+        with self.profiler.stage("merge"):
+            report = Report(self._issues(key=self.key), [])
+            for name in self.loaders:
+                report.issues.extend(self.reports[name].issues)
+                report.tools.extend(self.reports[name].tools)
+        logger.info("Loaded %d issue(s) from %d tools(s)", len(report.issues), len(report.tools))
+        # Count issues for the quality gate (before grouping, as in summary mode)
+        if self.summary is not None:
+            for issue in report.issues:
+                self.summary.add_issue(issue)
+        # Group (aggregated issues are sorted)
+        if self.group_by:
+            with self.profiler.stage("group"):
+                issues = group_issues(report.issues, self.group_by, self.key)
+                self._close(report.issues)
+                report = Report(self._issues(issues), report.tools)
+            logger.info("Grouped issues into %d group(s)", len(report.issues))
+        # Sort (issue stores are sorted when spilled and iterated)
+        elif self.key is not None and isinstance(report.issues, list):
+            with self.profiler.stage("sort"):
+                report.issues.sort(key=self.key)
         return report
 
-    def _export(self, report: Report):
+    def _load_report(self, name: str, hash_fields: List[str]):
         """
-        Export a list of issues to a report file.
-        :param report: Report with issues to export
+        Load the report of a loader, set metadata fields and keep it for next merges.
+        Issues are streamed from the loader to the list of issues (spilled to disk when
+        the memory budget is exceeded) without building the full report first.
+        Issues loaded before a loading error are kept (the error is raised again).
+        :param name: Loader name
+        :param hash_fields: Fields to use for hash generation
+        """
+        if name in self.reports:
+            self._close(self.reports.pop(name).issues)
+        self.failures.pop(name, None)
+        loader = self.loaders[name]
+        issues = self._issues()
+        tools: Dict[Tuple[str, str, str], Tool] = {}
+        try:
+            issues.extend(self._prepare_all(name, track_tools(loader.iter_issues(), tools),
+                                            hash_fields))
+        except LoadingError:
+            if not issues:
+                self._close(issues)
+                raise
+            # Keep issues loaded before the error (as in streaming mode)
+            self.reports[name] = Report(issues, list(tools.values()))
+            raise
+        self.reports[name] = Report(issues, loader.tools)
+
+    def set_report(self, name: str, report: Report, hash_fields: List[str] = None):
+        """
+        Set metadata fields of a loaded report and keep it for next merges.
+        :param name: Loader name
+        :param report: Loaded report
+        :param hash_fields: Fields to use for hash generation (default: from configuration)
+        """
+        if hash_fields is None:
+            hash_fields = select_fields(self.config["hash"] or HASH_FIELDS)
+        if name in self.reports:
+            self._close(self.reports[name].issues)
+        issues = self._prepare_all(name, report.issues, hash_fields)
+        self.reports[name] = Report(self._issues(issues), report.tools)
+
+    def _stream(self) -> Report:
+        """
+        Load issues from all loaders, set metadata fields and export them
+        one at a time, without keeping them in memory (except for exporters
+        that need all issues, e.g. HTML).
+        :return: Merged report without issues
+        """
+        outputs, fields = self._outputs()
+        buffers = [self._issues() for _ in outputs]
+        report = Report([], [])
+        # Formats of the output files opened and not closed yet
+        opened = []
+        try:
+            for (output_format, output_file_path), buffer in zip(outputs, buffers):
+                self.exporters[output_format].open(output_file_path, fields, buffer)
+                opened.append(output_format)
+            self.count = 0
+            hash_fields = select_fields(self.config["hash"] or HASH_FIELDS)
+            with self.profiler.stage("stream"):
+                loaded: Dict[str, List[Tool]] = {}
+                if self.group_by:
+                    # Group issues (only groups are kept in memory), then export groups
+                    grouper = IssueGrouper(self.group_by)
+                    for name in self.loaders:
+                        with self.profiler.stage(name):
+                            for issue in self._iter_issues(name, hash_fields, loaded):
+                                grouper.add(issue)
+                    logger.info("Grouped %d issue(s) into %d group(s)",
+                                grouper.count, len(grouper.groups))
+                    for issue in grouper.issues(self.key):
+                        self._write(outputs, issue)
+                elif self.key is None:
+                    for name in self.loaders:
+                        with self.profiler.stage(name):
+                            for issue in self._iter_issues(name, hash_fields, loaded):
+                                self._write(outputs, issue)
+                else:
+                    # Sort issues from each loader (only by group of issues if they are
+                    # already partially sorted), then merge sorted streams (k-way merge)
+                    streams = []
+                    for name, loader in self.loaders.items():
+                        issues = self._iter_issues(name, hash_fields, loaded)
+                        if is_prefix(loader.sorted_by, self.sort):
+                            streams.append(sort_groups(issues, loader.sorted_by, self.sort))
+                        else:
+                            buffers.append(self._issues(issues, self.key))
+                            if isinstance(buffers[-1], list):
+                                buffers[-1].sort(key=self.key)
+                            streams.append(buffers[-1])
+                    for issue in heapq.merge(*streams, key=self.key):
+                        self._write(outputs, issue)
+                for name in self.loaders:
+                    report.tools.extend(loaded.get(name, []))
+                logger.info("Loaded %d issue(s) from %d tools(s)",
+                            self.count, len(report.tools))
+                if self.count == 0:
+                    logger.warning("No issue has been loaded, report(s) will be empty")
+                for output_format, output_file_path in outputs:
+                    opened.remove(output_format)
+                    with self.profiler.stage("export_" + output_format):
+                        self.exporters[output_format].close(report.tools)
+                    logger.info("Merged report exported: %s", output_file_path)
+        finally:
+            # Release output files left open by a failure
+            for output_format in opened:
+                try:
+                    self.exporters[output_format].close(report.tools)
+                except (AppError, OSError) as err:
+                    logger.debug("Failed to close the %s output file: %s", output_format, err)
+            for buffer in buffers:
+                self._close(buffer)
+        return report
+
+    def _iter_issues(self, name: str, hash_fields: List[str],
+                     loaded: Dict[str, List[Tool]]) -> Iterator[Issue]:
+        """
+        Load issues from a loader and set metadata fields, one at a time.
+        Issues yielded before a loading error are kept (the report is partially loaded).
+        :param name: Loader name
+        :param hash_fields: Fields to use for hash generation
+        :param loaded: Tools involved by loader name (set once the loader is done)
+        :return: An iterator over loaded issues
+        """
+        logger.info("Loading %s report", name)
+        self.failures.pop(name, None)
+        loader = self.loaders[name]
+        tools: Dict[Tuple[str, str, str], Tool] = {}
+        count = 0
+        try:
+            for issue in self._prepare_all(name, track_tools(loader.iter_issues(), tools),
+                                           hash_fields):
+                count += 1
+                if self.summary is not None:
+                    # Counted before grouping (as in summary mode)
+                    self.summary.add_issue(issue)
+                yield issue
+            loaded[name] = loader.tools
+        except LoadingError as err:
+            self._failed(name, err, count)
+            loaded[name] = list(tools.values())
+
+    def _failed(self, name: str, err: LoadingError, count: int = 0):
+        """
+        Log a loading error of a report and keep it for the quality gate
+        (unless the loader is skipped because it is not configured).
+        :param name: Loader name
+        :param err: Loading error
+        :param count: Number of issues loaded before the error (kept in the output)
+        """
+        if not isinstance(err, SkippedError):
+            self.failures[name] = str(err)
+        if count:
+            logger.warning("%s report partially loaded (%d issue(s), output is incomplete): %s",
+                           name, count, err)
+        else:
+            logger.warning("%s report not loaded: %s", name, err)
+
+    def _write(self, outputs: List[Tuple[str, str]], issue: Issue):
+        """
+        Write an issue to all output files (streaming mode).
+        :param outputs: Format and path of each output file
+        :param issue: Issue to write
+        """
+        for output_format, _ in outputs:
+            self.exporters[output_format].write(issue)
+        self.count += 1
+
+    def _prepare_all(self, name: str, issues: Iterable[Issue],
+                     hash_fields: List[str]) -> Iterator[Issue]:
+        """
+        Fill missing fields from the NVD feeds (if enabled), set metadata fields (from
+        configuration) and the hash of issues from a loader, one at a time, and drop
+        suppressed issues. The hash and metadata fields of issues
+        reloaded from a previous merged report are kept (hashes are recomputed only if the
+        loader "verify" property is enabled).
+        :param name: Loader name
+        :param issues: Loaded issues
+        :param hash_fields: Fields to use for hash generation
+        :return: An iterator over issues
+        """
+        verify = self.loaders[name].config.get("verify") == "true"
+        suppressions = self.suppressions
+        invalid = suppressed = 0
+        if self.enricher is not None:
+            enriched = self.enricher.count
+            issues = self.enricher.enrich(issues)
+        # Measured issue by issue (interleaved with loading), accumulated across loaders
+        stage = partial(self.profiler.stage, "meta_hash", True) \
+            if self.profiler.enabled else nullcontext
+        for issue in issues:
+            with stage():
+                if issue.hash is None:
+                    self._prepare(issue, hash_fields)
+                else:
+                    if issue.meta is None:
+                        issue.meta = self._meta()
+                    if verify:
+                        computed_hash = issue.compute_hash(hash_fields)
+                        if computed_hash != issue.hash:
+                            issue.hash = computed_hash
+                            invalid += 1
+                if suppressions is not None and suppressions.match(issue) is not None:
+                    suppressed += 1
+                    continue
+            yield issue
+        if invalid > 0:
+            logger.warning("%d issue(s) with an invalid hash in %s report (hash replaced)",
+                           invalid, name)
+        if self.enricher is not None:
+            logger.info("Enriched %d issue(s) from %s report with NVD data",
+                        self.enricher.count - enriched, name)
+        if suppressions is not None:
+            self.suppressed[name] = suppressed
+            logger.info("Suppressed %d issue(s) from %s report", suppressed, name)
+
+    def _prepare(self, issue: Issue, hash_fields: List[str]) -> Issue:
+        """
+        Set metadata fields (from configuration) and the hash of an issue.
+        :param issue: Loaded issue
+        :param hash_fields: Fields to use for hash generation
+        :return: The issue
+        """
+        issue.meta = self._meta()
+        issue.hash = issue.compute_hash(hash_fields)
+        return issue
+
+    def _meta(self) -> Meta:
+        """
+        Create metadata fields from configuration.
+        :return: Metadata
+        """
+        return Meta(self.meta_config["product"], self.meta_config["version"],
+                    self.meta_config["organization"], self.meta_config["client"],
+                    self.meta_config["audit_date"])
+
+    def _outputs(self) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+        Get output files and fields to export.
+        :return: Format and path of each output file, and fields to include
         """
         # File
         output_dir: str = path.realpath(self.config["output_dir"])
         if not path.exists(output_dir) or not path.isdir(output_dir):
             raise AppError("Invalid output directory {}".format(output_dir))
 
-        # Fields (intersection between all fields and selected fields)
-        only_fields = self.config["fields"].lower()
-        fields = FLAT_FIELDS if only_fields == "all" else select_fields(only_fields)
-
-        # Exporter
-        for output_format in self.config["formats"].split(","):
-            output_file_path = path.join(output_dir, "reportmix." + output_format)
-            logging.debug("Exporting merged report (format: %s, fields: [%s])",
-                          output_format, ", ".join(fields))
-            self.exporters[output_format].export(report, output_file_path, fields)
-            logging.info("Merged report exported: %s", output_file_path)
+        outputs = [(output_format, path.join(output_dir, "reportmix." + output_format))
+                   for output_format in self.config["formats"].split(",")]
+        return outputs, export_fields(self.config["fields"], bool(self.group_by))
+
+    def _export(self, report: Report):
+        """
+        Export a list of issues to a report file.
+        :param report: Report with issues to export
+        """
+        outputs, fields = self._outputs()
+        if self.sharded:
+            self._export_shards(report, outputs, fields)
+            return
+        for output_format, output_file_path in outputs:
+            logger.debug("Exporting merged report (format: %s, fields: [%s])",
+                         output_format, ", ".join(fields))
+            with self.profiler.stage("export_" + output_format):
+                self.exporters[output_format].export(report, output_file_path, fields)
+            logger.info("Merged report exported: %s", output_file_path)
+
+    def _export_shards(self, report: Report, outputs: List[Tuple[str, str]], fields: List[str]):
+        """
+        Split issues into shards, export shards to report files concurrently (one file
+        per shard and format), then write the index of shards (reportmix-index.json).
+        :param report: Report with issues to export
+        :param outputs: Format and path of each output file (not split)
+        :param fields: Fields to include
+        """
+        output_dir = path.dirname(outputs[0][1])
+        formats = [output_format for output_format, _ in outputs]
+        with self.profiler.stage("shard"):
+            shards = split(report.issues, self.shard_by, self.shard_rows, self.shard_size,
+                           fields, self._issues)
+        logger.info("Split the merged report into %d shard(s)", len(shards))
+        jobs = int(self.config["jobs"]) or os.cpu_count() or 1
+        with self.profiler.stage("export"), ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(self._export_shard, shard, output_format, output_dir,
+                                       fields, report.tools)
+                       for shard in shards for output_format in formats]
+            for future in futures:
+                future.result()
+        for shard in shards:
+            self._close(shard.issues)
+        index_file_path = path.join(output_dir, "reportmix-index.json")
+        with open(index_file_path, "w", encoding="utf-8") as index_file:
+            json.dump({"field": self.shard_by, "count": sum(s.count for s in shards),
+                       "shards": [s.to_dict(formats) for s in shards]}, index_file, indent=2)
+        logger.info("Merged report exported: %s", index_file_path)
+
+    def _export_shard(self, shard: Shard, output_format: str, output_dir: str,
+                      fields: List[str], tools: List[Tool]):
+        """
+        Export a shard to a report file (run in a worker thread).
+        :param shard: Shard to export
+        :param output_format: Output format
+        :param output_dir: Output directory
+        :param fields: Fields to include
+        :param tools: Tools involved in the merged report
+        """
+        output_file_path = path.join(output_dir, shard.name + "." + output_format)
+        report = Report(shard.issues, [t for t in tools if t.identifier in shard.tools])
+        EXPORTERS[output_format](self.config).export(report, output_file_path, fields)
+        logger.debug("Shard exported: %s", output_file_path)
+
+    def _issues(self, issues: Iterable[Issue] = (),
+                key: SortKey = None) -> Union[List[Issue], IssueStore]:
+        """
+        Create a list of issues, spilled to disk when the memory budget is exceeded.
+        :param issues: Initial issues
+        :param key: Sort key function of the issue store (lists are not sorted)
+        :return: A list (no memory limit) or an issue store
+        """
+        if self.budget is None:
+            return list(issues)
+        return IssueStore(self.budget, issues, key)
+
+    @staticmethod
+    def _close(issues: Union[List[Issue], IssueStore]):
+        """
+        Release the temporary file used by a list of issues (if any).
+        :param issues: List of issues
+        """
+        if isinstance(issues, IssueStore):
+            issues.close()
+
+
+def track_tools(issues: Iterable[Issue],
+                tools: Dict[Tuple[str, str, str], Tool]) -> Iterator[Issue]:
+    """
+    Collect the tools involved in issues while they are loaded (used when
+    a loader fails before the list of tools of its report is available).
+    :param issues: Loaded issues
+    :param tools: Tools by identifier, name and version (updated)
+    :return: An iterator over issues
+    """
+    for issue in issues:
+        if issue.tool is not None:
+            tools.setdefault((issue.tool.identifier, issue.tool.name, issue.tool.version),
+                             issue.tool)
+        yield issue
+
+
+def export_fields(spec: str, grouped: bool = False) -> List[str]:
+    """
+    Get fields to export.
+    :param spec: Comma-separated list of fields (or "all")
+    :param grouped: true if issues are grouped (fields of aggregated issues can be exported)
+    :return: Intersection between all fields and selected fields
+    """
+    only_fields = spec.lower()
+    if not grouped:
+        return FLAT_FIELDS if only_fields == "all" else select_fields(only_fields)
+    all_fields = list(FLAT_FIELDS)
+    position = all_fields.index("evidences") + 1
+    all_fields[position:position] = GROUP_FIELDS
+    if only_fields == "all":
+        return all_fields
+    return [f for f in (f.strip() for f in only_fields.split(",")) if f in all_fields]
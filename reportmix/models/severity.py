@@ -25,6 +25,10 @@ class Severity:
     def __repr__(self) -> str:
         return "'" + self.identifier + "'"
 
+    def __reduce__(self):
+        # Severities are compared by identity: unpickle them as the existing constants
+        return from_identifier, (self.identifier,)
+
 
 #
 # Constants
@@ -0,0 +1,237 @@
+"""
+Issue store model.
+"""
+
+import heapq
+import itertools
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from reportmix.models.issue import Issue
+
+# Number of issues whose size is measured to estimate the average size of an issue
+SAMPLE_SIZE = 100
+
+# Maximum number of issues serialized together in a temporary file
+BLOCK_SIZE = 1000
+
+# Maximum number of sorted runs merged at once (blocks are sized so that
+# one block of each merged run fits in the memory budget)
+MERGE_WAYS = 16
+
+
+class MemoryBudget:
+    """
+    Memory budget shared by issue stores.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the memory budget.
+        :param limit: Maximum memory used by issues kept in memory (in bytes)
+        """
+        self.limit = limit
+        self.used = 0
+        self.stores: List["IssueStore"] = []
+
+    def allocate(self, size: int):
+        """
+        Allocate memory, spill the largest stores to disk when the budget is exceeded
+        (until the used memory is back under the budget).
+        :param size: Allocated memory (in bytes)
+        """
+        self.used += size
+        if self.used > self.limit:
+            for store in sorted(self.stores, key=lambda s: s.buffer_size, reverse=True):
+                store.spill()
+                if self.used <= self.limit:
+                    break
+
+
+class IssueStore:
+    """
+    A list of issues kept in memory up to a memory budget,
+    then spilled to a temporary file in runs of serialized blocks.
+    Issues are read back from disk on iteration: changes made to
+    yielded issues are not saved.
+    With a sort key, each run is sorted before being spilled and runs
+    are merged on iteration (external merge sort, in multiple passes
+    if there are too many runs to merge them at once).
+    Concurrent iterations (e.g. from multiple threads) are supported.
+    """
+
+    def __init__(self, budget: MemoryBudget, issues: Iterable[Issue] = (),
+                 key: Optional[Callable[[Issue], Tuple]] = None):
+        """
+        Initialize the issue store.
+        :param budget: Memory budget shared with other stores
+        :param issues: Initial issues
+        :param key: Sort key function (default: keep insertion order)
+        """
+        self.budget = budget
+        self.key = key
+        self.buffer: List[Issue] = []
+        self.buffer_size = 0
+        # Offset and length of each block of each run in the file
+        self.runs: List[List[Tuple[int, int]]] = []
+        self.file = None
+        # Lock on the file position (only used if positional reads are not available)
+        self.lock = threading.Lock()
+        # Lock on runs merging
+        self.merge_lock = threading.Lock()
+        self.count = 0
+        self.sampled_size = 0
+        budget.stores.append(self)
+        self.extend(issues)
+
+    def append(self, issue: Issue):
+        """
+        Add an issue to the store.
+        :param issue: Issue to add
+        """
+        self.buffer.append(issue)
+        self.count += 1
+        if self.count <= SAMPLE_SIZE:
+            size = estimate_size(issue)
+            self.sampled_size += size
+        else:
+            size = self.sampled_size // SAMPLE_SIZE
+        self.buffer_size += size
+        self.budget.allocate(size)
+
+    def extend(self, issues: Iterable[Issue]):
+        """
+        Add issues to the store.
+        :param issues: Issues to add
+        """
+        for issue in issues:
+            self.append(issue)
+
+    def spill(self):
+        """
+        Write issues kept in memory to the temporary file.
+        """
+        if not self.buffer:
+            return
+        if self.file is None:
+            self.file = tempfile.TemporaryFile(prefix="reportmix-")
+        issues = sorted(self.buffer, key=self.key) if self.key else self.buffer
+        self.runs.append(self._write(issues))
+        # Replace the buffer instead of clearing it (may be used by a running iteration)
+        self.buffer = []
+        self.budget.used -= self.buffer_size
+        self.buffer_size = 0
+
+    def close(self):
+        """
+        Remove all issues and delete the temporary file.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.budget.used -= self.buffer_size
+        self.buffer, self.buffer_size, self.runs, self.count = [], 0, [], 0
+        if self in self.budget.stores:
+            self.budget.stores.remove(self)
+
+    def __iter__(self) -> Iterator[Issue]:
+        if self.key is not None and len(self.runs) >= MERGE_WAYS:
+            self._merge_runs()
+        runs, buffer = [self._read(run) for run in self.runs], self.buffer
+        if self.key is None:
+            for run in runs:
+                yield from run
+            yield from buffer
+        else:
+            yield from heapq.merge(*runs, sorted(buffer, key=self.key), key=self.key)
+
+    def _merge_runs(self):
+        """
+        Merge sorted runs into larger ones, MERGE_WAYS runs at a time, until they can be
+        merged at once with the buffer (runs are appended to the file, previous ones are
+        left unchanged for running iterations).
+        """
+        with self.merge_lock:
+            while len(self.runs) >= MERGE_WAYS:
+                self.runs = [self._write(heapq.merge(*map(self._read, group), key=self.key))
+                             for group in (self.runs[i:i + MERGE_WAYS]
+                                           for i in range(0, len(self.runs), MERGE_WAYS))]
+
+    def _block_size(self) -> int:
+        """
+        Compute the number of issues to serialize together, for one block
+        of each of MERGE_WAYS runs to fit in the memory budget.
+        :return: Number of issues per block
+        """
+        sampled = min(self.count, SAMPLE_SIZE)
+        if not sampled or not self.sampled_size:
+            return BLOCK_SIZE
+        issue_size = self.sampled_size / sampled
+        return max(1, min(BLOCK_SIZE, int(self.budget.limit / MERGE_WAYS / issue_size)))
+
+    def _write(self, issues: Iterable[Issue]) -> List[Tuple[int, int]]:
+        """
+        Write a run of issues to the temporary file, in blocks.
+        :param issues: Issues of the run
+        :return: Offset and length of each block of the run
+        """
+        run, block_size, issues = [], self._block_size(), iter(issues)
+        while True:
+            block = list(itertools.islice(issues, block_size))
+            if not block:
+                break
+            data = pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL)
+            with self.lock:
+                self.file.seek(0, 2)
+                run.append((self.file.tell(), len(data)))
+                self.file.write(data)
+                self.file.flush()
+        return run
+
+    def _read(self, run: List[Tuple[int, int]]) -> Iterator[Issue]:
+        """
+        Read the issues of a run from the temporary file, one block at a time.
+        :param run: Offset and length of each block of the run
+        :return: An iterator over the issues of the run
+        """
+        for offset, length in run:
+            yield from pickle.loads(self._read_block(offset, length))
+
+    def _read_block(self, offset: int, length: int) -> bytes:
+        """
+        Read a block from the temporary file without sharing the file position
+        between concurrent iterations (positional read, or seek and read under a lock).
+        :param offset: Offset of the block in the file
+        :param length: Length of the block
+        :return: Serialized block
+        """
+        if hasattr(os, "pread"):
+            return os.pread(self.file.fileno(), length, offset)
+        with self.lock:
+            self.file.seek(offset)
+            return self.file.read(length)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+
+def estimate_size(issue: Issue) -> int:
+    """
+    Estimate the memory used by an issue and its sub-objects.
+    :param issue: Issue
+    :return: Estimated size in bytes
+    """
+    size = 0
+    for obj in (issue, issue.tool, issue.subject, issue.project, issue.meta):
+        if obj is not None:
+            size += sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+            size += sum(sys.getsizeof(v) for v in vars(obj).values()
+                        if isinstance(v, (str, int)))
+    return size
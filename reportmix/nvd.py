@@ -0,0 +1,286 @@
+"""
+Offline enrichment of issues from a local mirror of the NVD JSON feeds
+(indexed once in a SQLite database, then updated incrementally).
+"""
+
+import glob
+import gzip
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import islice
+from os import path
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from reportmix import json_backend
+from reportmix.errors import AppError
+from reportmix.models import severity
+from reportmix.models.issue import Issue
+from reportmix.models.severity import SEVERITIES
+
+logger = logging.getLogger(__name__)
+
+# Version of the index schema (change it to rebuild existing indexes)
+SCHEMA_VERSION = 1
+
+# Feed files (e.g. nvdcve-1.1-2021.json.gz, nvdcve-1.1-modified.json)
+FEED_PATTERNS = ["*.json", "*.json.gz"]
+
+# CVE identifier
+CVE_PATTERN = re.compile(r"CVE-\d{4}-\d{4,}")
+
+# Number of issues (and CVE identifiers) looked up at once
+BATCH_SIZE = 500
+
+# A CVE entry: score, severity, category and publication date
+Entry = Tuple[str, str, str, str]
+
+
+class NvdIndex:
+    """
+    CVE entries (score, severity, weaknesses and publication date)
+    from NVD JSON feeds, indexed by identifier in a SQLite database.
+    """
+
+    def __init__(self, database: str, read_only: bool = False):
+        """
+        Open (or create) the index.
+        :param database: Path to the SQLite database file
+        :param read_only: Open an existing index in read-only mode (e.g. in worker
+        processes, once the index has been updated by the parent process)
+        """
+        self.database = database
+        # The connection is shared by threads (e.g. projects merged in server mode)
+        self.lock = threading.Lock()
+        try:
+            if read_only:
+                uri = Path(database).resolve().as_uri() + "?mode=ro"
+                self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            else:
+                self.connection = sqlite3.connect(database, check_same_thread=False)
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if read_only and version != SCHEMA_VERSION:
+                raise AppError("NVD index {} is not up-to-date".format(database))
+            if version != SCHEMA_VERSION:
+                self.connection.executescript("""
+                    DROP TABLE IF EXISTS cves;
+                    DROP TABLE IF EXISTS feeds;
+                    CREATE TABLE cves (id TEXT PRIMARY KEY, score TEXT, severity TEXT,
+                                       category TEXT, published TEXT, modified TEXT);
+                    CREATE TABLE feeds (name TEXT PRIMARY KEY, size INTEGER, mtime INTEGER);
+                    PRAGMA user_version = {};
+                """.format(SCHEMA_VERSION))
+        except sqlite3.Error as ex:
+            raise AppError("Failed to open the NVD index {}: {}".format(database, ex)) from ex
+
+    def update(self, feed_dir: str) -> int:
+        """
+        Index new and changed feed files (files are identified by name,
+        size and modification time). An entry is only replaced by a more
+        recent one (e.g. from the modified feed).
+        :param feed_dir: Path to the directory of the feed files
+        :return: Number of indexed feed files
+        """
+        if not path.isdir(feed_dir):
+            raise AppError("Invalid NVD feeds directory {}".format(feed_dir))
+        feeds = sorted({f for p in FEED_PATTERNS for f in glob.glob(path.join(feed_dir, p))})
+        indexed = dict((name, (size, mtime)) for name, size, mtime
+                       in self.connection.execute("SELECT name, size, mtime FROM feeds"))
+        count = 0
+        for feed in feeds:
+            stat = os.stat(feed)
+            fingerprint = (stat.st_size, stat.st_mtime_ns)
+            name = path.basename(feed)
+            if indexed.get(name) == fingerprint:
+                continue
+            logger.info("Indexing NVD feed %s", name)
+            try:
+                with self.connection:
+                    self.connection.executemany("""
+                        INSERT INTO cves VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (id) DO UPDATE SET score = excluded.score,
+                            severity = excluded.severity, category = excluded.category,
+                            published = excluded.published, modified = excluded.modified
+                        WHERE excluded.modified >= cves.modified
+                    """, iter_entries(load_feed(feed)))
+                    self.connection.execute("INSERT OR REPLACE INTO feeds VALUES (?, ?, ?)",
+                                            (name, *fingerprint))
+            except (OSError, ValueError, KeyError, TypeError, sqlite3.Error) as ex:
+                raise AppError("Failed to index the NVD feed {}: {}".format(feed, ex)) from ex
+            count += 1
+        return count
+
+    def lookup(self, identifiers: Iterable[str]) -> Dict[str, Entry]:
+        """
+        Get CVE entries.
+        :param identifiers: CVE identifiers
+        :return: Entries by identifier (missing CVE are not included)
+        """
+        entries = {}
+        identifiers = iter(set(identifiers))
+        while True:
+            chunk = list(islice(identifiers, BATCH_SIZE))
+            if not chunk:
+                return entries
+            with self.lock:
+                rows = self.connection.execute(
+                    "SELECT id, score, severity, category, published FROM cves "
+                    "WHERE id IN ({})".format(",".join("?" * len(chunk))), chunk).fetchall()
+            for row in rows:
+                entries[row[0]] = row[1:]
+
+    def close(self):
+        """
+        Close the index.
+        """
+        self.connection.close()
+
+
+class Enricher:
+    """
+    Fill missing score, severity, category and source date of issues
+    from the NVD index (by CVE identifier).
+    """
+
+    def __init__(self, index: NvdIndex):
+        """
+        Initialize the enricher.
+        :param index: NVD index
+        """
+        self.index = index
+        # Number of enriched issues
+        self.count = 0
+
+    def enrich(self, issues: Iterable[Issue]) -> Iterator[Issue]:
+        """
+        Enrich issues one at a time (CVE are looked up by batch of issues).
+        :param issues: Issues
+        :return: An iterator over issues
+        """
+        issues = iter(issues)
+        while True:
+            batch = list(islice(issues, BATCH_SIZE))
+            if not batch:
+                return
+            cves = [cve_identifier(i) if is_incomplete(i) else None for i in batch]
+            entries = self.index.lookup(c for c in cves if c)
+            for issue, cve in zip(batch, cves):
+                entry = entries.get(cve) if cve else None
+                if entry is not None:
+                    fill(issue, entry)
+                    self.count += 1
+                yield issue
+
+
+def load_feed(feed: str) -> Dict[str, Any]:
+    """
+    Load a feed file.
+    :param feed: Path to the feed file (JSON, optionally gzip-compressed)
+    :return: The feed
+    """
+    opener = gzip.open if feed.endswith(".gz") else open
+    with opener(feed, "rb") as file:
+        return json_backend.load(file)
+
+
+def iter_entries(feed: Dict[str, Any]) -> Iterator[Tuple[str, ...]]:
+    """
+    Map items of a feed (NVD JSON 1.1 schema) to index rows.
+    :param feed: The feed
+    :return: An iterator over rows (id, score, severity, category, published, modified)
+    """
+    for item in feed["CVE_Items"]:
+        impact = item.get("impact") or {}
+        score, sev = "", ""
+        if "baseMetricV3" in impact:
+            cvss = impact["baseMetricV3"]["cvssV3"]
+            score, sev = str(cvss["baseScore"]), cvss["baseSeverity"]
+        elif "baseMetricV2" in impact:
+            metric = impact["baseMetricV2"]
+            score, sev = str(metric["cvssV2"]["baseScore"]), metric.get("severity", "")
+        weaknesses = [d["value"] for p in item["cve"]["problemtype"]["problemtype_data"]
+                      for d in p["description"] if d["value"].startswith("CWE-")]
+        yield (item["cve"]["CVE_data_meta"]["ID"], score, sev,
+               ", ".join(dict.fromkeys(weaknesses)), item.get("publishedDate", ""),
+               item.get("lastModifiedDate", ""))
+
+
+def cve_identifier(issue: Issue) -> Optional[str]:
+    """
+    Get the CVE identifier of an issue (the first one in the identifier or the name).
+    :param issue: Issue
+    :return: The CVE identifier (None if not found)
+    """
+    match = CVE_PATTERN.search(issue.identifier or "") or CVE_PATTERN.search(issue.name or "")
+    return match.group(0) if match else None
+
+
+def is_incomplete(issue: Issue) -> bool:
+    """
+    Check if an issue misses a field filled by the enrichment.
+    :param issue: Issue
+    :return: true if the score, severity, category or source date is missing
+    """
+    return not issue.score or issue.severity in (None, SEVERITIES[0]) \
+        or not issue.category or issue.source_date is None
+
+
+def fill(issue: Issue, entry: Entry):
+    """
+    Fill missing fields of an issue from a CVE entry.
+    :param issue: Issue
+    :param entry: CVE entry (score, severity, category and publication date)
+    """
+    score, sev, category, published = entry
+    if not issue.score:
+        issue.score = score
+    if issue.severity in (None, SEVERITIES[0]) and sev:
+        issue.severity = severity.guess(sev) or issue.severity
+    if not issue.category:
+        issue.category = category
+    if issue.source_date is None and published:
+        issue.source_date = datetime.strptime(published[:16], "%Y-%m-%dT%H:%M")
+
+
+def index_path(feed_dir: str, database: str = "") -> str:
+    """
+    Get the path to the NVD index.
+    :param feed_dir: Path to the directory of the feed files
+    :param database: Path to the SQLite database file (default: reportmix-nvd.db
+    in the feeds directory)
+    :return: The path to the SQLite database file
+    """
+    return database or path.join(feed_dir, "reportmix-nvd.db")
+
+
+def update_index(feed_dir: str, database: str = ""):
+    """
+    Update the NVD index from new and changed feed files, then close it (e.g. once
+    before merging reports in worker processes opening it in read-only mode).
+    :param feed_dir: Path to the directory of the feed files
+    :param database: Path to the SQLite database file (see index_path())
+    """
+    index = NvdIndex(index_path(feed_dir, database))
+    try:
+        count = index.update(feed_dir)
+    finally:
+        index.close()
+    logger.info("NVD index %s is up-to-date (%d feed(s) indexed)", index.database, count)
+
+
+def open_enricher(feed_dir: str, database: str = "", update: bool = True) -> Enricher:
+    """
+    Open the NVD index and create an enricher.
+    :param feed_dir: Path to the directory of the feed files
+    :param database: Path to the SQLite database file (see index_path())
+    :param update: Update the index from new and changed feed files (False: open
+    the index in read-only mode, it must have been updated with update_index())
+    :return: The enricher
+    """
+    if update:
+        update_index(feed_dir, database)
+    return Enricher(NvdIndex(index_path(feed_dir, database), read_only=True))
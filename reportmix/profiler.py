@@ -0,0 +1,114 @@
+"""
+Pipeline stages profiler.
+"""
+
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Measures for a pipeline stage
+StageProfile = Dict[str, Union[str, int, float]]
+
+
+class Profiler:
+    """
+    Measure wall time, CPU time and peak memory (using tracemalloc)
+    of the pipeline stages. Stages can be nested.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the profiler.
+        :param enabled: Enable measures (stages are no-op when disabled)
+        """
+        self.enabled = enabled
+        self.stages: List[StageProfile] = []
+        self._stack: List[StageProfile] = []
+        self._tracing = False
+
+    def reset(self):
+        """
+        Clear measures.
+        """
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name: str, accumulate: bool = False):
+        """
+        Measure a pipeline stage.
+        :param name: Stage name
+        :param accumulate: Add measures to the stage with the same name in the running
+        top-level stage (e.g. for a stage run issue by issue, interleaved with loading),
+        created as a child of the top-level stage (only measured within another stage)
+        """
+        if not self.enabled or (accumulate and not self._stack):
+            yield
+            return
+        if not self._stack and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._update_peak()
+        entry = self._accumulated(name) if accumulate else None
+        if entry is None:
+            entry = {"stage": name, "level": 1 if accumulate else len(self._stack),
+                     "wall": 0.0, "cpu": 0.0, "peak_memory": tracemalloc.get_traced_memory()[0]}
+            self.stages.append(entry)
+        self._stack.append(entry)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry["wall"] = round(entry["wall"] + time.perf_counter() - wall_start, 6)
+            entry["cpu"] = round(entry["cpu"] + time.process_time() - cpu_start, 6)
+            self._update_peak()
+            self._stack.pop()
+            if not self._stack and self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+    def _accumulated(self, name: str) -> Optional[StageProfile]:
+        """
+        Find a stage to accumulate measures to.
+        :param name: Stage name
+        :return: The stage with the given name in the running top-level stage (None if not found)
+        """
+        top = next(i for i, s in enumerate(self.stages) if s is self._stack[0])
+        return next((s for s in self.stages[top + 1:] if s["stage"] == name and s["level"] == 1),
+                    None)
+
+    def _update_peak(self):
+        """
+        Report the peak of traced memory since the last update to running stages,
+        then reset it (to measure the peak of nested stages).
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for entry in self._stack:
+            entry["peak_memory"] = max(entry["peak_memory"], peak)
+        tracemalloc.reset_peak()
+
+    def log(self):
+        """
+        Log measures as a table.
+        """
+        if not self.stages:
+            return
+        width = max(len(s["stage"]) + 2 * s["level"] for s in self.stages)
+        logger.info("%s | %10s | %10s | %12s", "Stage".ljust(width),
+                    "Wall (s)", "CPU (s)", "Peak (MiB)")
+        for entry in self.stages:
+            logger.info("%s | %10.3f | %10.3f | %12.2f",
+                        ("  " * entry["level"] + entry["stage"]).ljust(width),
+                        entry["wall"], entry["cpu"], entry["peak_memory"] / 1024 / 1024)
+
+    def write(self, output_file: str):
+        """
+        Write measures to a JSON file.
+        :param output_file: Path to the output file
+        """
+        with open(output_file, "w", encoding="utf-8") as file:
+            json.dump(self.stages, file, indent=2)
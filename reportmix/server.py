@@ -0,0 +1,305 @@
+"""
+Server mode (local HTTP ingestion service).
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from http import HTTPStatus
+from os import path
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+from reportmix import json_backend
+from reportmix.config.builder import GLOBAL_CONFIG
+from reportmix.errors import LoadingError, RequestError
+from reportmix.mixer import LOADERS, ReportMixer
+from reportmix.nvd import update_index
+from reportmix.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+# Loaders supporting uploaded reports
+UPLOAD_LOADERS = ["dependency_check", "npm_audit", "reportmix"]
+
+# Routes
+# (project names starting with a dot, e.g. "..", are not allowed)
+PROJECT_PATTERN = r"^/projects/(?P<project>\w[\w.\-]*)"
+REPORT_ROUTE = re.compile(PROJECT_PATTERN + r"/reports/(?P<loader>\w+)$")
+MERGE_ROUTE = re.compile(PROJECT_PATTERN + r"/merge$")
+OUTPUT_ROUTE = re.compile(PROJECT_PATTERN + r"/reportmix\.(?P<format>\w+)$")
+
+# Content types of the exported reports
+CONTENT_TYPES = {"csv": "text/csv", "json": "application/json",
+                 "ndjson": "application/x-ndjson", "html": "text/html"}
+
+# Size of the chunks read from request bodies (in bytes)
+CHUNK_SIZE = 64 * 1024
+
+# A HTTP response (status code, content type and body)
+Response = Tuple[int, str, bytes]
+
+
+class ReportServer:
+    """
+    Local HTTP service to upload reports, merge them by project,
+    and fetch merged reports:
+    - PUT/POST /projects/{project}/reports/{loader}: upload a report (request body)
+    - POST /projects/{project}/merge: merge uploaded reports and export the merged report
+    - GET /projects/{project}/reportmix.{format}: get the exported merged report
+    """
+
+    def __init__(self, config: Dict[str, Dict[str, str]], executor: Executor = None):
+        """
+        Initialize the report server.
+        :param config: Configuration (shared by all projects)
+        :param executor: Executor to parse uploaded reports
+        (default: a pool of processes with one process per job)
+        """
+        self.config = config
+        self.output_dir = path.realpath(config[GLOBAL_CONFIG]["output_dir"])
+        self.jobs = int(config[GLOBAL_CONFIG]["jobs"]) or os.cpu_count() or 1
+        self.max_body_size = int(config[GLOBAL_CONFIG]["serve_max_size"]) * 1024 * 1024
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=json_backend.use, initargs=(json_backend.backend,))
+        self.mixers: Dict[str, ReportMixer] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.parsing = None
+        # The NVD index is updated once, project mixers open it in read-only mode
+        if config[GLOBAL_CONFIG]["nvd_dir"]:
+            update_index(config[GLOBAL_CONFIG]["nvd_dir"], config[GLOBAL_CONFIG]["nvd_index"])
+
+    def serve(self, host: str, port: int):
+        """
+        Run the server until the process is interrupted.
+        :param host: Host to listen on
+        :param port: Port to listen on
+        """
+        async def serve_forever():
+            async with await self.start(host, port) as server:
+                await server.serve_forever()
+
+        try:
+            asyncio.run(serve_forever())
+        finally:
+            self.executor.shutdown()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """
+        Start listening for requests.
+        :param host: Host to listen on
+        :param port: Port to listen on (0 to use any available port)
+        :return: The started server
+        """
+        self.parsing = asyncio.Semaphore(self.jobs)
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info("Listening on http://%s:%d", *server.sockets[0].getsockname()[:2])
+        return server
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Handle a request and write the response.
+        :param reader: Request stream
+        :param writer: Response stream
+        """
+        try:
+            status, content_type, body = await self._route(reader)
+        except RequestError as err:
+            status, content_type, body = json_response(err.status, {"error": str(err)})
+        except Exception as ex:
+            logger.exception("Failed to handle the request")
+            status, content_type, body = json_response(500, {"error": str(ex)})
+        head = "HTTP/1.1 {} {}\r\nContent-Type: {}\r\nContent-Length: {}\r\n" \
+               "Connection: close\r\n\r\n".format(status, HTTPStatus(status).phrase,
+                                                  content_type, len(body))
+        writer.write(head.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _route(self, reader: asyncio.StreamReader) -> Response:
+        """
+        Parse the request and call the matching handler.
+        :param reader: Request stream
+        :return: The response
+        """
+        # Request line and headers
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        except ValueError as ex:
+            raise RequestError(400, "Invalid request line") from ex
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        url_path = urlsplit(target).path
+        logger.debug("%s %s", method, url_path)
+
+        # Routing
+        if match := REPORT_ROUTE.match(url_path):
+            check_method(method, "PUT", "POST")
+            body = await read_body(reader, headers, self.max_body_size)
+            return await self.upload(match["project"], match["loader"], body)
+        if match := MERGE_ROUTE.match(url_path):
+            check_method(method, "POST")
+            return await self.merge(match["project"])
+        if match := OUTPUT_ROUTE.match(url_path):
+            check_method(method, "GET")
+            return await self.output(match["project"], match["format"])
+        raise RequestError(404, "Not found")
+
+    async def upload(self, project: str, loader: str, body: bytes) -> Response:
+        """
+        Parse an uploaded report and store it for the next merge of the project.
+        :param project: Project name
+        :param loader: Loader name
+        :param body: Report content
+        :return: The response
+        """
+        if loader not in UPLOAD_LOADERS:
+            raise RequestError(404, "Unknown loader {}".format(loader))
+        mixer = self._mixer(project)
+        async with self.parsing:
+            try:
+                report = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, parse_report, loader, mixer.loaders[loader].config, body)
+            except LoadingError as err:
+                raise RequestError(400, str(err)) from err
+        async with self.locks[project]:
+            # Metadata, hash, enrichment and suppression (off the event loop)
+            await asyncio.get_running_loop().run_in_executor(
+                None, mixer.set_report, loader, report)
+        logger.info("Loaded %d issue(s) from %s report for project %s",
+                    len(report.issues), loader, project)
+        return json_response(200, {"project": project, "loader": loader,
+                                   "issues": len(report.issues)})
+
+    async def merge(self, project: str) -> Response:
+        """
+        Merge uploaded reports of a project and export the merged report.
+        :param project: Project name
+        :return: The response
+        """
+        if project not in self.mixers:
+            raise RequestError(404, "Unknown project {}".format(project))
+        mixer = self.mixers[project]
+        async with self.locks[project]:
+            os.makedirs(mixer.config["output_dir"], exist_ok=True)
+            report = await asyncio.get_running_loop().run_in_executor(None, mixer.merge, [])
+        return json_response(200, {
+            "project": project,
+            "issues": len(report.issues),
+            "tools": [t.identifier for t in report.tools],
+            "outputs": ["/projects/{}/reportmix.{}".format(project, f)
+                        for f in mixer.config["formats"].split(",")]
+        })
+
+    async def output(self, project: str, output_format: str) -> Response:
+        """
+        Get a merged report exported by the last merge of a project.
+        :param project: Project name
+        :param output_format: Report format
+        :return: The response
+        """
+        output_file_path = path.join(self.project_dir(project), "reportmix." + output_format)
+        if project not in self.mixers or output_format not in CONTENT_TYPES \
+                or not path.isfile(output_file_path):
+            raise RequestError(404, "Merged report not found")
+        async with self.locks[project]:
+            with open(output_file_path, "rb") as file:
+                return 200, CONTENT_TYPES[output_format], file.read()
+
+    def project_dir(self, project: str) -> str:
+        """
+        Get the output directory of a project.
+        :param project: Project name
+        :return: The path to the directory (in the output directory)
+        """
+        project_dir = path.realpath(path.join(self.output_dir, project))
+        if path.dirname(project_dir) != self.output_dir:
+            raise RequestError(400, "Invalid project name {}".format(project))
+        return project_dir
+
+    def _mixer(self, project: str) -> ReportMixer:
+        """
+        Get (or create) the report mixer of a project.
+        :param project: Project name
+        :return: The project report mixer
+        """
+        if project not in self.mixers:
+            config = dict(self.config)
+            # Uploaded reports are kept by the mixer (not compatible with the streaming mode),
+            # the merged report is exported to a single file per format
+            config[GLOBAL_CONFIG] = dict(config[GLOBAL_CONFIG],
+                                         output_dir=self.project_dir(project),
+                                         stream="false", shard_by="", shard_rows="0",
+                                         shard_size="0")
+            mixer = ReportMixer(config, update_nvd=False)
+            # Only uploaded reports are merged
+            mixer.reports = {name: Report([], []) for name in mixer.loaders}
+            self.mixers[project] = mixer
+            self.locks[project] = asyncio.Lock()
+        return self.mixers[project]
+
+
+def parse_report(loader: str, config: Dict[str, str], body: bytes) -> Report:
+    """
+    Parse an uploaded report (run in a worker process).
+    :param loader: Loader name
+    :param config: Loader configuration
+    :param body: Report content
+    :return: Loaded report
+    """
+    with io.TextIOWrapper(io.BytesIO(body), encoding="utf-8", newline='') as report_file:
+        return LOADERS[loader](config).parse(report_file)
+
+
+async def read_body(reader: asyncio.StreamReader, headers: Dict[str, str],
+                    max_size: int) -> bytes:
+    """
+    Read the request body.
+    :param reader: Request stream
+    :param headers: Request headers (lower case names)
+    :param max_size: Maximum size of the body (in bytes)
+    :return: Request body
+    """
+    if not headers.get("content-length", "").isdecimal():
+        raise RequestError(411, "Content-Length header required")
+    length = int(headers["content-length"])
+    if length > max_size:
+        raise RequestError(413, "Request body too large (maximum: {} bytes)".format(max_size))
+    body = bytearray()
+    while len(body) < length:
+        chunk = await reader.read(min(CHUNK_SIZE, length - len(body)))
+        if not chunk:
+            raise RequestError(400, "Incomplete request body")
+        body.extend(chunk)
+    return bytes(body)
+
+
+def check_method(method: str, *allowed: str):
+    """
+    Check the request method.
+    :param method: Request method
+    :param allowed: Allowed methods
+    """
+    if method not in allowed:
+        raise RequestError(405, "Method not allowed")
+
+
+def json_response(status: int, data: Dict) -> Response:
+    """
+    Build a JSON response.
+    :param status: Status code
+    :param data: Response data
+    :return: The response
+    """
+    return status, "application/json", json.dumps(data).encode("utf-8")
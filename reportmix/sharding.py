@@ -0,0 +1,115 @@
+"""
+Merged report sharding (split into multiple output files).
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from reportmix.grouping import key_getter
+from reportmix.models.issue import Issue
+
+
+class Shard:
+    """
+    A part of the merged report exported to separate files.
+    """
+
+    def __init__(self, value: Optional[str], part: int, issues: List[Issue]):
+        """
+        Initialize a shard.
+        :param value: Value of the field issues are split by (None if not split by field)
+        :param part: Part number (starting from 1) for this value
+        :param issues: Empty list of issues
+        """
+        self.value = value
+        self.part = part
+        self.issues = issues
+        self.count = 0
+        self.size = 0
+        self.name = ""
+        # Identifiers of the tools involved in the shard
+        self.tools: Set[str] = set()
+
+    def add(self, issue: Issue, size: int):
+        """
+        Add an issue to the shard.
+        :param issue: Issue
+        :param size: Estimated size of the exported issue
+        """
+        self.issues.append(issue)
+        self.count += 1
+        self.size += size
+        self.tools.add(issue.tool.identifier)
+
+    def to_dict(self, formats: List[str]) -> Dict:
+        """
+        Describe the shard for the index manifest.
+        :param formats: Output formats
+        :return: The shard as a dictionary
+        """
+        return {"name": self.name, "value": self.value, "part": self.part, "count": self.count,
+                "files": [self.name + "." + f for f in formats]}
+
+
+def split(issues: Iterable[Issue], field: str, max_rows: int, max_size: int,
+          fields: List[str], factory: Callable[[], List[Issue]] = list) -> List[Shard]:
+    """
+    Split issues into shards, by value of a field and/or when a shard is full.
+    :param issues: Issues to split (kept in order in each shard)
+    :param field: Field to split issues by (from the FLAT_FIELDS list, empty to disable)
+    :param max_rows: Maximum number of issues per shard (0 for no limit)
+    :param max_size: Maximum estimated size of a shard in bytes (0 for no limit)
+    :param fields: Exported fields (to estimate the size of issues)
+    :param factory: Function creating the list of issues of a shard
+    :return: Shards, in order of creation
+    """
+    getter = key_getter([field]) if field else None
+    current: Dict[Optional[str], Shard] = {}
+    shards: List[Shard] = []
+    for issue in issues:
+        value = str(getter(issue)[0] or "") if getter else None
+        size = estimate_size(issue, fields) if max_size else 0
+        shard = current.get(value)
+        if shard is None or (max_rows and shard.count >= max_rows) \
+                or (max_size and shard.count and shard.size + size > max_size):
+            shard = Shard(value, shard.part + 1 if shard else 1, factory())
+            current[value] = shard
+            shards.append(shard)
+        shard.add(issue, size)
+    name_shards(shards, bool(max_rows or max_size))
+    return shards
+
+
+def name_shards(shards: List[Shard], numbered: bool):
+    """
+    Name shards output files (without extension) from their value and part number,
+    e.g. reportmix-org.acme_app-2.
+    :param shards: Shards to name
+    :param numbered: Add the part number to the name
+    """
+    names = set()
+    for shard in shards:
+        parts = ["reportmix"]
+        if shard.value is not None:
+            parts.append(re.sub(r"[^\w.\-]+", "_", shard.value).strip("._") or "none")
+        if numbered:
+            parts.append(str(shard.part))
+        name = "-".join(parts)
+        # Different values may give the same name
+        unique_name, index = name, 1
+        while unique_name in names:
+            index += 1
+            unique_name = "{}~{}".format(name, index)
+        names.add(unique_name)
+        shard.name = unique_name
+
+
+def estimate_size(issue: Issue, fields: List[str]) -> int:
+    """
+    Estimate the size of an exported issue (length of the values of exported fields).
+    :param issue: Issue
+    :param fields: Exported fields
+    :return: The estimated size in bytes
+    """
+    flat_issue = issue.flatten()
+    return sum(len(str(flat_issue.get(f) or "")) + 1 for f in fields)
@@ -0,0 +1,128 @@
+"""
+Issues sorting.
+"""
+
+import itertools
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from reportmix.errors import AppError
+from reportmix.models.issue import FLAT_FIELDS, Issue
+from reportmix.models.severity import SEVERITIES
+
+# A sort specification: list of fields with the descending flag
+SortSpec = List[Tuple[str, bool]]
+
+# A sort key function (returns a tuple of comparable values)
+SortKey = Callable[[Issue], Tuple]
+
+# Severities ordinal values (compared by identity, unknown severities first)
+SEVERITY_ORDINALS = {severity: index for index, severity in enumerate(SEVERITIES)}
+
+# Fields with special sort values (other fields are compared as strings)
+DATE_FIELDS = ["analysis_date", "source_date"]
+NUMBER_FIELDS = ["evidences"]
+
+
+class Descending:
+    """
+    Wrap a value to reverse its sort order.
+    """
+
+    __slots__ = ["value"]
+
+    def __init__(self, value: Any):
+        """
+        :param value: Wrapped value
+        """
+        self.value = value
+
+    def __lt__(self, other: "Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: "Descending") -> bool:
+        return self.value == other.value
+
+
+def parse_sort(spec: str) -> SortSpec:
+    """
+    Parse a sort specification.
+    :param spec: Comma-separated list of fields, with an optional
+    order (e.g. "severity:desc,tool_name,subject_identifier")
+    :return: Parsed sort specification
+    """
+    result = []
+    for item in filter(None, (i.strip() for i in (spec or "").split(","))):
+        field, _, order = item.partition(":")
+        if field not in FLAT_FIELDS:
+            raise AppError("Invalid sort field {}".format(field))
+        if order not in ("", "asc", "desc"):
+            raise AppError("Invalid sort order {} (asc or desc)".format(order))
+        result.append((field, order == "desc"))
+    return result
+
+
+def sort_key(spec: SortSpec) -> SortKey:
+    """
+    Build the sort key function of a sort specification.
+    The severity is sorted by its ordinal value instead of its name,
+    other values are normalized to avoid comparisons with None.
+    :param spec: Sort specification
+    :return: The key function
+    """
+    getters = [value_getter(field, descending) for field, descending in spec]
+    return lambda issue: tuple([getter(issue) for getter in getters])
+
+
+def value_getter(field: str, descending: bool) -> Callable[[Issue], Any]:
+    """
+    Build the function returning the sort value of a field.
+    :param field: Field name (from the FLAT_FIELDS list)
+    :param descending: Reverse the sort order
+    :return: The value function
+    """
+    get = attrgetter(field.replace("_", ".", 1) if field.split("_", 1)[0] in
+                     ["tool", "subject", "project", "meta"] else field)
+    sign = -1 if descending else 1
+    if field == "severity":
+        return lambda issue: sign * SEVERITY_ORDINALS.get(issue.severity, -1)
+    if field in NUMBER_FIELDS:
+        return lambda issue: sign * (get(issue) or 0)
+
+    def value(issue: Issue) -> Any:
+        val = get(issue)
+        if field in DATE_FIELDS:
+            return val or datetime.min
+        return "" if val is None else str(val)
+
+    if descending:
+        return lambda issue: Descending(value(issue))
+    return value
+
+
+def sort_groups(issues: Iterable[Issue], sorted_by: SortSpec, spec: SortSpec) -> Iterator[Issue]:
+    """
+    Sort issues already sorted by the first fields of the sort specification,
+    one group of issues with the same values of these fields at a time.
+    :param issues: Issues sorted by the sorted_by specification
+    :param sorted_by: Sort specification of the issues (a prefix of spec)
+    :param spec: Sort specification
+    :return: An iterator over sorted issues
+    """
+    if sorted_by == spec:
+        yield from issues
+        return
+    key = sort_key(spec)
+    for _, group in itertools.groupby(issues, sort_key(sorted_by)):
+        yield from sorted(group, key=key)
+
+
+def is_prefix(sorted_by: SortSpec, spec: SortSpec) -> bool:
+    """
+    Check if issues sorted by a specification can be sorted group by group.
+    :param sorted_by: Sort specification of the issues
+    :param spec: Requested sort specification
+    :return: True if sorted_by is a non-empty prefix of spec
+    """
+    return 0 < len(sorted_by) <= len(spec) and spec[:len(sorted_by)] == sorted_by
@@ -0,0 +1,130 @@
+"""
+Issues summary and quality gate.
+"""
+
+from collections import Counter
+from typing import List, Tuple
+
+from reportmix.errors import AppError
+from reportmix.models import severity
+from reportmix.models.issue import Issue
+from reportmix.models.severity import SEVERITIES, Severity
+
+# A quality gate: list of severities with the maximum number
+# of issues with this severity or a higher one
+Gate = List[Tuple[Severity, int]]
+
+
+class Summary:
+    """
+    Number of issues by tool, severity and type.
+    """
+
+    def __init__(self):
+        # Number of issues by tool identifier
+        self.totals = Counter()
+        # Number of issues by tool identifier and severity
+        self.severities = Counter()
+        # Number of issues by tool identifier and type
+        self.types = Counter()
+
+    def add_issue(self, issue: Issue):
+        """
+        Count an issue.
+        :param issue: Issue to count
+        """
+        tool = issue.tool.identifier
+        self.totals[tool] += 1
+        self.severities[tool, issue.severity or SEVERITIES[0]] += 1
+        self.types[tool, issue.type or ""] += 1
+
+    def add_tool(self, tool: str):
+        """
+        List a tool in the summary, even without issues.
+        :param tool: Tool identifier
+        """
+        self.totals[tool] += 0
+
+    def update(self, other: "Summary"):
+        """
+        Add counts from another summary.
+        :param other: Summary to add
+        """
+        self.totals.update(other.totals)
+        self.severities.update(other.severities)
+        self.types.update(other.types)
+
+    def count(self, minimum: Severity = SEVERITIES[0]) -> int:
+        """
+        Count issues with a severity greater than or equal to the given one (all tools).
+        :param minimum: Minimum severity
+        :return: The number of issues
+        """
+        minimum_index = SEVERITIES.index(minimum)
+        return sum(n for (_, sev), n in self.severities.items()
+                   if SEVERITIES.index(sev) >= minimum_index)
+
+    def table(self) -> List[str]:
+        """
+        Format the summary as a table of issues by tool and severity,
+        followed by a table of issues by tool and type.
+        :return: Lines of the tables
+        """
+        tools = sorted(self.totals)
+        severities = list(reversed(SEVERITIES))
+        width = max([len(t) for t in tools] + [len("Total")])
+        header = "{} | {:>8} | {}".format("Tool".ljust(width), "Issues", " | ".join(
+            "{:>8}".format(s.identifier) for s in severities))
+        lines = [header, "-" * len(header)]
+        for tool in tools + ["Total"]:
+            if tool == "Total":
+                total = sum(self.totals.values())
+                counts = [sum(n for (_, s), n in self.severities.items() if s is sev)
+                          for sev in severities]
+            else:
+                total = self.totals[tool]
+                counts = [self.severities[tool, sev] for sev in severities]
+            lines.append("{} | {:>8d} | {}".format(tool.ljust(width), total, " | ".join(
+                "{:>{}d}".format(n, max(len(s.identifier), 8)) for n, s in zip(counts, severities))))
+        types = sorted(self.types.items())
+        if types:
+            type_width = max(max(len(t) for (_, t), _ in types), len("Type"))
+            header = "{} | {} | {:>8}".format("Tool".ljust(width), "Type".ljust(type_width),
+                                              "Issues")
+            lines += ["", header, "-" * len(header)]
+            lines += ["{} | {} | {:>8d}".format(tool.ljust(width), issue_type.ljust(type_width), n)
+                      for (tool, issue_type), n in types]
+        return lines
+
+
+def parse_gate(spec: str) -> Gate:
+    """
+    Parse a quality gate specification.
+    :param spec: Comma-separated list of severities, with an optional maximum number
+    of issues with this severity or a higher one (default: 0), e.g. "HIGH,MEDIUM:10"
+    :return: Parsed quality gate
+    """
+    gate = []
+    for item in filter(None, (i.strip() for i in (spec or "").split(","))):
+        identifier, _, maximum = item.partition(":")
+        sev = severity.from_identifier(identifier.upper())
+        if sev is None or (maximum and not maximum.isdecimal()):
+            raise AppError("Invalid quality gate condition {}".format(item))
+        gate.append((sev, int(maximum or 0)))
+    return gate
+
+
+def check_gate(summary: Summary, gate: Gate) -> List[str]:
+    """
+    Check the quality gate.
+    :param summary: Issues summary
+    :param gate: Quality gate
+    :return: Failed conditions descriptions (empty if the quality gate passed)
+    """
+    failures = []
+    for sev, maximum in gate:
+        count = summary.count(sev)
+        if count > maximum:
+            failures.append("{} issue(s) with severity {} or higher (maximum: {})"
+                            .format(count, sev.identifier, maximum))
+    return failures
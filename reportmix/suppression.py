@@ -0,0 +1,217 @@
+"""
+Issues suppression (accepted risks): rules loaded from a CSV file
+and compiled into a single matcher.
+"""
+
+import csv
+import logging
+import re
+from fnmatch import translate
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from reportmix.errors import AppError
+from reportmix.models.issue import FLAT_FIELDS, Issue
+
+logger = logging.getLogger(__name__)
+
+# Column of the suppression file ignored by rules (why the risk is accepted)
+REASON_COLUMN = "reason"
+
+# Glob wildcards
+WILDCARDS = re.compile(r"[*?\[]")
+
+
+class Rule:
+    """
+    A suppression rule: issues matching all conditions are suppressed.
+    """
+
+    __slots__ = ["line", "conditions", "checks", "count"]
+
+    def __init__(self, line: int, conditions: Dict[str, str]):
+        """
+        Initialize a rule.
+        :param line: Line number in the suppression file
+        :param conditions: Value or glob pattern by field (from the FLAT_FIELDS list)
+        """
+        self.line = line
+        self.conditions = conditions
+        # Functions checking the value of each field
+        self.checks: List[Tuple[str, Callable[[str], bool]]] = [
+            (field, compile_glob(pattern).match if is_glob(pattern) else pattern.__eq__)
+            for field, pattern in conditions.items()]
+        # Number of suppressed issues
+        self.count = 0
+
+    def matches(self, issue: Issue) -> bool:
+        """
+        Check if an issue matches all conditions of the rule.
+        :param issue: Issue
+        :return: true if the issue matches
+        """
+        return all(check(field_value(issue, field)) for field, check in self.checks)
+
+
+class TrieNode:
+    """
+    A node of a prefix tree (rules indexed by the literal prefix of their pattern).
+    """
+
+    __slots__ = ["children", "rules"]
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.rules: List[Rule] = []
+
+    def insert(self, prefix: str, rule: Rule):
+        """
+        Index a rule by prefix.
+        :param prefix: Literal prefix of the rule pattern
+        :param rule: Rule
+        """
+        node = self
+        for char in prefix:
+            node = node.children.setdefault(char, TrieNode())
+        node.rules.append(rule)
+
+    def find(self, value: str) -> Iterator[Rule]:
+        """
+        Find rules with a prefix of the given value.
+        :param value: Value
+        :return: An iterator over rules (shortest prefixes first)
+        """
+        node = self
+        yield from node.rules
+        for char in value:
+            node = node.children.get(char)
+            if node is None:
+                return
+            yield from node.rules
+
+
+class Suppressions:
+    """
+    Suppression rules compiled into a single matcher: each rule is indexed by one of its
+    conditions, the hash or another exact value in hash maps, otherwise the literal prefix
+    of a glob pattern (e.g. a subject_location prefix) in a trie per field, so matching
+    an issue only checks candidate rules instead of all rules.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        """
+        Compile rules.
+        :param rules: Suppression rules
+        """
+        self.rules = rules
+        # Rules by field and exact value (e.g. by hash)
+        self.exact: Dict[str, Dict[str, List[Rule]]] = {}
+        # Rules by field and literal prefix of a glob pattern
+        self.prefixes: Dict[str, TrieNode] = {}
+        for rule in rules:
+            exact = [f for f, p in rule.conditions.items() if not is_glob(p)]
+            if exact:
+                field = "hash" if "hash" in exact else exact[0]
+                self.exact.setdefault(field, {}).setdefault(
+                    rule.conditions[field], []).append(rule)
+            else:
+                # Index by the longest literal prefix (the most selective one)
+                field, prefix = max(((f, literal_prefix(p)) for f, p in rule.conditions.items()),
+                                    key=lambda fp: len(fp[1]))
+                self.prefixes.setdefault(field, TrieNode()).insert(prefix, rule)
+        # Number of suppressed issues
+        self.count = 0
+
+    def match(self, issue: Issue) -> Optional[Rule]:
+        """
+        Find the first rule matching an issue (and count it as suppressed).
+        :param issue: Issue
+        :return: The matching rule (None if the issue is not suppressed)
+        """
+        rule = next((r for r in self._candidates(issue) if r.matches(issue)), None)
+        if rule is not None:
+            rule.count += 1
+            self.count += 1
+        return rule
+
+    def _candidates(self, issue: Issue) -> Iterator[Rule]:
+        """
+        Find rules that may match an issue.
+        :param issue: Issue
+        :return: An iterator over candidate rules
+        """
+        for field, index in self.exact.items():
+            yield from index.get(field_value(issue, field), ())
+        for field, trie in self.prefixes.items():
+            yield from trie.find(field_value(issue, field))
+
+    def unused(self) -> List[Rule]:
+        """
+        List rules that did not match any issue.
+        :return: Unused rules
+        """
+        return [r for r in self.rules if r.count == 0]
+
+
+def load_suppressions(file_path: str) -> Suppressions:
+    """
+    Load suppression rules from a CSV file: one rule per row, with a column per field
+    (from the FLAT_FIELDS list, e.g. hash, identifier or subject_location) and an optional
+    reason column. Non-empty cells of a row are the conditions of the rule: an exact value
+    or a glob pattern (*, ? and [...] wildcards).
+    :param file_path: Path to the suppression file
+    :return: Compiled suppression rules
+    """
+    try:
+        with open(file_path, newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            fields = [f for f in reader.fieldnames or [] if f != REASON_COLUMN]
+            for field in fields:
+                if field not in FLAT_FIELDS:
+                    raise AppError("Invalid suppression field {}".format(field))
+            rules = []
+            for row in reader:
+                conditions = {f: row[f].strip() for f in fields if (row[f] or "").strip()}
+                if conditions:
+                    rules.append(Rule(reader.line_num, conditions))
+    except OSError as ex:
+        raise AppError("Failed to read the suppression file: {}".format(ex)) from ex
+    logger.info("Loaded %d suppression rule(s) from %s", len(rules), file_path)
+    return Suppressions(rules)
+
+
+def field_value(issue: Issue, field: str) -> str:
+    """
+    Get the value of an issue field as a string.
+    :param issue: Issue
+    :param field: Field name (from the FLAT_FIELDS list)
+    :return: The value (empty if not set)
+    """
+    value = issue.get_field(field)
+    return "" if value is None else str(value)
+
+
+def is_glob(pattern: str) -> bool:
+    """
+    Check if a value is a glob pattern.
+    :param pattern: Value
+    :return: true if the value contains a wildcard
+    """
+    return WILDCARDS.search(pattern) is not None
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Get the literal prefix of a glob pattern.
+    :param pattern: Glob pattern
+    :return: Characters before the first wildcard
+    """
+    return pattern[:WILDCARDS.search(pattern).start()]
+
+
+def compile_glob(pattern: str) -> Pattern:
+    """
+    Compile a glob pattern (case-sensitive, * also matches /).
+    :param pattern: Glob pattern
+    :return: The regular expression
+    """
+    return re.compile(translate(pattern))
@@ -0,0 +1,106 @@
+"""
+Watch mode.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from reportmix import archive
+from reportmix.errors import AppError
+from reportmix.mixer import ReportMixer
+
+logger = logging.getLogger(__name__)
+
+# Input file signature (modification time and size, None if the file doesn't exist)
+Signature = Optional[Tuple[int, int]]
+
+
+class ReportWatcher:
+    """
+    Watch input report files and merge reports again when they change.
+    """
+
+    def __init__(self, mixer: ReportMixer, interval: float, debounce: float = 0):
+        """
+        Initialize the report watcher.
+        :param mixer: Report mixer to run on changes
+        :param interval: Polling interval (in seconds)
+        :param debounce: Time without any new change to wait for before merging
+        reports again (in seconds), to avoid merging partially written files
+        """
+        self.mixer = mixer
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshot = self._snapshot()
+        self.pending: Set[str] = set()
+        self.last_change = 0.0
+
+    def watch(self):
+        """
+        Merge reports, then watch input files and merge again reports
+        from changed files, until the process is interrupted.
+        Merge errors are logged and do not stop watching.
+        """
+        self.merge()
+        logger.info("Watching input reports (interval: %ss)", self.interval)
+        while True:
+            time.sleep(self.interval)
+            names = self.poll()
+            if names:
+                logger.info("Input reports changed: %s", ", ".join(names))
+                self.merge(names)
+
+    def merge(self, names: List[str] = None) -> bool:
+        """
+        Merge reports, logging errors (e.g. an invalid report or an unwritable output).
+        :param names: Names of the loaders to load again (all if None)
+        :return: true if reports have been merged
+        """
+        try:
+            self.mixer.merge(names)
+            return True
+        except (AppError, OSError) as ex:
+            logger.error("Failed to merge reports: %s", ex)
+            return False
+
+    def poll(self) -> List[str]:
+        """
+        Check input files once for changes.
+        :return: Names of the loaders whose input files changed
+        and have been stable for the debounce period
+        """
+        snapshot = self._snapshot()
+        changed = [n for n, sig in snapshot.items() if sig != self.snapshot.get(n)]
+        self.snapshot = snapshot
+        now = time.monotonic()
+        if changed:
+            self.pending.update(changed)
+            self.last_change = now
+        if not self.pending or now - self.last_change < self.debounce:
+            return []
+        names = [n for n in self.mixer.loaders if n in self.pending]
+        self.pending.clear()
+        return names
+
+    def _snapshot(self) -> Dict[str, List[Signature]]:
+        """
+        Get signatures of the input files of all loaders.
+        :return: Input files signatures by loader name
+        """
+        return {name: [signature(f) for f in loader.input_files()]
+                for name, loader in self.mixer.loaders.items()}
+
+
+def signature(file_path: str) -> Signature:
+    """
+    Compute the signature of a file to detect changes without reading it.
+    :param file_path: Path to the file (the archive is used for a member of an archive)
+    :return: File modification time and size (None if the file doesn't exist)
+    """
+    try:
+        stat = os.stat(archive.container(file_path))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -53,13 +53,17 @@ setup(
         'Topic :: Software Development :: Quality Assurance',
     ],
     keywords='report mix merge security dependency-check npm audit sonarqube owasp',
-    packages=find_packages(exclude=['tests*']),
+    packages=find_packages(exclude=['tests*', 'benchmarks*']),
     include_package_data=True,
     python_requires='>=3.9',
     install_requires=[
         'requests>=2.26.0',
         'jinja2>=3.0.1'
     ],
+    extras_require={
+        'orjson': ['orjson>=3.6'],
+        'ujson': ['ujson>=5.4']
+    },
     entry_points={
         'console_scripts': [
             'reportmix=reportmix.main:main'
@@ -0,0 +1,45 @@
+"""
+Synthetic report generators tests.
+"""
+
+from benchmarks import generators
+from benchmarks.run import compare, parse_size
+from reportmix.loaders.dependency_check import DependencyCheckLoader
+from reportmix.loaders.npm_audit import NpmAuditLoader
+from reportmix.loaders.reportmix import ReportMixLoader
+
+
+def test_generators(tmp_path):
+    """
+    Test that generated reports are loaded with the expected number of issues
+    """
+    dc_file, npm_file = str(tmp_path / "dc.csv"), str(tmp_path / "npm-audit.json")
+    mix_file = str(tmp_path / "reportmix.csv")
+    generators.dependency_check_csv(dc_file, 50)
+    generators.dependency_check_json(str(tmp_path / "dc.json"))
+    generators.npm_audit_json(npm_file, 50)
+    generators.reportmix_csv(mix_file, 50)
+    dc_report = DependencyCheckLoader({"report_file": dc_file}).load()
+    assert len(dc_report.issues) == 50
+    assert dc_report.issues[0].project.identifier == "org.acme:acme-app"
+    assert len(NpmAuditLoader({"report_file": npm_file}).load().issues) == 50
+    assert len(ReportMixLoader({"report_file": mix_file}).load().issues) == 50
+
+
+def test_parse_size():
+    """
+    Test the parse_size function
+    """
+    assert parse_size("1000") == 1000
+    assert parse_size("100k") == 100000
+    assert parse_size("1M") == 1000000
+
+
+def test_compare():
+    """
+    Test the compare function
+    """
+    baselines = {"1k": {"hash": {"wall": 1.0, "peak_memory": 1000}}}
+    assert not compare({"1k": {"hash": {"wall": 1.2, "peak_memory": 1100}}}, baselines, 1.25)
+    assert not compare({"10k": {"hash": {"wall": 9.0, "peak_memory": 9000}}}, baselines, 1.25)
+    assert len(compare({"1k": {"hash": {"wall": 2.0, "peak_memory": 2000}}}, baselines, 1.25)) == 2
@@ -0,0 +1,30 @@
+"""
+JSON report exporter tests.
+"""
+
+import io
+import json
+
+import pytest
+
+from benchmarks import generators
+from reportmix import json_backend
+from reportmix.exporters.json import JsonExporter
+from reportmix.models.issue import FLAT_FIELDS
+from reportmix.models.report import Report
+
+
+@pytest.mark.parametrize("backend", json_backend.available())
+def test_export(backend):
+    """
+    Test that the JSON report is formatted as json.dump() does, whatever the JSON backend
+    """
+    issues = generators.issues(20)
+    issues[0].description = "Ünïcode \"quoted\" </script>"
+    previous = json_backend.use(backend)
+    try:
+        output = io.StringIO()
+        JsonExporter({}).export(Report(issues, []), output, FLAT_FIELDS)
+    finally:
+        json_backend.use(previous)
+    assert output.getvalue() == json.dumps([i.to_dict() for i in issues], default=str)
@@ -0,0 +1,26 @@
+"""
+Shared test helpers.
+"""
+
+from typing import Dict
+
+from reportmix.config.builder import ConfigBuilder, GLOBAL_CONFIG
+
+
+def mixer_config(output_dir, reports: Dict[str, object] = None,
+                 **options: str) -> Dict[str, Dict[str, str]]:
+    """
+    Build a configuration from default values to merge test reports
+    (fixed audit date, SonarQube loader not configured).
+    :param output_dir: Output directory
+    :param reports: Path to the report file by loader name
+    :param options: Global configuration values
+    :return: Configuration
+    """
+    config = ConfigBuilder("test").defaults()
+    config[GLOBAL_CONFIG].update(output_dir=str(output_dir), **options)
+    config["meta"]["audit_date"] = "2021-01-01"
+    for name, report_file in (reports or {}).items():
+        config[name]["report_file"] = str(report_file)
+    config["sonarqube"]["host_url"] = ""
+    return config
@@ -0,0 +1,84 @@
+"""
+ReportMix loader tests.
+"""
+
+import pytest
+
+from benchmarks import generators
+from reportmix import json_backend
+from reportmix.config.builder import ConfigBuilder, GLOBAL_CONFIG
+from reportmix.errors import LoadingError, SkippedError
+from reportmix.loaders.reportmix import ReportMixLoader
+from reportmix.mixer import ReportMixer
+
+
+def merge(output_dir, report_file: str, loader: str, **config_values) -> ReportMixer:
+    """
+    Merge a single report to JSON and NDJSON files.
+    """
+    output_dir.mkdir()
+    config = ConfigBuilder("test").defaults()
+    config[GLOBAL_CONFIG].update(output_dir=str(output_dir), formats="json,ndjson",
+                                 **config_values)
+    config["meta"].update(product="product", audit_date="2021-01-01")
+    config[loader]["report_file"] = report_file
+    config["sonarqube"]["host_url"] = ""
+    mixer = ReportMixer(config)
+    mixer.merge()
+    return mixer
+
+
+def test_reload(tmp_path):
+    """
+    Test that JSON and NDJSON reports are reloaded without loss,
+    keeping stored hash and metadata fields
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 100)
+    merge(tmp_path / "first", str(tmp_path / "dc.csv"), "dependency_check")
+    first = (tmp_path / "first" / "reportmix.json").read_bytes()
+    for output_format in ["json", "ndjson"]:
+        output_dir = tmp_path / output_format
+        mixer = merge(output_dir, str(tmp_path / "first" / ("reportmix." + output_format)),
+                      "reportmix", hash="identifier")
+        assert mixer.count == 100
+        assert [t.identifier for t in mixer.report.tools] == ["dependency_check"]
+        assert (output_dir / "reportmix.json").read_bytes() == first
+
+
+def test_verify(tmp_path):
+    """
+    Test that stored hashes are replaced when verification is enabled
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 10)
+    merge(tmp_path / "first", str(tmp_path / "dc.csv"), "dependency_check")
+    config = ConfigBuilder("test").defaults()
+    config[GLOBAL_CONFIG].update(hash="identifier")
+    config["reportmix"].update(report_file=str(tmp_path / "first" / "reportmix.ndjson"),
+                               verify="true")
+    config["sonarqube"]["host_url"] = ""
+    config["meta"]["audit_date"] = "2021-01-01"
+    mixer = ReportMixer(config)
+    mixer.set_report("reportmix", mixer.loaders["reportmix"].load())
+    issues = mixer.reports["reportmix"].issues
+    assert len(issues) == 10
+    assert all(i.hash == i.compute_hash(["identifier"]) for i in issues)
+    assert all(i.meta.product == "product" for i in issues)
+
+
+@pytest.mark.parametrize("backend", ["json", "auto"])
+@pytest.mark.parametrize("file_name,content", [
+    ("reportmix.json", '[{"identifier": '), ("reportmix.ndjson", '{"identifier": "CVE-1"}\n{')])
+def test_malformed(tmp_path, monkeypatch, backend, file_name, content):
+    """
+    Test that malformed JSON and NDJSON reports raise a loading error
+    """
+    monkeypatch.setattr(json_backend, "backend", json_backend.backend)
+    json_backend.use(backend)
+    report_file = tmp_path / file_name
+    report_file.write_text(content)
+    loader = ReportMixLoader({"report_file": str(report_file)})
+    with pytest.raises(LoadingError) as err:
+        loader.load()
+    assert not isinstance(err.value, SkippedError)
+    with report_file.open() as stream, pytest.raises(LoadingError):
+        loader.parse(stream)
@@ -0,0 +1,138 @@
+"""
+SonarQube report loader tests.
+"""
+
+import time
+
+import pytest
+
+from benchmarks.sonarqube import FakeSonarQube, loader_config
+from reportmix.cache import ReportCache
+from reportmix.errors import LoadingError
+from reportmix.loaders.sonarqube import SonarQubeLoader, get_rules_cache
+from reportmix.models.severity import SEVERITIES
+
+
+def test_load():
+    """
+    Test loading issues from multiple result pages
+    """
+    with FakeSonarQube(1234, version="7.9.1") as server:
+        report = SonarQubeLoader(loader_config(server)).load()
+        expected = [i for i in server.issues if i["status"] in ("OPEN", "CONFIRMED", "REOPENED")]
+    assert [i.ref for i in report.issues] == [i["key"] for i in expected]
+    assert len([u for u in server.requests if u.startswith("/api/issues/search")]) == 3
+    assert report.tools[0].version == "7.9.1"
+    assert report.issues[0].severity == SEVERITIES[5]
+    assert report.issues[0].project.identifier == server.project_key
+
+
+def test_load_max_results():
+    """
+    Test that no more than 10000 issues are requested
+    """
+    with FakeSonarQube(12000) as server:
+        report = SonarQubeLoader(loader_config(server, statuses="OPEN,CONFIRMED,REOPENED",
+                                               types="BUG,VULNERABILITY,CODE_SMELL")).load()
+    assert len(report.issues) == 10000
+
+
+def test_load_retry():
+    """
+    Test retrying failed requests
+    """
+    with FakeSonarQube(1234, error_pages=[2], error_status=429, retry_after="0") as server:
+        report = SonarQubeLoader(loader_config(server, backoff="0")).load()
+        assert len(report.issues) == 1234
+        assert len([u for u in server.requests if u.startswith("/api/issues/search")]) == 4
+
+
+def test_load_error():
+    """
+    Test loading issues from a failing server
+    """
+    with FakeSonarQube(1234, error_pages=[2]) as server:
+        with pytest.raises(LoadingError):
+            SonarQubeLoader(loader_config(server, retries="0")).load()
+    with FakeSonarQube(1234, error_rate=1) as server:
+        with pytest.raises(LoadingError):
+            SonarQubeLoader(loader_config(server, retries="2", backoff="0")).load()
+        assert len(server.requests) == 3
+
+
+def test_load_hotspots_and_rules(tmp_path):
+    """
+    Test loading security hotspots and resolving rules from the cache
+    """
+    with FakeSonarQube(1234, hotspots=700) as server:
+        config = loader_config(server, types="BUG,VULNERABILITY,CODE_SMELL,SECURITY_HOTSPOT",
+                               statuses="OPEN,CONFIRMED,REOPENED,TO_REVIEW")
+        loader = SonarQubeLoader(config)
+        loader.cache = ReportCache(str(tmp_path), 0)
+        report = loader.load()
+        hotspots = [h for h in server.hotspots if h["status"] == "TO_REVIEW"]
+        assert len(report.issues) == 1234 + len(hotspots)
+        # Distinct rules are requested once, by batch
+        assert len([u for u in server.requests if u.startswith("/api/rules/search")]) == 2
+        # Rules are loaded from the cache file on the next run
+        get_rules_cache.cache_clear()
+        loader = SonarQubeLoader(config)
+        loader.cache = ReportCache(str(tmp_path), 0)
+        assert len(loader.load().issues) == len(report.issues)
+        assert len([u for u in server.requests if u.startswith("/api/rules/search")]) == 2
+        summary = loader.count()
+    assert list(tmp_path.glob("sonarqube-rules-*.json"))
+    assert all(i.name == "Rule " + i.identifier for i in report.issues)
+    assert report.issues[0].description.startswith("Description of rule java:")
+    ranks = [SEVERITIES.index(i.severity) for i in report.issues]
+    assert ranks == sorted(ranks, reverse=True)
+    hotspot = next(i for i in report.issues if i.type == "SECURITY_HOTSPOT")
+    assert hotspot.confidence in ("HIGH", "MEDIUM", "LOW") and hotspot.category
+    assert summary.totals["sonarqube"] == len(report.issues)
+    assert summary.types["sonarqube", "SECURITY_HOTSPOT"] == len(hotspots)
+
+
+def test_load_hotspots_concurrently():
+    """
+    Test that issue pages are fetched while security hotspots are fetched
+    """
+    durations = {}
+    with FakeSonarQube(2000, hotspots=1500, latency=0.1) as server:
+        for types in ("BUG,VULNERABILITY,CODE_SMELL", "SECURITY_HOTSPOT",
+                      "BUG,VULNERABILITY,CODE_SMELL,SECURITY_HOTSPOT"):
+            get_rules_cache.cache_clear()
+            config = loader_config(server, types=types, rules_ttl="0",
+                                   statuses="OPEN,CONFIRMED,REOPENED,TO_REVIEW")
+            start = time.perf_counter()
+            SonarQubeLoader(config).load()
+            durations[types.count(",")] = time.perf_counter() - start
+    issues, hotspots, both = durations[2], durations[0], durations[3]
+    assert both < issues + hotspots - min(issues, hotspots) / 2
+
+
+def test_load_projects_and_branches():
+    """
+    Test loading issues from multiple projects and branches concurrently
+    """
+    projects = ["org.acme:lib-{}".format(i) for i in range(4)]
+    with FakeSonarQube(300, projects=projects + ["org.other:app"],
+                       branches=["release/1.0", "release/2.0", "feature/x"]) as server:
+        report = SonarQubeLoader(loader_config(
+            server, project_key="org.acme:lib-*,org.acme:acme-app",
+            branches="master,release/*", workers="4")).load()
+        expected = [i for i in server.issues if i["project"].startswith("org.acme:")
+                    and i.get("branch", "") != "feature/x"
+                    and i["status"] in ("OPEN", "CONFIRMED", "REOPENED")]
+        assert sorted(i.ref for i in report.issues) == sorted(i["key"] for i in expected)
+        assert len([u for u in server.requests if u.startswith("/api/projects/search")]) == 1
+        versions = {(i.project.identifier, i.project.version) for i in report.issues}
+        assert len(versions) == 5 * 3 and ("org.acme:lib-0", "release/2.0") in versions
+        ranks = [SEVERITIES.index(i.severity) for i in report.issues]
+        assert ranks == sorted(ranks, reverse=True)
+        summary = SonarQubeLoader(loader_config(
+            server, project_key="org.acme:lib-*", branches="release/1.0")).count()
+        assert summary.totals["sonarqube"] == len(
+            [i for i in expected if i["project"].startswith("org.acme:lib-")
+             and i.get("branch") == "release/1.0"])
+        with pytest.raises(LoadingError):
+            SonarQubeLoader(loader_config(server, project_key="org.acme:unknown")).load()
@@ -2,6 +2,7 @@
 Severity model tests.
 """
 
+import pickle
 from typing import Dict, List, Union
 
 from reportmix.models.severity import SEVERITIES, from_identifier, Severity
@@ -20,3 +21,11 @@ def test_from_identifier():
     ]
     for test in tests:
         assert from_identifier(test["value"]) == test["expected"]
+
+
+def test_pickle():
+    """
+    Test that unpickled severities are the existing constants
+    """
+    for severity in SEVERITIES:
+        assert pickle.loads(pickle.dumps(severity)) is severity
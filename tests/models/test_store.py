@@ -0,0 +1,76 @@
+"""
+Issue store model tests.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.generators import issues
+from reportmix.models import store as store_module
+from reportmix.models.store import IssueStore, MemoryBudget
+
+
+def test_spill():
+    """
+    Test that issues beyond the memory budget are spilled to disk and read back in order
+    """
+    expected = issues(500)
+    budget = MemoryBudget(64 * 1024)
+    store = IssueStore(budget, expected)
+    assert len(store) == 500
+    assert store.runs and store.file is not None
+    assert budget.used <= budget.limit
+    actual = list(store)
+    assert [i.identifier for i in actual] == [i.identifier for i in expected]
+    assert [i.severity for i in actual] == [i.severity for i in expected]
+    store.close()
+    assert not store and store.file is None and budget.used == 0
+
+
+def test_shared_budget():
+    """
+    Test that the largest stores sharing a budget are spilled when it is exceeded
+    """
+    budget = MemoryBudget(64 * 1024)
+    first = IssueStore(budget, issues(10))
+    second = IssueStore(budget)
+    second.extend(issues(500))
+    assert not first.runs and len(first.buffer) == 10
+    assert second.runs and budget.used <= budget.limit
+    assert len(list(first)) == 10 and len(list(second)) == 500
+
+
+def test_merge_passes(monkeypatch):
+    """
+    Test merging many sorted runs in multiple passes, with blocks fitting in the budget
+    """
+    monkeypatch.setattr(store_module, "MERGE_WAYS", 4)
+    expected = sorted(issues(3000), key=lambda i: (i.identifier, i.subject.identifier))
+    budget = MemoryBudget(64 * 1024)
+    store = IssueStore(budget, issues(3000), key=lambda i: (i.identifier, i.subject.identifier))
+    assert len(store.runs) > 4
+    block_size = store._block_size()  # pylint: disable=protected-access
+    assert 1 <= block_size < 1000
+    actual = list(store)
+    assert len(store.runs) < 4
+    assert [(i.identifier, i.subject.identifier) for i in actual] == \
+        [(i.identifier, i.subject.identifier) for i in expected]
+    assert len(list(store)) == 3000
+    store.close()
+
+
+@pytest.mark.parametrize("pread", [True, False])
+def test_concurrent_iterations(monkeypatch, pread):
+    """
+    Test iterating over spilled issues from multiple threads
+    """
+    if not pread:
+        monkeypatch.delattr(os, "pread", raising=False)
+    expected = [i.identifier for i in issues(5000)]
+    store = IssueStore(MemoryBudget(64 * 1024), issues(5000))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: [i.identifier for i in store], range(8)))
+    assert results == [expected] * 8
+    store.close()
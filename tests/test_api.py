@@ -0,0 +1,81 @@
+"""
+Library API tests.
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from benchmarks import generators
+from reportmix import api, json_backend
+from reportmix.errors import AppError
+from reportmix.mixer import ReportMixer
+from tests.helpers import mixer_config
+
+
+def test_merge(tmp_path):
+    """
+    Test that reports merged and exported in memory are the same as exported files
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 100)
+    generators.reportmix_csv(str(tmp_path / "mix.csv"), 50)
+    config = mixer_config(tmp_path, {"npm_audit": tmp_path / "npm.json",
+                                     "reportmix": tmp_path / "mix.csv"},
+                          formats="csv,json,html", sort="severity:desc")
+    ReportMixer(config).merge()
+
+    options = {"sort": "severity:desc", "meta.audit_date": "2021-01-01"}
+    npm_audit = json.loads((tmp_path / "npm.json").read_text(encoding="utf-8"))
+    with open(tmp_path / "mix.csv", "rb") as mix_file:
+        report = api.merge({"npm_audit": npm_audit, "reportmix": mix_file}, options)
+        assert not mix_file.closed
+    assert len(report.issues) == 150
+    for output_format in ["csv", "json", "html"]:
+        assert api.export(report, output_format) == \
+            (tmp_path / ("reportmix." + output_format)).read_bytes()
+    output = io.StringIO()
+    assert api.export(report, "ndjson", output=output) is None
+    assert len(output.getvalue().splitlines()) == 150
+
+    # Reload exported reports (bytes and text content)
+    issues = [i.to_dict() for i in report.issues]
+    for output_format in ["json", "ndjson"]:
+        content = api.export(report, output_format)
+        assert [i.to_dict() for i in api.load("reportmix", content).issues] == issues
+        assert [i.to_dict() for i in api.load("reportmix", content.decode()).issues] == issues
+
+
+def test_errors():
+    """
+    Test invalid inputs and options
+    """
+    with pytest.raises(AppError):
+        api.merge({"unknown": b""})
+    with pytest.raises(AppError):
+        api.merge({"sonarqube": b""})
+    with pytest.raises(AppError):
+        api.configure({"unknown": "value"})
+    with pytest.raises(AppError):
+        api.configure({"sort": "?"})
+
+
+def test_global_state(tmp_path, monkeypatch):
+    """
+    Test that merging reports does not configure logging nor change the JSON backend,
+    and that issues mapped to dictionaries are loaded
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 20)
+    monkeypatch.setattr(logging.root, "handlers", [])
+    previous = json_backend.use("json")
+    try:
+        report = api.merge({"npm_audit": (tmp_path / "npm.json").read_bytes()},
+                           {"json_backend": "auto"})
+        assert json_backend.backend == "json"
+    finally:
+        json_backend.use(previous)
+    assert logging.root.handlers == []
+    issues = [i.to_dict() for i in report.issues]
+    merged = api.merge({"reportmix": issues})
+    assert [i.to_dict() for i in merged.issues] == issues
@@ -0,0 +1,72 @@
+"""
+Archives and standard input tests.
+"""
+
+import io
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+from benchmarks import generators
+from reportmix import archive
+from reportmix.loader import find_files
+from reportmix.loaders.dependency_check import DependencyCheckLoader
+
+
+def load(report_file: str):
+    loader = DependencyCheckLoader({"report_file": report_file})
+    return [i.to_dict() for i in loader.load().issues]
+
+
+def test_members(tmp_path):
+    """
+    Test that reports are loaded from members of zip and tar archives
+    """
+    report_file = str(tmp_path / "dc.csv")
+    generators.dependency_check_csv(report_file, 10)
+    expected = load(report_file)
+    with zipfile.ZipFile(tmp_path / "artifacts.zip", "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.write(report_file, "reports/dependency-check-report.csv")
+    with tarfile.open(tmp_path / "artifacts.tar.gz", "w:gz") as tar_file:
+        tar_file.add(report_file, "reports/dependency-check-report.csv")
+    for archive_name in ["artifacts.zip", "artifacts.tar.gz"]:
+        member = str(tmp_path / archive_name) + "!/reports/dependency-check-report.csv"
+        assert find_files(str(tmp_path / archive_name) + "!/*/*.csv") == [member]
+        assert load(member) == expected
+    assert load(str(tmp_path / "artifacts.zip") + "!/*.csv,"
+                + str(tmp_path / "artifacts.tar.gz") + "!/*.csv") == expected * 2
+
+
+def test_stdin(tmp_path, monkeypatch):
+    """
+    Test that a report is loaded from the standard input
+    """
+    report_file = tmp_path / "dc.csv"
+    generators.dependency_check_csv(str(report_file), 10)
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(report_file.read_bytes())))
+    assert load("-") == load(str(report_file))
+
+
+def test_members_listing(tmp_path, monkeypatch):
+    """
+    Test that archives are listed once and only opening errors are wrapped
+    """
+    archive_path = str(tmp_path / "artifacts.zip")
+    with zipfile.ZipFile(archive_path, "w") as zip_file:
+        for index in range(3):
+            zip_file.writestr("reports/{}/dependency-check-report.csv".format(index), "")
+    listed = []
+    members = archive.members
+    monkeypatch.setattr(archive, "members", lambda p: listed.append(p) or members(p))
+    loader = DependencyCheckLoader({"report_file": archive_path + "!/*/*/*.csv,"
+                                                   + archive_path + "!/reports/0/x.csv"})
+    assert len(loader.report_files(".csv")) == 3
+    assert listed == [archive_path]
+    with pytest.raises(OSError):
+        with archive.open_binary(archive_path + "!/missing.csv"):
+            pass
+    with pytest.raises(KeyError):
+        with archive.open_binary(archive_path + "!/reports/0/dependency-check-report.csv"):
+            raise KeyError("Raised by the caller")
@@ -0,0 +1,38 @@
+"""
+Batch mode tests.
+"""
+
+from os import path
+
+from reportmix.batch import find_config_files, summary
+
+
+def test_find_config_files(tmp_path):
+    """
+    Test the find_config_files function
+    """
+    for project in ["a", "b"]:
+        (tmp_path / project).mkdir()
+        (tmp_path / project / ".reportmix").write_text("")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# Projects\nb/.reportmix\n\nc/.reportmix\n")
+    a_file, b_file = path.join(tmp_path, "a", ".reportmix"), path.join(tmp_path, "b", ".reportmix")
+    c_file = path.join(tmp_path, "c", ".reportmix")
+    tests = [
+        {"patterns": "", "result": []},
+        {"patterns": a_file, "result": [a_file]},
+        {"patterns": path.join(tmp_path, "*", ".reportmix"), "result": [a_file, b_file]},
+        {"patterns": "@" + str(manifest), "result": [b_file, c_file]},
+        {"patterns": "{}, @{}".format(b_file, manifest), "result": [b_file, c_file]},
+    ]
+    for test in tests:
+        assert find_config_files(test["patterns"]) == test["result"]
+
+
+def test_summary():
+    """
+    Test the summary function
+    """
+    assert summary("a", 2, 1, 0.12345)["status"] == "OK"
+    assert summary("a", 2, 1, 0.12345)["duration"] == 0.123
+    assert summary("a", error="Failed")["status"] == "FAILED"
@@ -0,0 +1,77 @@
+"""
+Report cache tests.
+"""
+
+import json
+import os
+
+from benchmarks import generators
+from reportmix.cache import ReportCache
+from reportmix.loaders.dependency_check import DependencyCheckLoader
+from reportmix.models.report import Report
+
+
+def test_key(tmp_path):
+    """
+    Test that the key changes with the file content and the loader configuration
+    """
+    report_file = tmp_path / "report.csv"
+    report_file.write_text("a")
+    cache = ReportCache(str(tmp_path / "cache"), 0)
+    key = cache.key(str(report_file), "Loader", "1", {"a": "1"})
+    assert cache.key(str(report_file), "Loader", "1", {"a": "1"}) == key
+    assert cache.key(str(report_file), "Loader", "2", {"a": "1"}) != key
+    assert cache.key(str(report_file), "Loader", "1", {"a": "2"}) != key
+    report_file.write_text("b")
+    assert cache.key(str(report_file), "Loader", "1", {"a": "1"}) != key
+
+
+def test_eviction(tmp_path):
+    """
+    Test that least recently used entries are evicted beyond the size limit
+    """
+    cache = ReportCache(str(tmp_path), 0)
+    cache.put("a", Report([], []))
+    entry_size = os.path.getsize(cache.entries()[0])
+    cache.max_size = 2 * entry_size
+    cache.put("b", Report([], []))
+    os.utime(tmp_path / "a.pickle", ns=(0, 0))
+    assert cache.get("b") is not None  # Recently used
+    cache.put("c", Report([], []))
+    assert sorted(os.path.basename(e) for e in cache.entries()) == ["b.pickle", "c.pickle"]
+    assert cache.get("a") is None
+
+
+def test_loader(tmp_path):
+    """
+    Test that unchanged report files are loaded from the cache
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 10)
+    cache = ReportCache(str(tmp_path / "cache"), 0)
+    issues = []
+    for _ in range(2):
+        loader = DependencyCheckLoader({"report_file": str(tmp_path / "dc.csv")})
+        loader.cache = cache
+        issues.append([i.to_dict() for i in loader.load().issues])
+        assert [t.identifier for t in loader.tools] == ["dependency_check"]
+    assert issues[0] == issues[1] and len(issues[0]) == 10
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_loader_related_files(tmp_path):
+    """
+    Test that cached reports are invalidated when a related file changes
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 10)
+    cache = ReportCache(str(tmp_path / "cache"), 0)
+    versions = []
+    for engine_version in [None, "6.0.0", None, "6.1.0"]:
+        if engine_version is not None:  # None: unchanged
+            (tmp_path / "dc.json").write_text(json.dumps(
+                {"scanInfo": {"engineVersion": engine_version}, "projectInfo": {}}))
+        loader = DependencyCheckLoader({"report_file": str(tmp_path / "dc.csv")})
+        loader.cache = cache
+        loader.load()
+        versions.append(loader.tools[0].version)
+    assert versions == ["", "6.0.0", "6.0.0", "6.1.0"]
+    assert (cache.hits, cache.misses) == (1, 3)
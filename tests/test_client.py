@@ -0,0 +1,40 @@
+"""
+HTTP client tests.
+"""
+
+import time
+from email.utils import formatdate
+
+import requests
+
+from reportmix.client import RateLimiter, retry_after
+
+
+def test_rate_limiter():
+    """
+    Test RateLimiter.acquire()
+    """
+    limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+    unlimited = RateLimiter(0)
+    start = time.monotonic()
+    for _ in range(100):
+        unlimited.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_retry_after():
+    """
+    Test the retry_after function
+    """
+    resp = requests.Response()
+    assert retry_after(resp) is None
+    resp.headers["Retry-After"] = "3"
+    assert retry_after(resp) == 3
+    resp.headers["Retry-After"] = formatdate(time.time() + 60, usegmt=True)
+    assert 55 < retry_after(resp) <= 60
+    resp.headers["Retry-After"] = "soon"
+    assert retry_after(resp) is None
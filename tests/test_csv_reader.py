@@ -0,0 +1,95 @@
+"""
+CSV reports reader tests.
+"""
+
+import io
+import random
+import time
+
+import pytest
+
+from benchmarks import generators
+from reportmix import csv_reader
+from reportmix.csv_reader import CsvReader
+from reportmix.errors import LoadingError
+from reportmix.loaders.dependency_check import DependencyCheckLoader
+from reportmix.loaders.reportmix import ReportMixLoader
+
+
+def test_read():
+    """
+    Test reading selected columns as tuples
+    """
+    report = io.StringIO('a,b,c\r\n1,"x,y",3\r\n\r\n4,5\r\n')
+    rows = list(CsvReader(report, ["c", "a", "missing"], ["a"]))
+    assert rows == [("3", "1", None), (None, "4", None)]
+
+
+def test_missing_column():
+    """
+    Test that required columns are validated once from the header
+    """
+    with pytest.raises(LoadingError):
+        CsvReader(io.StringIO("a,b\r\n1,2\r\n"), ["a", "c"], ["a", "c"])
+
+
+def test_read_parallel(tmp_path, monkeypatch):
+    """
+    Test parsing byte ranges of a file in parallel (with quoted newlines and quotes)
+    """
+    report_file = tmp_path / "report.csv"
+    lines = ['a,b,c\r\n'] + ['{0},"line\n{0} ""quoted"",\nend",x{0}\r\n'.format(i) if i % 3
+                             else '{0},plain,\r\n\r\n'.format(i) for i in range(500)]
+    report_file.write_text("".join(lines), encoding="utf-8", newline="")
+    with open(report_file, encoding="utf-8", newline="") as file:
+        expected = list(CsvReader(file, ["c", "b", "a"]))
+    monkeypatch.setattr(csv_reader, "RANGE_SIZE", 97)
+    monkeypatch.setattr(csv_reader, "WORKERS", 3)
+    with open(report_file, encoding="utf-8", newline="") as file:
+        reader = CsvReader(file, ["c", "b", "a"])
+        assert reader.file_path == str(report_file)
+        assert list(reader) == expected
+    assert len(expected) == 500 and expected[1] == ("x1", 'line\n1 "quoted",\nend', "1")
+
+
+def test_scan_range(tmp_path):
+    """
+    Test finding record boundaries in byte ranges (with sparse quotes)
+    """
+    rand = random.Random(42)
+    content = "".join(rand.choice('ab,\n"') if rand.random() < 0.05 else "x"
+                      for _ in range(5000)).encode()
+    report_file = tmp_path / "report.csv"
+    report_file.write_bytes(content)
+    for start, end in [(0, 5000), (0, 0), (17, 900), (2500, 5000)] + \
+            [sorted(rand.sample(range(5001), 2)) for _ in range(50)]:
+        boundaries = [None, None]
+        for i in range(start, end):
+            if content[i:i + 1] == b"\n":
+                parity = content[start:i].count(b'"') % 2
+                if boundaries[parity] is None:
+                    boundaries[parity] = i + 1
+        assert csv_reader.scan_range(str(report_file), start, end) == \
+            (content[start:end].count(b'"'), boundaries)
+    # Lines between distant quotes are skipped
+    report_file.write_bytes((b"x\n" * 2 * 1024 * 1024 + b'"') * 2)
+    begin = time.perf_counter()
+    assert csv_reader.scan_range(str(report_file), 0, 8 * 1024 * 1024 + 2) == \
+        (2, [2, 4 * 1024 * 1024 + 3])
+    assert time.perf_counter() - begin < 1
+
+
+@pytest.mark.parametrize("loader,generator", [
+    (DependencyCheckLoader, generators.dependency_check_csv),
+    (ReportMixLoader, generators.reportmix_csv)])
+def test_load_parallel(tmp_path, monkeypatch, loader, generator):
+    """
+    Test that loaders parse large CSV reports in parallel as in a single process
+    """
+    generator(str(tmp_path / "report.csv"), 1000)
+    expected = loader({"report_file": str(tmp_path / "report.csv")}).load()
+    monkeypatch.setattr(csv_reader, "RANGE_SIZE", 16 * 1024)
+    monkeypatch.setattr(csv_reader, "WORKERS", 4)
+    report = loader({"report_file": str(tmp_path / "report.csv")}).load()
+    assert [i.to_dict() for i in report.issues] == [i.to_dict() for i in expected.issues]
+    assert [t.version for t in report.tools] == [t.version for t in expected.tools]
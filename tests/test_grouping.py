@@ -0,0 +1,91 @@
+"""
+Issues grouping tests.
+"""
+
+import pytest
+
+from benchmarks import generators
+from reportmix.errors import AppError, GateError
+from reportmix.grouping import group_issues, parse_group_by
+from reportmix.mixer import ReportMixer, export_fields
+from reportmix.sorting import SEVERITY_ORDINALS
+from tests.helpers import mixer_config
+
+
+def test_group_issues():
+    """
+    Test grouping issues by identifier
+    """
+    issues = generators.issues(1000)
+    groups = group_issues(issues, ["identifier"])
+    assert len(groups) == len({i.identifier for i in issues}) < len(issues)
+    assert sum(g.evidences for g in groups) == sum(i.evidences for i in issues)
+    assert sum(g.count for g in groups) == len(issues)
+    for group in groups:
+        members = [i for i in issues if i.identifier == group.identifier]
+        assert group.description == members[0].description
+        assert SEVERITY_ORDINALS[group.severity] == max(SEVERITY_ORDINALS[i.severity]
+                                                        for i in members)
+        assert group.subject.identifier.split(", ") == \
+            list(dict.fromkeys(i.subject.identifier for i in members))
+    assert issues[0].evidences != groups[0].evidences  # Issues are not modified
+    assert not hasattr(issues[0], "count")
+    with pytest.raises(AppError):
+        parse_group_by("identifier,unknown")
+
+
+def test_group_count_and_hash():
+    """
+    Test that the group size is counted apart from evidences and that group hashes
+    do not collide when key values are concatenated
+    """
+    issues = generators.issues(3)
+    issues[0].identifier, issues[0].subject.identifier, issues[0].evidences = "ab", "c", 5
+    issues[1].identifier, issues[1].subject.identifier, issues[1].evidences = "a", "bc", 5
+    issues[2].identifier, issues[2].subject.identifier, issues[2].evidences = "ab", "c", 2
+    groups = group_issues(issues, ["identifier", "subject_identifier"])
+    assert [(g.count, g.evidences) for g in groups] == [(2, 7), (1, 5)]
+    assert groups[0].hash != groups[1].hash
+
+
+def test_group_by(tmp_path):
+    """
+    Test that the streaming mode exports the same grouped reports as the default mode
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 500)
+    outputs = {}
+    for stream in ["false", "true"]:
+        (tmp_path / stream).mkdir()
+        config = mixer_config(tmp_path / stream, {"npm_audit": tmp_path / "npm.json"},
+                              stream=stream, formats="csv,html", group_by="identifier",
+                              sort="severity:desc")
+        mixer = ReportMixer(config)
+        mixer.merge()
+        assert 0 < mixer.count < 500
+        outputs[stream] = {f: (tmp_path / stream / ("reportmix." + f)).read_bytes()
+                           for f in ["csv", "html"]}
+    assert outputs["false"] == outputs["true"]
+    assert b",confidence,evidences,count,source," in outputs["true"]["csv"]
+    # The number of grouped issues is only exported with grouped issues
+    assert "count" not in export_fields("all")
+    assert export_fields("identifier,count") == ["identifier"]
+    assert export_fields("identifier,count", True) == ["identifier", "count"]
+
+
+def test_gate_group_by(tmp_path):
+    """
+    Test that the quality gate counts issues before grouping in all modes
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 500)
+    severities = {}
+    for mode in ["summary", "stream", "default"]:
+        config = mixer_config(tmp_path, {"npm_audit": tmp_path / "npm.json"},
+                              summary=str(mode == "summary").lower(),
+                              stream=str(mode == "stream").lower(),
+                              formats="csv", group_by="identifier", fail_on="LOW:499")
+        mixer = ReportMixer(config)
+        with pytest.raises(GateError, match="LOW"):
+            mixer.run()
+        assert sum(mixer.summary.totals.values()) == 500
+        severities[mode] = mixer.summary.severities
+    assert severities["summary"] == severities["stream"] == severities["default"]
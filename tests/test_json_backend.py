@@ -0,0 +1,43 @@
+"""
+JSON backend tests.
+"""
+
+import json
+
+import pytest
+
+from benchmarks import generators
+from reportmix import json_backend
+from reportmix.errors import AppError
+
+
+@pytest.mark.parametrize("backend", json_backend.available())
+def test_dumps(backend):
+    """
+    Test that each backend serializes issues (dates, severities) as json.dumps() with default=str
+    """
+    issues = [i.to_dict() for i in generators.issues(300)]
+    issues[0]["description"] = "Ünïcode \"quoted\" </script>  "
+    previous = json_backend.use(backend)
+    try:
+        for issue in issues:
+            output = json_backend.dumps(issue)
+            assert json.loads(output) == json.loads(json.dumps(issue, default=str))
+            assert json_backend.loads(output) == json.loads(output)
+    finally:
+        json_backend.use(previous)
+
+
+def test_use():
+    """
+    Test selecting a backend
+    """
+    previous = json_backend.use("json")
+    try:
+        assert json_backend.backend == "json"
+        assert json_backend.use("auto") == "json"
+        assert json_backend.backend == json_backend.available()[0]
+        with pytest.raises(AppError):
+            json_backend.use("unknown")
+    finally:
+        json_backend.use(previous)
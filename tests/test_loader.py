@@ -0,0 +1,38 @@
+"""
+Report loader tests.
+"""
+
+from os import path
+
+from benchmarks import generators
+from reportmix.loader import find_files
+from reportmix.loaders.dependency_check import DependencyCheckLoader
+
+
+def test_find_files(tmp_path):
+    """
+    Test the find_files function
+    """
+    for name in ["b.csv", "a.csv", "c.json"]:
+        (tmp_path / name).write_text("")
+    a_file, b_file = path.join(tmp_path, "a.csv"), path.join(tmp_path, "b.csv")
+    missing_file = path.join(tmp_path, "missing.csv")
+    assert find_files("") == []
+    assert find_files(path.join(tmp_path, "*.csv")) == [a_file, b_file]
+    assert find_files("{}, {}".format(b_file, missing_file)) == [b_file, missing_file]
+    assert find_files("{},{}".format(path.join(tmp_path, "?.csv"), a_file)) == [a_file, b_file]
+
+
+def test_load_files(tmp_path):
+    """
+    Test loading multiple report files in parallel, merged by path
+    """
+    for name, count in [("b.csv", 30), ("a.csv", 20)]:
+        generators.dependency_check_csv(str(tmp_path / name), count, seed=count)
+    single = {name: DependencyCheckLoader({"report_file": str(tmp_path / name)}).load()
+              for name in ["a.csv", "b.csv"]}
+    report = DependencyCheckLoader({"report_file": str(tmp_path / "*.csv")}).load()
+    expected = single["a.csv"].issues + single["b.csv"].issues
+    assert [i.identifier for i in report.issues] == [i.identifier for i in expected]
+    assert [i.subject.location for i in report.issues] == [i.subject.location for i in expected]
+    assert len(report.tools) == 1
@@ -0,0 +1,100 @@
+"""
+Report mixer tests.
+"""
+
+import itertools
+
+import pytest
+
+from benchmarks import generators
+from reportmix.errors import LoadingError
+from reportmix.mixer import ReportMixer
+from reportmix.models.store import IssueStore
+from tests.helpers import mixer_config
+
+
+def test_stream(tmp_path):
+    """
+    Test that the streaming mode exports the same reports as the default mode
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 200)
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 50)
+    outputs = {}
+    for stream in ["false", "true"]:
+        (tmp_path / stream).mkdir()
+        config = mixer_config(tmp_path / stream, {"dependency_check": tmp_path / "dc.csv",
+                                                  "npm_audit": tmp_path / "npm.json"},
+                              stream=stream, formats="csv,json,ndjson,html")
+        mixer = ReportMixer(config)
+        report = mixer.merge()
+        assert mixer.count == 250
+        assert [t.identifier for t in report.tools] == ["dependency_check", "npm_audit"]
+        outputs[stream] = {f: (tmp_path / stream / ("reportmix." + f)).read_bytes()
+                           for f in ["csv", "json", "ndjson", "html"]}
+    assert outputs["false"] == outputs["true"]
+    assert outputs["true"]["ndjson"].count(b"\n") == 250
+
+
+def test_load_store(tmp_path, monkeypatch):
+    """
+    Test that loaded issues are streamed to issue stores with a memory limit
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 50)
+    config = mixer_config(tmp_path, {"npm_audit": tmp_path / "npm.json"}, formats="csv",
+                          memory_limit="1")
+    mixer = ReportMixer(config)
+
+    def load():
+        raise AssertionError("Full report loaded")
+
+    monkeypatch.setattr(mixer.loaders["npm_audit"], "load", load)
+    report = mixer.merge()
+    assert isinstance(mixer.reports["npm_audit"].issues, IssueStore)
+    assert len(mixer.reports["npm_audit"].issues) == 50 == mixer.count
+    assert [t.identifier for t in report.tools] == ["npm_audit"]
+
+
+def test_partial_load(tmp_path, monkeypatch, caplog):
+    """
+    Test that issues loaded before a loading error are kept in both modes
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 50)
+    outputs = {}
+    for stream in ["false", "true"]:
+        (tmp_path / stream).mkdir()
+        config = mixer_config(tmp_path / stream, {"npm_audit": tmp_path / "npm.json"},
+                              stream=stream, formats="csv,json")
+        mixer = ReportMixer(config)
+        loader = mixer.loaders["npm_audit"]
+        iter_issues = loader.iter_issues
+
+        def fail():
+            yield from itertools.islice(iter_issues(), 20)
+            raise LoadingError("Connection lost")
+
+        monkeypatch.setattr(loader, "iter_issues", fail)
+        report = mixer.merge()
+        assert mixer.count == 20
+        assert [t.identifier for t in report.tools] == ["npm_audit"]
+        assert "npm_audit report partially loaded (20 issue(s)" in caplog.text
+        outputs[stream] = {f: (tmp_path / stream / ("reportmix." + f)).read_bytes()
+                           for f in ["csv", "json"]}
+    assert outputs["false"] == outputs["true"]
+
+
+@pytest.mark.parametrize("stream", ["false", "true"])
+def test_profile_meta_hash(tmp_path, stream):
+    """
+    Test that metadata and hash time is profiled across loaders
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 20)
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 10)
+    config = mixer_config(tmp_path, {"dependency_check": tmp_path / "dc.csv",
+                                     "npm_audit": tmp_path / "npm.json"},
+                          formats="csv", stream=stream, profile="table")
+    mixer = ReportMixer(config)
+    mixer.merge()
+    stages = [s["stage"] for s in mixer.profiler.stages]
+    assert stages.count("meta_hash") == 1
+    meta_hash = mixer.profiler.stages[stages.index("meta_hash")]
+    assert meta_hash["level"] == 1 and meta_hash["wall"] > 0
@@ -0,0 +1,123 @@
+"""
+NVD feeds enrichment tests.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from benchmarks import generators
+from reportmix.batch import BatchMixer
+from reportmix.config.builder import ConfigBuilder
+from reportmix.errors import AppError
+from reportmix.mixer import ReportMixer
+from reportmix.nvd import NvdIndex
+from tests.helpers import mixer_config
+
+
+def feed_item(cve, score, severity, modified):
+    """
+    Build a feed item (NVD JSON 1.1 schema).
+    """
+    return {
+        "cve": {"CVE_data_meta": {"ID": cve},
+                "problemtype": {"problemtype_data": [
+                    {"description": [{"value": "CWE-79"}, {"value": "NVD-CWE-Other"}]}]}},
+        "impact": {"baseMetricV3": {"cvssV3": {"baseScore": score, "baseSeverity": severity}}},
+        "publishedDate": "2021-03-04T05:15Z",
+        "lastModifiedDate": modified
+    }
+
+
+def write_feed(file_path, items):
+    """
+    Write a feed file.
+    """
+    opener = gzip.open if file_path.endswith(".gz") else open
+    with opener(file_path, "wt", encoding="utf-8") as file:
+        json.dump({"CVE_Items": items}, file)
+
+
+def test_index(tmp_path):
+    """
+    Test incremental updates of the index
+    """
+    feeds = tmp_path / "feeds"
+    feeds.mkdir()
+    write_feed(str(feeds / "nvdcve-1.1-2021.json.gz"), [
+        feed_item("CVE-2021-0001", 5.0, "MEDIUM", "2021-03-04T05:15Z"),
+        feed_item("CVE-2021-0002", 7.5, "HIGH", "2021-03-04T05:15Z")])
+    index = NvdIndex(str(tmp_path / "nvd.db"))
+    assert index.update(str(feeds)) == 1
+    assert index.update(str(feeds)) == 0
+    assert index.lookup(["CVE-2021-0001", "CVE-2021-9999"]) == {
+        "CVE-2021-0001": ("5.0", "MEDIUM", "CWE-79", "2021-03-04T05:15Z")}
+    # Only more recent entries replace indexed ones
+    write_feed(str(feeds / "nvdcve-1.1-modified.json"), [
+        feed_item("CVE-2021-0001", 9.8, "CRITICAL", "2021-06-01T00:00Z"),
+        feed_item("CVE-2021-0002", 1.0, "LOW", "2021-01-01T00:00Z")])
+    assert index.update(str(feeds)) == 1
+    assert {k: v[0] for k, v in index.lookup(["CVE-2021-0001", "CVE-2021-0002"]).items()} == \
+        {"CVE-2021-0001": "9.8", "CVE-2021-0002": "7.5"}
+    index.close()
+    # The index is kept between runs
+    os.utime(feeds / "nvdcve-1.1-modified.json")
+    assert NvdIndex(str(tmp_path / "nvd.db")).update(str(feeds)) == 1
+
+
+def test_enrich(tmp_path):
+    """
+    Test filling missing fields of issues
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 200)
+    with open(tmp_path / "npm.json", encoding="utf-8") as file:
+        cves = sorted({c for a in json.load(file)["advisories"].values() for c in a["cves"]})
+    feeds = tmp_path / "feeds"
+    feeds.mkdir()
+    write_feed(str(feeds / "nvdcve-1.1-recent.json"),
+               [feed_item(c, 9.1, "CRITICAL", "2021-03-04T05:15Z") for c in cves[::2]])
+    config = mixer_config(tmp_path, {"npm_audit": tmp_path / "npm.json"}, formats="csv",
+                          nvd_dir=str(feeds))
+    mixer = ReportMixer(config)
+    report = mixer.merge()
+    enriched = [i for i in report.issues if i.identifier in cves[::2]]
+    assert enriched and mixer.enricher.count == len(enriched)
+    for issue in enriched:
+        assert issue.score == "9.1"
+        # Existing values are kept
+        assert issue.source_date != datetime(2021, 3, 4, 5, 15)
+    assert all(not i.score for i in report.issues if i.identifier not in cves[::2])
+    assert (feeds / "reportmix-nvd.db").exists()
+
+
+def test_batch(tmp_path):
+    """
+    Test that the index is updated once before merging projects concurrently
+    (worker processes open it in read-only mode)
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 50)
+    feeds = tmp_path / "feeds"
+    feeds.mkdir()
+    write_feed(str(feeds / "nvdcve-1.1-recent.json"),
+               [feed_item("CVE-2021-0001", 9.1, "CRITICAL", "2021-03-04T05:15Z")])
+    with pytest.raises(AppError):
+        ReportMixer(mixer_config(tmp_path, nvd_dir=str(feeds)), update_nvd=False)
+    for project in ["a", "b", "c", "d"]:
+        (tmp_path / project).mkdir()
+        (tmp_path / project / ".reportmix").write_text(
+            "[global]\nformats = csv\nnvd_dir = ../feeds\n"
+            "[npm_audit]\nreport_file = ../npm.json\n[sonarqube]\nhost_url =\n")
+    builder = ConfigBuilder("test")
+    builder.console_config = {"verbose": False}
+    config = mixer_config(tmp_path, batch=str(tmp_path / "*" / ".reportmix"), jobs="4")
+    results = BatchMixer(builder, config).merge()
+    assert [r["status"] for r in results] == ["OK"] * 4
+    index = NvdIndex(str(feeds / "reportmix-nvd.db"), read_only=True)
+    assert index.lookup(["CVE-2021-0001"])
+    write_feed(str(feeds / "nvdcve-1.1-modified.json"), [])
+    with pytest.raises(AppError):
+        index.update(str(feeds))
+    index.close()
@@ -0,0 +1,60 @@
+"""
+Profiler tests.
+"""
+
+import json
+import time
+
+from reportmix.profiler import Profiler
+
+
+def test_stage(tmp_path):
+    """
+    Test Profiler.stage() with nested stages
+    """
+    profiler = Profiler()
+    with profiler.stage("merge"):
+        with profiler.stage("load"):
+            data = [0] * 100000
+        del data
+    assert [s["stage"] for s in profiler.stages] == ["merge", "load"]
+    assert [s["level"] for s in profiler.stages] == [0, 1]
+    assert profiler.stages[1]["peak_memory"] >= 800000
+    assert profiler.stages[0]["peak_memory"] >= profiler.stages[1]["peak_memory"]
+    assert profiler.stages[0]["wall"] >= profiler.stages[1]["wall"]
+    profiler.write(str(tmp_path / "profile.json"))
+    assert json.loads((tmp_path / "profile.json").read_text()) == profiler.stages
+
+
+def test_disabled():
+    """
+    Test a disabled profiler
+    """
+    profiler = Profiler(False)
+    with profiler.stage("merge"):
+        pass
+    assert not profiler.stages
+
+
+def test_accumulate():
+    """
+    Test accumulating measures of a stage run in many parts, interleaved with other stages
+    """
+    profiler = Profiler()
+    with profiler.stage("meta_hash", True):
+        pass
+    assert not profiler.stages
+    with profiler.stage("load"):
+        for name in ["a", "b"]:
+            with profiler.stage(name):
+                for _ in range(3):
+                    with profiler.stage("meta_hash", True):
+                        time.sleep(0.01)
+    assert [(s["stage"], s["level"]) for s in profiler.stages] == \
+        [("load", 0), ("a", 1), ("meta_hash", 1), ("b", 1)]
+    assert profiler.stages[2]["wall"] >= 0.06
+    assert profiler.stages[3]["wall"] >= 0.03
+    with profiler.stage("stream"):
+        with profiler.stage("meta_hash", True):
+            pass
+    assert [s["stage"] for s in profiler.stages[4:]] == ["stream", "meta_hash"]
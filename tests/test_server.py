@@ -0,0 +1,152 @@
+"""
+Report server tests.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from reportmix.config.builder import ConfigBuilder, GLOBAL_CONFIG
+from reportmix.errors import RequestError
+from reportmix.mixer import ReportMixer
+from reportmix.server import ReportServer
+
+#
+# Data
+#
+
+REPORTMIX_CSV = """identifier,name,severity,tool_identifier,tool_name,subject_identifier
+CVE-1,Issue 1,HIGH,dependency_check,Dependency-Check,lib-a
+CVE-2,Issue 2,LOW,dependency_check,Dependency-Check,lib-b
+"""
+
+
+#
+# Tests
+#
+
+def test_server(tmp_path):
+    """
+    Test uploading, merging and fetching reports
+    """
+    config = ConfigBuilder("test").defaults()
+    config[GLOBAL_CONFIG]["output_dir"] = str(tmp_path)
+    config[GLOBAL_CONFIG]["formats"] = "csv,json"
+    server = ReportServer(config, ThreadPoolExecutor(max_workers=2))
+
+    async def scenario():
+        async with await server.start("127.0.0.1", 0) as http_server:
+            port = http_server.sockets[0].getsockname()[1]
+            loop = asyncio.get_running_loop()
+
+            def request(method, url, body=None):
+                req = Request("http://127.0.0.1:{}{}".format(port, url), body, method=method)
+                try:
+                    with urlopen(req) as resp:
+                        return resp.status, resp.read()
+                except HTTPError as err:
+                    return err.code, err.read()
+
+            async def call(method, url, body=None):
+                return await loop.run_in_executor(None, request, method, url, body)
+
+            upload = await call("PUT", "/projects/app/reports/reportmix", REPORTMIX_CSV.encode())
+            assert upload[0] == 200 and json.loads(upload[1])["issues"] == 2
+            assert (await call("PUT", "/projects/app/reports/sonarqube", b""))[0] == 404
+            assert (await call("PUT", "/projects/app/reports/npm_audit", b"{"))[0] == 400
+            assert (await call("GET", "/projects/app/reportmix.csv"))[0] == 404
+            merge = await call("POST", "/projects/app/merge")
+            assert merge[0] == 200 and json.loads(merge[1])["issues"] == 2
+            output = await call("GET", "/projects/app/reportmix.json")
+            assert output[0] == 200
+            assert [i["identifier"] for i in json.loads(output[1])] == ["CVE-1", "CVE-2"]
+            assert (await call("GET", "/projects/app/merge"))[0] == 405
+            assert (await call("POST", "/projects/other/merge"))[0] == 404
+
+    asyncio.run(scenario())
+    assert (tmp_path / "app" / "reportmix.csv").exists()
+
+
+def test_server_limits(tmp_path):
+    """
+    Test rejecting invalid project names and too large request bodies
+    """
+    config = ConfigBuilder("test").defaults()
+    config[GLOBAL_CONFIG]["output_dir"] = str(tmp_path / "out")
+    config[GLOBAL_CONFIG]["serve_max_size"] = "1"
+    server = ReportServer(config, ThreadPoolExecutor(max_workers=1))
+
+    async def scenario():
+        async with await server.start("127.0.0.1", 0) as http_server:
+            port = http_server.sockets[0].getsockname()[1]
+
+            async def call(method, url, length=0):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write("{} {} HTTP/1.1\r\nContent-Length: {}\r\n\r\n"
+                             .format(method, url, length).encode("latin-1"))
+                await writer.drain()
+                status = int((await reader.readline()).split()[1])
+                writer.close()
+                return status
+
+            assert await call("PUT", "/projects/../reports/reportmix") == 404
+            assert await call("GET", "/projects/../reportmix.csv") == 404
+            assert await call("GET", "/projects/.hidden/reportmix.csv") == 404
+            assert await call("PUT", "/projects/app/reports/reportmix", 2 * 1024 * 1024) == 413
+
+    asyncio.run(scenario())
+    assert not (tmp_path / "reportmix.csv").exists()
+    with pytest.raises(RequestError):
+        server.project_dir("..")
+
+
+def test_server_concurrency(tmp_path, monkeypatch):
+    """
+    Test that uploaded reports are prepared without blocking other requests
+    """
+    config = ConfigBuilder("test").defaults()
+    config[GLOBAL_CONFIG]["output_dir"] = str(tmp_path)
+    server = ReportServer(config, ThreadPoolExecutor(max_workers=1))
+    preparing, release = threading.Event(), threading.Event()
+    set_report = ReportMixer.set_report
+
+    def blocking_set_report(self, *args, **kwargs):
+        preparing.set()
+        if not release.wait(5):
+            raise RuntimeError("Other requests were not served")
+        return set_report(self, *args, **kwargs)
+
+    monkeypatch.setattr(ReportMixer, "set_report", blocking_set_report)
+
+    async def scenario():
+        async with await server.start("127.0.0.1", 0) as http_server:
+            port = http_server.sockets[0].getsockname()[1]
+            loop = asyncio.get_running_loop()
+
+            def request(method, url, body=None):
+                req = Request("http://127.0.0.1:{}{}".format(port, url), body, method=method)
+                try:
+                    with urlopen(req) as resp:
+                        return resp.status
+                except HTTPError as err:
+                    return err.code
+
+            upload = loop.run_in_executor(None, request, "PUT",
+                                          "/projects/app/reports/reportmix",
+                                          REPORTMIX_CSV.encode())
+            await loop.run_in_executor(None, preparing.wait, 10)
+            # Served while the uploaded report is prepared
+            assert await loop.run_in_executor(None, request, "GET",
+                                              "/projects/other/reportmix.csv") == 404
+            release.set()
+            assert await upload == 200
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
@@ -0,0 +1,72 @@
+"""
+Merged report sharding tests.
+"""
+
+import csv
+import json
+
+from benchmarks import generators
+from reportmix.mixer import ReportMixer
+from reportmix.models.issue import FLAT_FIELDS
+from reportmix.sharding import split
+from tests.helpers import mixer_config
+
+
+def test_split():
+    """
+    Test splitting issues by field value and number of issues
+    """
+    issues = generators.issues(100)
+    shards = split(issues, "tool_identifier", 20, 0, FLAT_FIELDS)
+    assert [(s.name, s.count) for s in shards] == [
+        ("reportmix-dependency_check-1", 20), ("reportmix-npm_audit-1", 20),
+        ("reportmix-sonarqube-1", 20), ("reportmix-dependency_check-2", 14),
+        ("reportmix-npm_audit-2", 13), ("reportmix-sonarqube-2", 13)]
+    assert all(i.tool.identifier == s.value for s in shards for i in s.issues)
+    shards = split(issues, "", 0, 10000, FLAT_FIELDS)
+    assert len(shards) > 1 and [s.name for s in shards][:2] == ["reportmix-1", "reportmix-2"]
+    assert [i for s in shards for i in s.issues] == issues
+
+
+def test_export_shards(tmp_path):
+    """
+    Test exporting shards and the index
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 200)
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 50)
+    config = mixer_config(tmp_path, {"dependency_check": tmp_path / "dc.csv",
+                                     "npm_audit": tmp_path / "npm.json"},
+                          formats="csv,html", shard_by="tool_identifier", shard_rows="150")
+    ReportMixer(config).merge()
+    index = json.loads((tmp_path / "reportmix-index.json").read_text())
+    assert index["count"] == 250
+    assert [(s["name"], s["count"]) for s in index["shards"]] == [
+        ("reportmix-dependency_check-1", 150), ("reportmix-dependency_check-2", 50),
+        ("reportmix-npm_audit-1", 50)]
+    for shard in index["shards"]:
+        assert shard["files"] == [shard["name"] + ".csv", shard["name"] + ".html"]
+        with open(tmp_path / shard["files"][0], newline="", encoding="utf-8") as file:
+            assert len(list(csv.DictReader(file))) == shard["count"]
+        assert (tmp_path / shard["files"][1]).exists()
+    assert not (tmp_path / "reportmix.csv").exists()
+
+
+def test_export_shards_spilled(tmp_path):
+    """
+    Test exporting shards of spilled issues in multiple formats concurrently
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 3000)
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 500)
+    outputs = {}
+    for memory_limit in ["0", "1"]:
+        (tmp_path / memory_limit).mkdir()
+        config = mixer_config(tmp_path / memory_limit,
+                              {"dependency_check": tmp_path / "dc.csv",
+                               "npm_audit": tmp_path / "npm.json"},
+                              formats="csv,json,ndjson", shard_by="tool_identifier",
+                              memory_limit=memory_limit, jobs="4")
+        ReportMixer(config).merge()
+        outputs[memory_limit] = {f.name: f.read_bytes()
+                                 for f in (tmp_path / memory_limit).iterdir()}
+    assert len(outputs["1"]) == 7
+    assert outputs["0"] == outputs["1"]
@@ -0,0 +1,56 @@
+"""
+Issues sorting tests.
+"""
+
+import pytest
+
+from benchmarks.generators import issues
+from reportmix.errors import AppError
+from reportmix.models.store import IssueStore, MemoryBudget
+from reportmix.sorting import parse_sort, sort_groups, sort_key
+
+
+def test_parse_sort():
+    """
+    Test the parse_sort function
+    """
+    assert not parse_sort("")
+    assert parse_sort("severity:desc,tool_name,subject_identifier:asc") == [
+        ("severity", True), ("tool_name", False), ("subject_identifier", False)]
+    with pytest.raises(AppError):
+        parse_sort("unknown")
+    with pytest.raises(AppError):
+        parse_sort("severity:up")
+
+
+def test_sort_key():
+    """
+    Test that issues are sorted by severity ordinal and by descending strings
+    """
+    items = issues(300)
+    key = sort_key(parse_sort("severity:desc,subject_identifier:desc"))
+    ordinals = {"NOT_DEFINED": 0, "NONE": 1, "LOW": 2, "MEDIUM": 3, "HIGH": 4, "CRITICAL": 5}
+    expected = sorted(items, key=lambda i: i.subject.identifier, reverse=True)
+    expected.sort(key=lambda i: ordinals[i.severity.identifier], reverse=True)
+    assert sorted(items, key=key) == expected
+
+
+def test_sort_groups():
+    """
+    Test sorting issues already sorted by a prefix of the sort specification
+    """
+    spec = parse_sort("severity:desc,identifier")
+    key = sort_key(spec)
+    items = sorted(issues(300), key=sort_key(spec[:1]))
+    assert list(sort_groups(items, spec[:1], spec)) == sorted(items, key=key)
+
+
+def test_store_sort():
+    """
+    Test the external merge sort of an issue store
+    """
+    items = issues(500)
+    key = sort_key(parse_sort("severity,tool_name:desc,identifier"))
+    store = IssueStore(MemoryBudget(64 * 1024), items, key)
+    assert len(store.runs) > 1
+    assert [i.ref for i in store] == [i.ref for i in sorted(items, key=key)]
@@ -0,0 +1,78 @@
+"""
+Issues summary and quality gate tests.
+"""
+
+import pytest
+
+from benchmarks import generators
+from benchmarks.sonarqube import FakeSonarQube, loader_config
+from reportmix.errors import AppError, GateError
+from reportmix.loader import Loader
+from reportmix.loaders.sonarqube import SonarQubeLoader
+from reportmix.mixer import ReportMixer
+from reportmix.models.severity import SEVERITIES
+from reportmix.summary import check_gate, parse_gate
+from tests.helpers import mixer_config
+
+
+def test_parse_gate():
+    """
+    Test parsing quality gate specifications
+    """
+    assert parse_gate("") == []
+    assert parse_gate("high,MEDIUM:10") == [(SEVERITIES[4], 0), (SEVERITIES[3], 10)]
+    with pytest.raises(AppError):
+        parse_gate("SEVERE")
+
+
+def test_sonarqube_count():
+    """
+    Test that SonarQube issues are counted with a single request
+    """
+    with FakeSonarQube(1234) as server:
+        loader = SonarQubeLoader(loader_config(server))
+        summary = loader.count()
+        assert len(server.requests) == 1
+        expected = Loader.count(loader)  # Count loaded issues
+    assert summary.totals == expected.totals
+    assert +summary.severities == +expected.severities
+    assert +summary.types == +expected.types
+    assert summary.count(SEVERITIES[4]) > 0
+
+
+def test_gate(tmp_path):
+    """
+    Test the quality gate in summary and default modes
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 100)
+    counts = {}
+    for mode in ["true", "false"]:
+        config = mixer_config(tmp_path, {"dependency_check": tmp_path / "dc.csv"},
+                              summary=mode, fail_on="LOW:1000")
+        mixer = ReportMixer(config)
+        mixer.run()
+        assert (tmp_path / "reportmix.html").exists() == (mode == "false")
+        counts[mode] = mixer.summary.severities
+        mixer.gate = parse_gate("LOW")
+        assert check_gate(mixer.summary, mixer.gate)
+        with pytest.raises(GateError):
+            mixer.run()
+    assert counts["true"] == counts["false"]
+
+
+@pytest.mark.parametrize("mode", ["summary", "stream", "default"])
+def test_gate_load_errors(tmp_path, mode):
+    """
+    Test that loading errors fail the quality gate, unlike loaders not configured
+    """
+    generators.dependency_check_csv(str(tmp_path / "dc.csv"), 10)
+    (tmp_path / "npm.json").write_text("{", encoding="utf-8")
+    config = mixer_config(tmp_path, {"dependency_check": tmp_path / "dc.csv"},
+                          summary=str(mode == "summary").lower(),
+                          stream=str(mode == "stream").lower(), fail_on="LOW:1000")
+    ReportMixer(config).run()  # npm_audit, reportmix and sonarqube are skipped
+    config["npm_audit"]["report_file"] = str(tmp_path / "npm.json")
+    mixer = ReportMixer(config)
+    with pytest.raises(GateError, match="npm_audit report not loaded"):
+        mixer.run()
+    assert list(mixer.failures) == ["npm_audit"]
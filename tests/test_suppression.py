@@ -0,0 +1,63 @@
+"""
+Issues suppression tests.
+"""
+
+import pytest
+
+from benchmarks import generators
+from reportmix.config.builder import GLOBAL_CONFIG
+from reportmix.errors import AppError
+from reportmix.mixer import ReportMixer
+from reportmix.suppression import load_suppressions
+from tests.helpers import mixer_config
+
+SUPPRESSIONS = """hash,identifier,tool_identifier,subject_location,severity,reason
+{hash},,,,,Accepted
+,CVE-2019-10137,,,,Not exploitable
+,CVE-2015-*,npm_audit,,,Dev dependency
+,,,/app/remote-1*,,Test fixtures
+,,sonarqube,/app/arbitrary-*,,
+,,,*3,LOW,
+,CVE-2016-100[0-4]?,,,,
+,CVE-2017-*,,,[HC]*,
+,,,app>path>*,,
+,,,,,Empty rule
+,,,/nowhere/*,,Unused
+"""
+
+
+def test_match(tmp_path):
+    """
+    Test that the compiled matcher suppresses the same issues as checking all rules
+    """
+    issues = generators.issues(2000)
+    suppression_file = tmp_path / "suppressions.csv"
+    suppression_file.write_text(SUPPRESSIONS.format(hash=issues[0].hash), encoding="utf-8")
+    suppressions = load_suppressions(str(suppression_file))
+    assert len(suppressions.rules) == 10
+    for issue in issues:
+        expected = next((r for r in suppressions.rules if r.matches(issue)), None)
+        assert (suppressions.match(issue) is not None) == (expected is not None)
+    assert 0 < suppressions.count < len(issues)
+    assert [r.line for r in suppressions.unused()] == [10, 12]
+    (tmp_path / "invalid.csv").write_text("unknown\nvalue\n", encoding="utf-8")
+    with pytest.raises(AppError):
+        load_suppressions(str(tmp_path / "invalid.csv"))
+
+
+@pytest.mark.parametrize("stream", ["false", "true"])
+def test_merge(tmp_path, stream):
+    """
+    Test suppressing issues while loading reports
+    """
+    generators.npm_audit_json(str(tmp_path / "npm.json"), 300)
+    (tmp_path / "suppressions.csv").write_text(SUPPRESSIONS.format(hash=""), encoding="utf-8")
+    config = mixer_config(tmp_path, {"npm_audit": tmp_path / "npm.json"}, formats="csv",
+                          stream=stream, suppression_file=str(tmp_path / "suppressions.csv"))
+    mixer = ReportMixer(config)
+    mixer.merge()
+    assert mixer.suppressed["npm_audit"] > 0
+    assert mixer.count + mixer.suppressed["npm_audit"] == 300
+    config[GLOBAL_CONFIG]["summary"] = "true"
+    mixer = ReportMixer(config)
+    assert mixer.summarize().totals["npm_audit"] + mixer.suppressed["npm_audit"] == 300
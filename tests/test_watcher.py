@@ -0,0 +1,73 @@
+"""
+Report watcher tests.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from reportmix.errors import AppError
+from reportmix.loaders.npm_audit import NpmAuditLoader
+from reportmix.loaders.reportmix import ReportMixLoader
+from reportmix.watcher import ReportWatcher, signature
+
+
+def test_signature(tmp_path):
+    """
+    Test the signature function
+    """
+    file = tmp_path / "report.csv"
+    assert signature(str(file)) is None
+    file.write_text("a,b")
+    assert signature(str(file))[1] == 3
+
+
+def test_poll(tmp_path):
+    """
+    Test ReportWatcher.poll()
+    """
+    npm_file = tmp_path / "npm-audit.json"
+    mix_file = tmp_path / "reportmix.csv"
+    mixer = SimpleNamespace(loaders={
+        "npm_audit": NpmAuditLoader({"report_file": str(npm_file)}),
+        "reportmix": ReportMixLoader({"report_file": str(mix_file)})
+    })
+    watcher = ReportWatcher(mixer, 1)
+    assert watcher.poll() == []
+    mix_file.write_text("identifier")
+    assert watcher.poll() == ["reportmix"]
+    assert watcher.poll() == []
+    npm_file.write_text("{}")
+    os.utime(mix_file, ns=(0, 0))
+    assert watcher.poll() == ["npm_audit", "reportmix"]
+    # Debounce
+    watcher.debounce = 3600
+    npm_file.write_text("{ }")
+    assert watcher.poll() == []
+    assert watcher.pending == {"npm_audit"}
+
+
+def test_watch_errors(monkeypatch):
+    """
+    Test that merge errors do not stop watching
+    """
+    calls = []
+
+    def merge(names=None):
+        calls.append(names)
+        raise (OSError if len(calls) % 2 else AppError)("Failed")
+
+    mixer = SimpleNamespace(loaders={}, merge=merge)
+    watcher = ReportWatcher(mixer, 0)
+    watcher.poll = lambda: ["npm_audit"]
+
+    def sleep(_):
+        if len(calls) >= 3:
+            raise KeyboardInterrupt()
+
+    monkeypatch.setattr(time, "sleep", sleep)
+    with pytest.raises(KeyboardInterrupt):
+        watcher.watch()
+    assert calls == [None, ["npm_audit"], ["npm_audit"]]